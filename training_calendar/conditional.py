@@ -0,0 +1,63 @@
+import datetime
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+from django.contrib.messages import get_messages
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+Validators = Tuple[str, datetime.datetime]
+
+
+def make_etag(*parts) -> str:
+    return '"%s"' % hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def start_of_today() -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(datetime.date.today(), datetime.time.min))
+
+
+def make_validators(request, count: int, modified: Iterable[Optional[datetime.datetime]], *parts) -> Validators:
+    """
+    ETag and Last-Modified of a page built from count rows last modified at max(modified).
+    Pages render today's date, so validators never predate the start of today.
+    """
+    last_modified = max([moment for moment in modified if moment is not None] + [start_of_today()])
+    etag = make_etag(request.user.pk, request.get_full_path(), request.META.get('HTTP_ACCEPT'), count,
+                     last_modified.isoformat(), *parts)
+    return etag, last_modified
+
+
+class ConditionalGetMixin:
+    """
+    Answers If-None-Match / If-Modified-Since with 304 before rows are loaded or templates rendered.
+    Views implement get_validators, cheap enough to be computed on every request.
+    """
+    validators: Optional[Validators] = None
+
+    def get_validators(self) -> Optional[Validators]:
+        raise NotImplementedError()
+
+    def conditional_get(self, request) -> Optional[HttpResponse]:
+        # pending flash messages are rendered only once, such a page must not be replaced by a cached one
+        if len(get_messages(request)):
+            self.validators = None
+            return None
+        self.validators = self.get_validators()
+        if self.validators is None:
+            return None
+        etag, last_modified = self.validators
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if response is not None:
+            self.with_validators(response)
+        return response
+
+    def with_validators(self, response: HttpResponse) -> HttpResponse:
+        if self.validators is not None:
+            etag, last_modified = self.validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,139 @@
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional['RequestProfile']] = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Queries, database time and named timers of one request, times are in milliseconds"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: Counter = Counter()
+        self.timers: Dict[str, float] = {}
+        self.depth: Counter = Counter()
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.statements[sql] += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        # nested timers of the same name (e.g. nested serializers) are only counted once
+        self.depth[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth[name] -= 1
+            if not self.depth[name]:
+                self.timers[name] = self.timers.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.statements.values())
+
+    def finish(self):
+        self.total = (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        metrics = [f'db;dur={self.db_time:.1f};desc="{self.queries} queries, {self.duplicates} duplicates"']
+        metrics += [f'{name};dur={duration:.1f}' for name, duration in sorted(self.timers.items())]
+        metrics.append(f'total;dur={self.total:.1f}')
+        return ', '.join(metrics)
+
+    def as_dict(self) -> dict:
+        data = {'queries': self.queries, 'db_ms': round(self.db_time, 1), 'duplicates': self.duplicates,
+                'total_ms': round(self.total, 1)}
+        data.update({f'{name}_ms': round(duration, 1) for name, duration in self.timers.items()})
+        if self.duplicates:
+            data['most_duplicated'] = self.statements.most_common(1)[0][0]
+        return data
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+@contextmanager
+def timed(name: str):
+    """Time the block in the profile of the current request, a no-op for requests that aren't sampled"""
+    profile = current_profile()
+    if profile is None:
+        yield
+    else:
+        with profile.timer(name):
+            yield
+
+
+class TimedSerializerMixin:
+    """
+    Adds representation time of DRF serializers to the serializer timer.
+    Serializers overriding to_representation decorate it with timed('serializer') instead.
+    """
+
+    def to_representation(self, instance):
+        with timed('serializer'):
+            return super().to_representation(instance)
+
+
+class InstrumentationMiddleware:
+    """
+    Profiles a sample (INSTRUMENTATION_SAMPLE_RATE) of requests: queries, database time, duplicated statements
+    and template/serializer time are sent in the Server-Timing header and logged as JSON with the url name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 0):
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.execute))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        profile.finish()
+
+        response['Server-Timing'] = profile.server_timing()
+        match = request.resolver_match
+        logger.info(json.dumps({'url_name': match.url_name if match else None, 'method': request.method,
+                                'status': response.status_code, **profile.as_dict()}))
+        return response
+
+    def process_template_response(self, request, response):
+        profile = current_profile()
+        if profile is not None:
+            render = response.render
+
+            def timed_render():
+                with profile.timer('template'):
+                    return render()
+
+            response.render = timed_render
+        return response
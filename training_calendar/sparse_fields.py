@@ -0,0 +1,65 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def requested_fields(request, available: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Fields selected with ?fields=a,b and/or ?exclude=c on GET requests, None when all fields are wanted.
+    Unknown names are ignored.
+    """
+    if request is None or request.method != 'GET':
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    fields = params.get('fields')
+    exclude = params.get('exclude')
+    if not fields and not exclude:
+        return None
+    available = set(available)
+    selected = {field for field in fields.split(',') if field in available} if fields else available
+    if exclude:
+        selected -= set(exclude.split(','))
+    return selected
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Drops serializer fields not selected with ?fields= / ?exclude=.
+    Serializers building their representation by hand define flat_fields, a name -> getter(serializer, instance)
+    mapping, and return flat_representation(instance), which only reads the selected attributes.
+    """
+    flat_fields: Optional[Dict[str, Callable[[Any, Any], Any]]] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selected_fields = requested_fields(self.context.get('request'), self.flat_fields or self.fields)
+        if self.selected_fields is not None:
+            for name in list(self.fields):
+                if name not in self.selected_fields:
+                    self.fields.pop(name)
+
+    @cached_property
+    def flat_getters(self) -> List[Tuple[str, Callable[[Any, Any], Any]]]:
+        return [(name, getter) for name, getter in self.flat_fields.items()
+                if self.selected_fields is None or name in self.selected_fields]
+
+    def flat_representation(self, instance) -> dict:
+        return {name: getter(self, instance) for name, getter in self.flat_getters}
+
+
+class SparseFieldsViewMixin:
+    """
+    Defers model columns of fields not selected with ?fields= / ?exclude=.
+    sparse_field_columns maps every representation field to the columns it reads,
+    sparse_required_columns are always loaded (e.g. columns used by permission checks).
+    """
+    sparse_field_columns: Dict[str, List[str]] = {}
+    sparse_required_columns: List[str] = []
+
+    def sparse_queryset(self, queryset: QuerySet) -> QuerySet:
+        selected = requested_fields(self.request, self.sparse_field_columns)
+        if selected is None:
+            return queryset
+        columns = {column for field in selected for column in self.sparse_field_columns[field]}
+        return queryset.only(queryset.model._meta.pk.name, *self.sparse_required_columns, *columns)
@@ -1,5 +1,8 @@
 from datetime import datetime
 
+from django.urls import reverse
+from rest_framework.utils.mediatypes import _MediaType
+
 
 def format_date(date: datetime, fmt: str = '%Y-%m-%d') -> str:
     return date.strftime(fmt)
@@ -7,3 +10,45 @@ def format_date(date: datetime, fmt: str = '%Y-%m-%d') -> str:
 
 def date_from_string(date: str, fmt: str = '%Y-%m-%d') -> datetime.date:
     return datetime.strptime(date, fmt).date()
+
+
+def is_compact(request) -> bool:
+    """
+    Compact API representation is requested with ?compact=true
+    or with an Accept header parameter, e.g. application/json; compact=true
+    """
+    if request is None:
+        return False
+    if getattr(request, 'query_params', request.GET).get('compact', '').lower() in ('1', 'true'):
+        return True
+    media_type = getattr(request, 'accepted_media_type', None)
+    if media_type:
+        return _MediaType(media_type).params.get('compact', b'').lower() in (b'1', b'true')
+    return False
+
+
+def accepts_encoding(request, coding: str) -> bool:
+    """Whether the Accept-Encoding header of request lists coding, or *, with a q-value above 0"""
+    qualities = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities.get(coding, qualities.get('*', 0.0)) > 0
+
+
+def url_template(request, view_name: str, *placeholders: str) -> str:
+    """Absolute url of view_name with {placeholder} in place of each kwarg, filled later with str.format"""
+    url = reverse(view_name, kwargs={key: f'__{key}__' for key in placeholders})
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    for key in placeholders:
+        url = url.replace(f'__{key}__', f'{{{key}}}')
+    return url
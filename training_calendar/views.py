@@ -29,14 +29,28 @@ class FormListView(ListView, FormMixin):
 class MultipleFormMixin(ContextMixin):
     """
     Based on https://www.codementor.io/lakshminp/handling-multiple-forms-on-the-same-page-in-django-fv89t2s3j
+    Class level dicts are only defaults, every instance (i.e. request) works on its own copies,
+    so forms added in __init__ and submitted data are never shared between requests or threads.
     """
     initial = {}
     form_classes = {}
     success_urls = {}
-    stored = {}
     prefixes = {}
     forms_valid_func = {}
     forms_kwargs_func = {}
+    state_attributes = ('initial', 'form_classes', 'success_urls', 'prefixes', 'forms_valid_func',
+                        'forms_kwargs_func')
+
+    def __init__(self, **kwargs):
+        self.init_form_state()
+        super().__init__(**kwargs)
+
+    def init_form_state(self):
+        if 'form_classes' in self.__dict__:
+            return
+        for name in self.state_attributes:
+            setattr(self, name, dict(getattr(type(self), name)))
+        self.stored = {}
 
     def add_form(self,
                  form_name: str,
@@ -47,6 +61,7 @@ class MultipleFormMixin(ContextMixin):
                  prefix: Optional[str] = None,
                  get_kwargs_func: Optional[Callable[[], Tuple[list, dict]]] = None):
         assert valid_func or success_url
+        self.init_form_state()
         self.form_classes[form_name] = form_class
         if valid_func:
             self.forms_valid_func[form_name] = valid_func
@@ -0,0 +1,28 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from trainings.serializers.batch_serializer import BatchSerializer, OperationResultSerializer
+from trainings.services.batch import Batch
+from users.permissions import IsCoachPermission
+
+
+class TrainingsBatchView(APIView):
+    """
+    Applies a list of create/update/delete operations on the coach's trainings in one transaction.
+    Nothing is written unless every operation is valid, the response holds a status per operation.
+    """
+    permission_classes = [IsAuthenticated, IsCoachPermission]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch = Batch(request.user, serializer.validated_data['operations'])
+        if batch.validate():
+            batch.apply()
+        # apply turns operations into errors too, when a day was taken after validation
+        if not batch.valid:
+            return Response({'results': OperationResultSerializer(batch.results, many=True).data},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': OperationResultSerializer(batch.results, many=True).data})
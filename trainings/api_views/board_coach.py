@@ -0,0 +1,39 @@
+import datetime
+
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from training_calendar.utils import date_from_string
+from trainings.serializers.board_serializer import BoardRowSerializer
+from trainings.services.board import BOARD_PAGE_SIZE, MAX_BOARD_PAGE_SIZE, resolve_board
+from users.permissions import IsCoachPermission
+
+
+class TeamBoardAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsCoachPermission]
+
+    def get(self, request, *args, **kwargs):
+        date = self.request.GET.get('date')
+        if date:
+            try:
+                date = date_from_string(date)
+            except ValueError:
+                raise ParseError('date format should be yyyy-mm-dd')
+        else:
+            date = datetime.date.today()
+        try:
+            limit = min(int(self.request.GET.get('limit', BOARD_PAGE_SIZE)), MAX_BOARD_PAGE_SIZE)
+        except ValueError:
+            raise ParseError('limit should be an integer')
+        if limit < 1:
+            raise ParseError('limit should be positive')
+
+        monday = date - datetime.timedelta(days=date.weekday())
+        board = resolve_board(self.request.user, monday, self.request.GET.get('after'), limit)
+        return Response({
+            'monday': monday,
+            'after': board.next_cursor,
+            'results': BoardRowSerializer(board.rows, many=True).data
+        })
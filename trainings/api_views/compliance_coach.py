@@ -0,0 +1,37 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from training_calendar.utils import date_from_string
+from trainings.serializers.compliance_serializer import ComplianceRowSerializer
+from trainings.services.summary import COMPLIANCE_WEEKS, MAX_COMPLIANCE_WEEKS, compliance_range, resolve_compliance
+from users.permissions import IsCoachPermission
+
+
+class ComplianceAPIView(APIView):
+    """
+    Planned and executed trainings per established runner and week, read from weekly summaries.
+    ?date=yyyy-mm-dd selects the first week, by default the last ?weeks= weeks up to the current one are returned.
+    """
+    permission_classes = [IsAuthenticated, IsCoachPermission]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            weeks = min(int(self.request.GET.get('weeks', COMPLIANCE_WEEKS)), MAX_COMPLIANCE_WEEKS)
+        except ValueError:
+            raise ParseError('weeks should be an integer')
+        if weeks < 1:
+            raise ParseError('weeks should be positive')
+        date = self.request.GET.get('date')
+        try:
+            date = date_from_string(date) if date else None
+        except ValueError:
+            raise ParseError('date format should be yyyy-mm-dd')
+
+        first = compliance_range(date, weeks)
+        rows = resolve_compliance(self.request.user, first, weeks)
+        return Response({
+            'first_week': first,
+            'results': ComplianceRowSerializer(rows, many=True).data
+        })
@@ -0,0 +1,36 @@
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from training_calendar.utils import accepts_encoding, date_from_string
+from trainings.services.export import CONTENT_TYPES, FORMATS, export_queryset, export_trainings
+from users.permissions import IsCoachPermission
+
+
+class ExportView(APIView):
+    """
+    Every training of the coach's relations, streamed as ?type=csv (default) or ?type=jsonl,
+    optionally limited with ?from=yyyy-mm-dd and ?to=yyyy-mm-dd. Gzipped when the client accepts it.
+    """
+    permission_classes = [IsAuthenticated, IsCoachPermission]
+
+    def get(self, request, *args, **kwargs):
+        fmt = self.request.GET.get('type', 'csv')
+        if fmt not in FORMATS:
+            raise ParseError(f'type should be one of {", ".join(FORMATS)}')
+        try:
+            start, end = [date_from_string(self.request.GET[key]) if self.request.GET.get(key) else None
+                          for key in ['from', 'to']]
+        except ValueError:
+            raise ParseError('date format should be yyyy-mm-dd')
+
+        compress = accepts_encoding(request, 'gzip')
+        response = StreamingHttpResponse(export_trainings(export_queryset(request.user, start, end), fmt, compress),
+                                         content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="trainings.{fmt}"'
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
@@ -0,0 +1,32 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from trainings.serializers.training_serializer import CompactTrainingSerializer
+from trainings.services.search import MAX_SEARCH_OFFSET, MAX_SEARCH_PAGE_SIZE, SEARCH_PAGE_SIZE, search_terms, \
+    search_trainings
+from users.permissions import IsCoachPermission
+
+
+class SearchView(APIView):
+    """Trainings of the coach's runners matching every word of ?q=, best matches first, paged with limit and offset"""
+    permission_classes = [IsAuthenticated, IsCoachPermission]
+
+    def get(self, request, *args, **kwargs):
+        query = self.request.GET.get('q', '')
+        if not search_terms(query):
+            raise ParseError('q should contain at least one word')
+        try:
+            limit = min(int(self.request.GET.get('limit', SEARCH_PAGE_SIZE)), MAX_SEARCH_PAGE_SIZE)
+            offset = int(self.request.GET.get('offset', 0))
+        except ValueError:
+            raise ParseError('limit and offset should be integers')
+        if limit < 1 or not 0 <= offset <= MAX_SEARCH_OFFSET:
+            raise ParseError(f'limit should be positive and offset between 0 and {MAX_SEARCH_OFFSET}')
+
+        trainings = search_trainings(self.request.user, query, limit, offset)
+        return Response({
+            'next_offset': offset + limit if len(trainings) == limit and offset + limit <= MAX_SEARCH_OFFSET else None,
+            'results': CompactTrainingSerializer(trainings, many=True, context={'request': request}).data
+        })
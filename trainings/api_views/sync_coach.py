@@ -0,0 +1,37 @@
+from django.core import signing
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from trainings.serializers.training_serializer import CompactTrainingSerializer
+from trainings.services.sync import changes_since, decode_token, snapshot
+from users.permissions import IsCoachPermission
+from users.serializers.relation_serializer import CompactRelationSerializer
+
+
+class SyncView(APIView):
+    """
+    Changes of the coach's trainings and relations since the token returned by the previous call.
+    Call without since for a full snapshot, fetched page by page with the returned next cursor.
+    """
+    permission_classes = [IsAuthenticated, IsCoachPermission]
+
+    def get(self, request, *args, **kwargs):
+        since = self.request.GET.get('since')
+        cursor = self.request.GET.get('cursor')
+        try:
+            if cursor:
+                changes = snapshot(self.request.user, cursor)
+            else:
+                changes = changes_since(self.request.user, decode_token(since) if since else None)
+        except signing.BadSignature:
+            raise ParseError('invalid since token or cursor')
+        context = {'request': request}
+        return Response({
+            'token': changes.token,
+            'next': changes.cursor,
+            'trainings': CompactTrainingSerializer(changes.trainings, many=True, context=context).data,
+            'relations': CompactRelationSerializer(changes.relations, many=True, context=context).data,
+            'deleted': [{'model': tombstone.model, 'id': tombstone.object_id} for tombstone in changes.tombstones]
+        })
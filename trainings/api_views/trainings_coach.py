@@ -1,29 +1,43 @@
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from rest_framework.exceptions import NotFound, ParseError, PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
-from training_calendar.utils import date_from_string
+from training_calendar.conditional import ConditionalGetMixin, make_validators
+from training_calendar.sparse_fields import SparseFieldsViewMixin
+from training_calendar.utils import date_from_string, is_compact
 from trainings.models import Training
-from trainings.serializers.training_serializer import TrainingSerializer
+from trainings.pagination import TrainingCursorPagination
+from trainings.serializers.training_serializer import CompactTrainingSerializer, TrainingSerializer
+from trainings.services.sync import last_deletion
 from users.models import Relation
 from users.permissions import IsCoachPermission
 
 
-class TrainingsCoachViewSet(ModelViewSet):
+class TrainingsCoachViewSet(ConditionalGetMixin, SparseFieldsViewMixin, ModelViewSet):
     queryset = Training.objects.all()
     serializer_class = TrainingSerializer
-    pagination_class = None
+    pagination_class = TrainingCursorPagination
     permission_classes = [IsAuthenticated, IsCoachPermission]
+    sparse_field_columns = {'id': [], 'url': [], 'relation': ['relation'], 'date': ['date'],
+                            'description': ['description'], 'execution': ['execution'],
+                            'visible_since': ['visible_since']}
+    # cursor pagination reads the date of the last row
+    sparse_required_columns = ['date']
 
-    def get_queryset(self):
-        relation = self.kwargs.get('relation')
+    @cached_property
+    def relation(self) -> Relation:
         try:
-            if Relation.objects.get(pk=relation).coach != self.request.user:
-                raise PermissionDenied()
+            relation = Relation.objects.get(pk=self.kwargs.get('relation'))
         except (Relation.DoesNotExist, ValueError):
             raise NotFound()
+        if relation.coach_id != self.request.user.pk:
+            raise PermissionDenied()
+        return relation
 
+    def get_queryset(self):
         start_date = self.request.GET.get('start_date')
         end_date = self.request.GET.get('end_date')
         if start_date:
@@ -37,12 +51,28 @@ class TrainingsCoachViewSet(ModelViewSet):
             except ValueError:
                 raise ParseError('date format should be yyyy-mm-dd')
 
-        objects = Training.objects.filter(relation=relation)
+        objects = Training.objects.filter(relation=self.relation)
         if start_date:
             objects = objects.filter(date__gte=str(start_date))
         if end_date:
             objects = objects.filter(date__lte=end_date)
-        return objects.all()
+        return self.sparse_queryset(objects.order_by('date', 'id'))
+
+    def get_validators(self):
+        stats = self.filter_queryset(self.get_queryset()).aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        return make_validators(self.request, stats['count'],
+                               [stats['last_modified'], last_deletion([self.relation.coach_id])])
+
+    def list(self, request, *args, **kwargs):
+        not_modified = self.conditional_get(request)
+        if not_modified:
+            return not_modified
+        return self.with_validators(super().list(request, *args, **kwargs))
+
+    def get_serializer_class(self):
+        if is_compact(self.request):
+            return CompactTrainingSerializer
+        return super().get_serializer_class()
 
     def get_object(self):
         pk = self.kwargs.get('pk')
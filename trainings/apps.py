@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TrainingsConfig(AppConfig):
     name = 'trainings'
+
+    def ready(self):
+        import trainings.signals  # noqa: F401
@@ -16,7 +16,7 @@ class AddTrainingForm(forms.ModelForm):
     def __init__(self, coach: User, *args, **kwargs):
         super().__init__(*args, **kwargs)
         runners = [(relation.runner.username, relation.displayed_name) for relation in
-                   Relation.objects.filter(coach=coach, status=RelationStatus.ESTABLISHED)]
+                   Relation.objects.filter(coach=coach, status=RelationStatus.ESTABLISHED).select_related('runner')]
         self.fields['runners'].choices = runners
 
     class Meta:
@@ -31,3 +31,8 @@ class UpdateTrainingForm(forms.ModelForm):
     class Meta:
         model = Training
         fields = ['visible_since', 'description']
+
+
+class ImportTrainingsForm(forms.Form):
+    file = forms.FileField(label=gettext('CSV file'))
+    dry_run = forms.BooleanField(required=False, label=gettext('Only check what would change'))
@@ -0,0 +1,51 @@
+import time
+from typing import Any, Callable, Iterator
+
+from django.core.management import BaseCommand, CommandError
+
+from training_calendar.utils import date_from_string
+from trainings.services.export import FORMATS, export_queryset, export_trainings
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Stream every training of a coach as CSV or JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('coach', type=str, help='username of the coach')
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--output', default='-', help='file to write, standard output by default')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--from', dest='start', type=date_from_string, help='first date (yyyy-mm-dd)')
+        parser.add_argument('--to', dest='end', type=date_from_string, help='last date (yyyy-mm-dd)')
+
+    def handle(self, *args, **options):
+        try:
+            coach = User.objects.get(username=options['coach'], is_coach=True)
+        except User.DoesNotExist:
+            raise CommandError(f'coach {options["coach"]!r} does not exist')
+
+        started = time.perf_counter()
+        chunks = export_trainings(export_queryset(coach, options.get('start'), options.get('end')),
+                                  options['format'], options['gzip'])
+        if options['output'] != '-':
+            with open(options['output'], 'wb') as output:
+                size = self.write(chunks, output.write)
+        else:
+            # binary standard output is written to directly, text streams (call_command(stdout=...)) only get text
+            buffer = getattr(self.stdout, 'buffer', None)
+            if buffer is None and options['gzip']:
+                raise CommandError('--gzip needs --output or a binary standard output')
+            self.stdout.flush()
+            size = self.write(chunks, buffer.write if buffer is not None
+                              else lambda chunk: self.stdout.write(chunk.decode(), ending=''))
+            self.stdout.flush()
+        self.stderr.write(f'{size} bytes in {time.perf_counter() - started:.1f}s')
+
+    @staticmethod
+    def write(chunks: Iterator[bytes], write: Callable[[bytes], Any]) -> int:
+        size = 0
+        for chunk in chunks:
+            write(chunk)
+            size += len(chunk)
+        return size
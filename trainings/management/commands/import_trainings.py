@@ -0,0 +1,42 @@
+import io
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from trainings.services.plan_import import COLUMNS, ENCODING, IMPORT_BATCH_SIZE, PlanImport, check_encoding
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = f'Import a training plan of a coach from a CSV file with a {",".join(COLUMNS)} header'
+
+    def add_arguments(self, parser):
+        parser.add_argument('coach', type=str, help='username of the coach')
+        parser.add_argument('file_name', type=str)
+        parser.add_argument('--dry-run', action='store_true', help='only report what would change')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='rows upserted at once')
+
+    def handle(self, *args, **options):
+        try:
+            coach = User.objects.get(username=options['coach'], is_coach=True)
+        except User.DoesNotExist:
+            raise CommandError(f'coach {options["coach"]!r} does not exist')
+
+        started = time.perf_counter()
+        with open(options['file_name'], 'rb') as file:
+            try:
+                check_encoding(file)
+            except UnicodeDecodeError:
+                raise CommandError('file should be encoded in UTF-8')
+            lines = io.TextIOWrapper(file, encoding=ENCODING, newline='')
+            plan = PlanImport(coach, options['dry_run'], options['batch_size']).run(lines)
+        elapsed = time.perf_counter() - started
+
+        rows = plan.created + plan.updated + plan.unchanged
+        prefix = 'would be ' if options['dry_run'] else ''
+        self.stdout.write(f'{plan.created} {prefix}created, {plan.updated} {prefix}updated, {plan.unchanged} unchanged '
+                          f'in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)')
+        if plan.errors:
+            self.stderr.write(f'{len(plan.errors)} lines skipped:')
+            for number, message in plan.errors:
+                self.stderr.write(f'  line {number}: {message}')
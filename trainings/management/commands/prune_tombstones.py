@@ -0,0 +1,10 @@
+from django.core.management import BaseCommand
+
+from trainings.services.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than the oldest sync token still accepted'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{prune_tombstones()} tombstones deleted')
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management import BaseCommand
+
+from trainings.services.summary import SUMMARY_CHUNK_SIZE, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recompute weekly summaries of planned and executed trainings of every relation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=SUMMARY_CHUNK_SIZE,
+                            help='relations recomputed in one transaction')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(relations: int, summaries: int):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'{relations} relations, {summaries} summaries in {elapsed:.1f}s '
+                              f'({relations / elapsed if elapsed else 0:.0f} relations/s)')
+
+        rebuild_summaries(chunk_size=options['chunk_size'], progress=progress)
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.8 on 2026-10-18 05:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0002_relation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Training',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('description', models.TextField()),
+                ('execution', models.TextField(null=True)),
+                ('visible_since', models.DateField(blank=True, null=True)),
+                ('relation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.Relation')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['relation', 'visible_since'], name='training_relation_visible_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='training',
+            constraint=models.UniqueConstraint(fields=('relation', 'date'), name='training_relation_date_unique'),
+        ),
+    ]
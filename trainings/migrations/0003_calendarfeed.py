@@ -0,0 +1,35 @@
+# Generated by Django 2.2.8 on 2026-10-18 06:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import trainings.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_relation_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('trainings', '0002_training_updated_at_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarFeed',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(default=trainings.models.generate_feed_token, max_length=32, unique=True)),
+                ('relation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='users.Relation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='calendarfeed',
+            constraint=models.UniqueConstraint(fields=('user', 'relation'), name='calendar_feed_user_relation_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='calendarfeed',
+            constraint=models.UniqueConstraint(condition=models.Q(relation=None), fields=('user',), name='calendar_feed_user_unique'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# SQLite drops triggers of a table remade by a later migration altering trainings_training,
+# such a migration has to create them again.
+SQLITE_FORWARDS = [
+    """CREATE VIRTUAL TABLE trainings_training_fts USING fts5(
+           description, execution, content='trainings_training', content_rowid='id',
+           tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER trainings_training_fts_insert AFTER INSERT ON trainings_training BEGIN
+           INSERT INTO trainings_training_fts(rowid, description, execution)
+           VALUES (new.id, new.description, new.execution);
+       END""",
+    """CREATE TRIGGER trainings_training_fts_delete AFTER DELETE ON trainings_training BEGIN
+           INSERT INTO trainings_training_fts(trainings_training_fts, rowid, description, execution)
+           VALUES ('delete', old.id, old.description, old.execution);
+       END""",
+    """CREATE TRIGGER trainings_training_fts_update AFTER UPDATE OF description, execution ON trainings_training
+       BEGIN
+           INSERT INTO trainings_training_fts(trainings_training_fts, rowid, description, execution)
+           VALUES ('delete', old.id, old.description, old.execution);
+           INSERT INTO trainings_training_fts(rowid, description, execution)
+           VALUES (new.id, new.description, new.execution);
+       END""",
+    "INSERT INTO trainings_training_fts(trainings_training_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER trainings_training_fts_insert',
+    'DROP TRIGGER trainings_training_fts_delete',
+    'DROP TRIGGER trainings_training_fts_update',
+    'DROP TABLE trainings_training_fts',
+]
+POSTGRESQL_FORWARDS = [
+    'ALTER TABLE trainings_training ADD COLUMN search_vector tsvector',
+    "UPDATE trainings_training SET search_vector = to_tsvector('pg_catalog.simple', "
+    "coalesce(description, '') || ' ' || coalesce(execution, ''))",
+    'CREATE INDEX trainings_training_search_idx ON trainings_training USING GIN (search_vector)',
+    """CREATE TRIGGER trainings_training_search_update BEFORE INSERT OR UPDATE OF description, execution
+       ON trainings_training FOR EACH ROW
+       EXECUTE PROCEDURE tsvector_update_trigger(search_vector, 'pg_catalog.simple', description, execution)""",
+]
+POSTGRESQL_BACKWARDS = [
+    'DROP TRIGGER trainings_training_search_update ON trainings_training',
+    'ALTER TABLE trainings_training DROP COLUMN search_vector',
+]
+
+
+def run(statements: dict):
+    def execute(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return execute
+
+
+class Migration(migrations.Migration):
+    """Full-text index of descriptions and executions, kept in sync by triggers so bulk writes are indexed too"""
+
+    dependencies = [
+        ('trainings', '0003_calendarfeed'),
+    ]
+
+    operations = [
+        migrations.RunPython(run({'sqlite': SQLITE_FORWARDS, 'postgresql': POSTGRESQL_FORWARDS}),
+                             run({'sqlite': SQLITE_BACKWARDS, 'postgresql': POSTGRESQL_BACKWARDS})),
+    ]
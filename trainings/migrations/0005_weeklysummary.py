@@ -0,0 +1,29 @@
+# Generated by Django 2.2.8 on 2026-10-18 06:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_relation_updated_at'),
+        ('trainings', '0004_training_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklySummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField()),
+                ('planned', models.PositiveIntegerField(default=0)),
+                ('executed', models.PositiveIntegerField(default=0)),
+                ('relation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.Relation')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='weeklysummary',
+            constraint=models.UniqueConstraint(fields=('relation', 'week'), name='weekly_summary_relation_week_unique'),
+        ),
+    ]
@@ -1,3 +1,6 @@
+import secrets
+from typing import Optional
+
 from django.db import models
 from django.urls import reverse
 
@@ -10,9 +13,22 @@ class Training(models.Model):
     description = models.TextField()
     execution = models.TextField(null=True)
     visible_since = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
-        constraints = ['relation', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['relation', 'date'], name='training_relation_date_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['relation', 'visible_since'], name='training_relation_visible_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # weekly summaries of the week a training is moved out of are refreshed too
+        instance.loaded_date = instance.__dict__.get('date')
+        return instance
 
     def get_absolute_url(self):
         return reverse('trainings-list-entry', kwargs={'runner': self.relation.runner.username, 'date': self.date})
@@ -22,3 +38,65 @@ class Training(models.Model):
             f'runner={self.relation.runner.username}, ' \
             f'trainer={self.relation.coach.username}, ' \
             f'date={self.date})'
+
+
+class Tombstone(models.Model):
+    """Marks a deleted Training or Relation, so sync clients can drop it"""
+    TRAINING = 'training'
+    RELATION = 'relation'
+
+    model = models.CharField(max_length=20, choices=[(TRAINING, TRAINING), (RELATION, RELATION)])
+    object_id = models.IntegerField()
+    # not a foreign key, tombstones are written while the coach may be deleted in the same cascade
+    coach_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['coach_id', 'deleted_at'], name='tombstone_coach_deleted_idx'),
+        ]
+
+
+def generate_feed_token() -> str:
+    return secrets.token_urlsafe(24)
+
+
+class CalendarFeed(models.Model):
+    """
+    Secret token of an iCalendar feed, of all trainings of a runner or, with relation set,
+    of the trainings of one relation subscribed to by its coach
+    """
+    token = models.CharField(max_length=32, unique=True, default=generate_feed_token)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    relation = models.ForeignKey(Relation, on_delete=models.CASCADE, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'relation'], name='calendar_feed_user_relation_unique'),
+            # NULLs are distinct in the constraint above
+            models.UniqueConstraint(fields=['user'], condition=models.Q(relation=None),
+                                    name='calendar_feed_user_unique'),
+        ]
+
+    @classmethod
+    def get_for(cls, user: User, relation: Optional[Relation] = None) -> 'CalendarFeed':
+        return cls.objects.get_or_create(user=user, relation=relation)[0]
+
+    def get_absolute_url(self):
+        return reverse('trainings-feed', kwargs={'token': self.token})
+
+
+class WeeklySummary(models.Model):
+    """
+    Planned and executed (with execution) trainings of a relation in an ISO week, identified by its monday.
+    Kept up to date by trainings/signals.py and by services doing bulk writes, see trainings/services/summary.py.
+    """
+    relation = models.ForeignKey(Relation, on_delete=models.CASCADE)
+    week = models.DateField()
+    planned = models.PositiveIntegerField(default=0)
+    executed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['relation', 'week'], name='weekly_summary_relation_week_unique'),
+        ]
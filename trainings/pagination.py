@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TrainingCursorPagination(CursorPagination):
+    """
+    Opt-in keyset pagination over (date, id), enabled by passing page_size or cursor.
+    Without them the list stays unpaginated, to keep date range requests backwards compatible.
+    """
+    ordering = ('date', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params \
+                and self.page_size_query_param not in request.query_params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,40 @@
+from django.utils.translation import gettext
+from rest_framework import serializers
+
+from training_calendar.instrumentation import TimedSerializerMixin
+from trainings.services.batch import Operation
+
+MAX_OPERATIONS = 1000
+
+
+class TrainingOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=[operation.value for operation in Operation])
+    id = serializers.IntegerField(required=False)
+    relation = serializers.IntegerField(required=False)
+    date = serializers.DateField(required=False)
+    description = serializers.CharField(required=False)
+    visible_since = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs['op'] == Operation.CREATE.value:
+            if not all(field in attrs for field in ['relation', 'date', 'description']):
+                raise serializers.ValidationError(gettext('relation, date and description are required'))
+        elif 'id' not in attrs:
+            raise serializers.ValidationError(gettext('id is required'))
+        return attrs
+
+
+class BatchSerializer(serializers.Serializer):
+    operations = TrainingOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, value: list) -> list:
+        if len(value) > MAX_OPERATIONS:
+            raise serializers.ValidationError(gettext('At most %d operations are allowed') % MAX_OPERATIONS)
+        return value
+
+
+class OperationResultSerializer(TimedSerializerMixin, serializers.Serializer):
+    status = serializers.CharField()
+    id = serializers.IntegerField(source='training.pk', default=None)
+    date = serializers.DateField(source='training.date', default=None)
+    error = serializers.CharField(allow_null=True)
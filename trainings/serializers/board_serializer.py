@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from training_calendar.instrumentation import TimedSerializerMixin
+
+
+class BoardDaySerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True, allow_null=True)
+    date = serializers.DateField(read_only=True)
+    description = serializers.CharField(read_only=True)
+    execution = serializers.CharField(read_only=True, allow_null=True)
+
+
+class BoardRowSerializer(TimedSerializerMixin, serializers.Serializer):
+    relation = serializers.IntegerField(source='relation.pk', read_only=True)
+    runner_name = serializers.CharField(source='relation.runner.username', read_only=True)
+    displayed_name = serializers.CharField(source='relation.displayed_name', read_only=True)
+    days = BoardDaySerializer(many=True, read_only=True)
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from training_calendar.instrumentation import TimedSerializerMixin
+
+
+class WeeklySummarySerializer(serializers.Serializer):
+    week = serializers.DateField(read_only=True)
+    planned = serializers.IntegerField(read_only=True)
+    executed = serializers.IntegerField(read_only=True)
+
+
+class ComplianceRowSerializer(TimedSerializerMixin, serializers.Serializer):
+    relation = serializers.IntegerField(source='relation.pk', read_only=True)
+    runner_name = serializers.CharField(source='relation.runner.username', read_only=True)
+    displayed_name = serializers.CharField(source='relation.displayed_name', read_only=True)
+    planned = serializers.IntegerField(read_only=True)
+    executed = serializers.IntegerField(read_only=True)
+    weeks = WeeklySummarySerializer(many=True, read_only=True)
@@ -1,11 +1,15 @@
+from django.utils.functional import cached_property
 from django.utils.translation import gettext
 from rest_framework import serializers
 
+from training_calendar.instrumentation import TimedSerializerMixin, timed
+from training_calendar.sparse_fields import SparseFieldsSerializerMixin
+from training_calendar.utils import url_template
 from trainings.models import Training
 from users.models import Relation, RelationStatus
 
 
-class TrainingSerializer(serializers.HyperlinkedModelSerializer):
+class TrainingSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin, serializers.HyperlinkedModelSerializer):
     relation = serializers.HyperlinkedRelatedField(view_name='users-api-runner-profile', lookup_field='pk',
                                                    queryset=Relation.objects.all())
     url = serializers.HyperlinkedIdentityField(view_name='trainings-api-entry', lookup_url_kwarg='pk')
@@ -19,3 +23,32 @@ class TrainingSerializer(serializers.HyperlinkedModelSerializer):
         if value.coach != self.context['request'].user or value.status != RelationStatus.ESTABLISHED:
             raise serializers.ValidationError(gettext("Invalid data"))
         return value
+
+
+class CompactTrainingSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    """Flat representation with integer ids, urls are filled from a template resolved once per serializer"""
+    relation = serializers.PrimaryKeyRelatedField(queryset=Relation.objects.all())
+    flat_fields = {
+        'id': lambda serializer, training: training.pk,
+        'url': lambda serializer, training: serializer.url_template.format(pk=training.pk),
+        'relation': lambda serializer, training: training.relation_id,
+        'date': lambda serializer, training: str(training.date),
+        'description': lambda serializer, training: training.description,
+        'execution': lambda serializer, training: training.execution,
+        'visible_since': lambda serializer, training: training.visible_since and str(training.visible_since),
+    }
+
+    class Meta:
+        model = Training
+        fields = ['id', 'relation', 'date', 'description', 'execution', 'visible_since']
+        read_only_fields = ['execution']
+
+    validate_relation = TrainingSerializer.validate_relation
+
+    @cached_property
+    def url_template(self) -> str:
+        return url_template(self.context.get('request'), 'trainings-api-entry', 'pk')
+
+    @timed('serializer')
+    def to_representation(self, instance: Training) -> dict:
+        return self.flat_representation(instance)
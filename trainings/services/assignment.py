@@ -0,0 +1,85 @@
+import datetime
+from enum import IntEnum
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from trainings.models import Training
+from trainings.services.summary import refresh_summaries
+from trainings.services.week_cache import invalidate_relations
+from users.models import Relation, RelationStatus, User, template_enum
+
+BATCH_SIZE = 500
+
+
+@template_enum
+class AssignmentStatus(IntEnum):
+    CREATED = 0
+    UPDATED = 1
+    SKIPPED = 2
+
+
+class Assignment:
+    """
+    Assignment of one training to many runners of a coach.
+    Relations and trainings already existing on the date are fetched once, in prepare_assignment,
+    and reused both for the conflict preview and for the writes.
+    """
+
+    def __init__(self, relations: Dict[str, Relation], existing: Dict[int, Training], missing: List[str],
+                 date: datetime.date):
+        self.relations = relations
+        self.existing = existing
+        self.missing = missing
+        self.date = date
+        self.results: Dict[str, AssignmentStatus] = {}
+
+    @property
+    def conflicts(self) -> List[Training]:
+        return list(self.existing.values())
+
+    def apply(self, description: str, visible_since: Optional[datetime.date] = None) -> Dict[str, AssignmentStatus]:
+        to_create = []
+        to_update = []
+        now = timezone.now()
+        for username, relation in self.relations.items():
+            training = self.existing.get(relation.pk)
+            if training is None:
+                to_create.append(Training(relation=relation, date=self.date, description=description,
+                                          visible_since=visible_since))
+                self.results[username] = AssignmentStatus.CREATED
+            elif (training.description, training.visible_since) != (description, visible_since):
+                training.description = description
+                training.visible_since = visible_since
+                training.updated_at = now
+                to_update.append(training)
+                self.results[username] = AssignmentStatus.UPDATED
+            else:
+                self.results[username] = AssignmentStatus.SKIPPED
+        for username in self.missing:
+            self.results[username] = AssignmentStatus.SKIPPED
+
+        with transaction.atomic():
+            Training.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+            Training.objects.bulk_update(to_update, ['description', 'visible_since', 'updated_at'],
+                                         batch_size=BATCH_SIZE)
+            # bulk writes don't send post_save
+            invalidate_relations(self.relations.values())
+            refresh_summaries((relation.pk, self.date) for relation in self.relations.values())
+        return self.results
+
+
+def prepare_assignment(coach: User, runners: Iterable[str], date: datetime.date) -> Assignment:
+    runners = list(runners)
+    relations = {relation.runner.username: relation for relation in
+                 Relation.objects.filter(coach=coach, runner__username__in=runners,
+                                         status=RelationStatus.ESTABLISHED).select_related('runner')}
+    by_pk = {relation.pk: relation for relation in relations.values()}
+    existing = {}
+    if by_pk:
+        for training in Training.objects.filter(relation__in=list(by_pk), date=date):
+            training.relation = by_pk[training.relation_id]
+            existing[training.relation_id] = training
+    missing = [runner for runner in runners if runner not in relations]
+    return Assignment(relations, existing, missing, date)
@@ -0,0 +1,179 @@
+import datetime
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext
+
+from trainings.models import Training
+from trainings.services.assignment import BATCH_SIZE
+from trainings.services.deletion import deleting_trainings
+from trainings.services.summary import refresh_summaries, training_slots
+from trainings.services.week_cache import invalidate_relations
+from users.models import Relation, RelationStatus, User
+
+
+class Operation(Enum):
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+
+class OperationResult:
+    def __init__(self, status: str, training: Optional[Training] = None, error: Optional[str] = None):
+        self.status = status
+        self.training = training
+        self.error = error
+
+
+class Batch:
+    """
+    Validates a list of operations against a coach's relations and applies them with bulk writes.
+    Operations are validated dicts with keys op, id, relation, date, description and visible_since.
+    """
+
+    def __init__(self, coach: User, operations: List[dict]):
+        self.coach = coach
+        self.operations = operations
+        self.results: List[Optional[OperationResult]] = [None] * len(operations)
+
+    @property
+    def valid(self) -> bool:
+        return all(result.error is None for result in self.results)
+
+    def _fetch(self) -> Tuple[Dict[int, Relation], Dict[int, Training], Dict[Tuple[int, datetime.date], Training]]:
+        relation_ids = {op['relation'] for op in self.operations if op.get('relation') is not None}
+        training_ids = {op['id'] for op in self.operations if op.get('id') is not None}
+        by_pk = {}
+        if training_ids:
+            by_pk = {training.pk: training for training in
+                     Training.objects.filter(pk__in=training_ids, relation__coach=self.coach)}
+            relation_ids |= {training.relation_id for training in by_pk.values()}
+        relations = {}
+        if relation_ids:
+            relations = {relation.pk: relation for relation in
+                         Relation.objects.filter(pk__in=relation_ids, coach=self.coach,
+                                                 status=RelationStatus.ESTABLISHED)}
+        for training in by_pk.values():
+            if training.relation_id in relations:
+                training.relation = relations[training.relation_id]
+
+        slots = set()
+        for op in self.operations:
+            training = by_pk.get(op.get('id'))
+            relation = op.get('relation') or (training.relation_id if training else None)
+            date = op.get('date') or (training.date if training else None)
+            if relation and date:
+                slots.add((relation, date))
+        by_slot = {}
+        if slots:
+            trainings = Training.objects.filter(relation_id__in={relation for relation, _ in slots},
+                                                date__in={date for _, date in slots})
+            by_slot = {(training.relation_id, training.date): by_pk.get(training.pk, training) for training in
+                       trainings if (training.relation_id, training.date) in slots}
+            for training in by_slot.values():
+                if training.relation_id in relations:
+                    training.relation = relations[training.relation_id]
+        return relations, by_pk, by_slot
+
+    def validate(self) -> bool:
+        relations, by_pk, by_slot = self._fetch()
+        occupied = dict(by_slot)
+        deleted = set()
+        for i, op in enumerate(self.operations):
+            operation = Operation(op['op'])
+            training = None
+            if operation == Operation.CREATE:
+                relation = relations.get(op.get('relation'))
+                if relation is None or op.get('date') is None or op.get('description') is None:
+                    self.results[i] = OperationResult('error', error=gettext('Invalid data'))
+                    continue
+                training = by_slot.get((relation.pk, op['date']))
+                if training is None:
+                    training = Training(relation=relation, date=op['date'])
+                    by_slot[(relation.pk, op['date'])] = training
+                status = 'created' if training.pk is None else 'updated'
+            else:
+                training = by_pk.get(op.get('id'))
+                if training is None or training.relation_id not in relations or training.pk in deleted:
+                    self.results[i] = OperationResult('error', error=gettext('Not found'))
+                    continue
+                if operation == Operation.DELETE:
+                    deleted.add(training.pk)
+                    by_slot.pop((training.relation_id, training.date), None)
+                    self.results[i] = OperationResult('deleted', training)
+                    continue
+                if op.get('relation') is not None and op['relation'] != training.relation_id:
+                    self.results[i] = OperationResult('error', error=gettext('Invalid data'))
+                    continue
+                date = op.get('date') or training.date
+                other = by_slot.get((training.relation_id, date))
+                occupant = occupied.get((training.relation_id, date))
+                # rows are updated in one statement, so a day still holding another saved training can't be reused
+                if (other is not None and other is not training) or \
+                        (occupant is not None and occupant is not training and occupant.pk not in deleted):
+                    self.results[i] = OperationResult('error', error=gettext('Training for this day already exists'))
+                    continue
+                by_slot.pop((training.relation_id, training.date), None)
+                by_slot[(training.relation_id, date)] = training
+                training.date = date
+                status = 'updated'
+
+            for field in ['description', 'visible_since']:
+                if field in op:
+                    setattr(training, field, op[field])
+            self.results[i] = OperationResult(status, training)
+        return self.valid
+
+    def apply(self) -> List[OperationResult]:
+        """
+        Write every operation, or none of them when a day was taken by another request since validate,
+        operations writing to it are then turned into errors.
+        """
+        assert self.valid
+        deleted = {result.training.pk for result in self.results if result.status == 'deleted'}
+        to_create = {}
+        to_update = {}
+        for result in self.results:
+            if result.status == 'deleted':
+                continue
+            if result.training.pk is None:
+                to_create[id(result.training)] = result.training
+            else:
+                to_update[result.training.pk] = result.training
+
+        try:
+            with transaction.atomic():
+                if deleted:
+                    trainings = Training.objects.filter(pk__in=deleted)
+                    with deleting_trainings(trainings):
+                        trainings.delete()
+                if to_update:
+                    now = timezone.now()
+                    for training in to_update.values():
+                        training.updated_at = now
+                    Training.objects.bulk_update(to_update.values(),
+                                                 ['date', 'description', 'visible_since', 'updated_at'],
+                                                 batch_size=BATCH_SIZE)
+                Training.objects.bulk_create(to_create.values(), batch_size=BATCH_SIZE)
+                # bulk writes don't send post_save and deleted trainings are skipped by delete signals
+                invalidate_relations({result.training.relation for result in self.results})
+                refresh_summaries(training_slots(list(to_update.values()) + list(to_create.values())))
+        except IntegrityError:
+            # another request took one of the days after validation
+            if not self._conflicts(list(to_create.values()) + list(to_update.values()), deleted):
+                raise
+        return self.results
+
+    def _conflicts(self, trainings: List[Training], deleted: Set[int]) -> bool:
+        slots = {(training.relation_id, training.date): training for training in trainings}
+        taken = Training.objects.filter(relation_id__in={relation for relation, _ in slots},
+                                        date__in={date for _, date in slots}).values_list('pk', 'relation_id', 'date')
+        occupied = {(relation, date) for pk, relation, date in taken
+                    if (relation, date) in slots and slots[(relation, date)].pk != pk and pk not in deleted}
+        for i, result in enumerate(self.results):
+            if result.training is not None and result.status != 'deleted' and \
+                    (result.training.relation_id, result.training.date) in occupied:
+                self.results[i] = OperationResult('error', error=gettext('Training for this day already exists'))
+        return bool(occupied)
@@ -0,0 +1,66 @@
+import datetime
+from typing import List, Optional
+
+from trainings.models import Training
+from trainings.services.week import DAY, WEEK, Day, fill_days, group_by_date
+from users.models import Relation, RelationStatus, User
+
+BOARD_PAGE_SIZE = 25
+MAX_BOARD_PAGE_SIZE = 100
+
+
+class BoardRow:
+    def __init__(self, relation: Relation, days: List[Day]):
+        self.relation = relation
+        self.days = days
+
+
+class Board:
+    def __init__(self, monday: datetime.date, rows: List[BoardRow], next_cursor: Optional[str] = None):
+        self.monday = monday
+        self.rows = rows
+        self.next_cursor = next_cursor
+
+    @property
+    def dates(self) -> List[datetime.date]:
+        return [self.monday + i * DAY for i in range(7)]
+
+    @property
+    def previous_week(self) -> datetime.date:
+        return self.monday - WEEK
+
+    @property
+    def next_week(self) -> datetime.date:
+        return self.monday + WEEK
+
+
+def resolve_board(coach: User, monday: datetime.date, after: Optional[str] = None,
+                  limit: int = BOARD_PAGE_SIZE) -> Board:
+    """
+    Resolve a week of trainings for a page of established runners of the coach.
+    Runners are paginated by username (keyset), after is the username of the last runner of the previous page.
+    Uses one query for relations and one for trainings, pivoted in memory.
+    """
+    relations = Relation.objects.filter(coach=coach, status=RelationStatus.ESTABLISHED).select_related(
+        'runner', 'coach').order_by('runner__username')
+    if after:
+        relations = relations.filter(runner__username__gt=after)
+    relations = list(relations[:limit + 1])
+    next_cursor = None
+    if len(relations) > limit:
+        relations = relations[:limit]
+        next_cursor = relations[-1].runner.username
+
+    by_relation = {relation.pk: [] for relation in relations}
+    if relations:
+        trainings = Training.objects.filter(relation__in=list(by_relation),
+                                            date__range=(monday, monday + 6 * DAY)).order_by('date')
+        for training in trainings:
+            by_relation[training.relation_id].append(training)
+
+    rows = []
+    for relation in relations:
+        for training in by_relation[relation.pk]:
+            training.relation = relation
+        rows.append(BoardRow(relation, fill_days(group_by_date(by_relation[relation.pk]), relation, monday, 7)))
+    return Board(monday, rows, next_cursor)
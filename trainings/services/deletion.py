@@ -0,0 +1,74 @@
+import threading
+from contextlib import contextmanager
+from typing import Set
+
+from django.db.models import QuerySet
+
+from trainings.models import Tombstone, Training
+from trainings.services.summary import refresh_summaries
+
+_marked = threading.local()
+
+
+def marked_relations() -> Set[int]:
+    """Relations being deleted by this thread, whose trainings were already handled as a set"""
+    if not hasattr(_marked, 'relations'):
+        _marked.relations = set()
+    return _marked.relations
+
+
+def marked_trainings() -> Set[int]:
+    """Trainings being deleted by this thread, already handled as a set"""
+    if not hasattr(_marked, 'trainings'):
+        _marked.trainings = set()
+    return _marked.trainings
+
+
+def is_marked(training: Training) -> bool:
+    return training.pk in marked_trainings() or training.relation_id in marked_relations()
+
+
+def tombstone_relations(relations: QuerySet) -> Set[int]:
+    """
+    Tombstones of relations and of all their trainings, with one query per model and one insert.
+    The relations are marked, so delete signals of their trainings skip them (weekly summaries go away
+    with the relation). Returns their ids.
+    """
+    coaches = dict(relations.values_list('pk', 'coach_id'))
+    if not coaches:
+        return set()
+    trainings = Training.objects.filter(relation__in=relations.values('pk')).values_list('pk', 'relation_id')
+    Tombstone.objects.bulk_create(
+        [Tombstone(model=Tombstone.TRAINING, object_id=pk, coach_id=coaches[relation_id])
+         for pk, relation_id in trainings] +
+        [Tombstone(model=Tombstone.RELATION, object_id=pk, coach_id=coach_id) for pk, coach_id in coaches.items()])
+    marked_relations().update(coaches)
+    return set(coaches)
+
+
+@contextmanager
+def deleting_relations(relations: QuerySet):
+    """Relations deleted in the block are tombstoned, along with their trainings, in one insert"""
+    ids = tombstone_relations(relations)
+    try:
+        yield
+    finally:
+        marked_relations().difference_update(ids)
+
+
+@contextmanager
+def deleting_trainings(trainings: QuerySet):
+    """
+    Trainings deleted in the block are tombstoned in one insert and their weekly summaries refreshed at once,
+    instead of by a delete signal per training.
+    """
+    rows = list(trainings.values_list('pk', 'relation_id', 'relation__coach_id', 'date'))
+    Tombstone.objects.bulk_create([Tombstone(model=Tombstone.TRAINING, object_id=pk, coach_id=coach_id)
+                                   for pk, _, coach_id, _ in rows])
+    ids = {pk for pk, _, _, _ in rows}
+    marked_trainings().update(ids)
+    try:
+        yield
+    finally:
+        marked_trainings().difference_update(ids)
+    refresh_summaries((relation_id, date) for _, relation_id, _, date in rows)
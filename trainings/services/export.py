@@ -0,0 +1,79 @@
+import csv
+import datetime
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from django.db.models import QuerySet
+
+from trainings.models import Training
+from users.models import User
+
+EXPORT_CHUNK_SIZE = 2000
+ROWS_PER_CHUNK = 500
+FORMATS = ['csv', 'jsonl']
+CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8', 'jsonl': 'application/x-ndjson'}
+COLUMNS = ['id', 'relation', 'runner', 'nickname', 'date', 'description', 'execution', 'visible_since',
+           'updated_at']
+FIELDS = ['id', 'relation_id', 'relation__runner__username', 'relation__nickname', 'date', 'description',
+          'execution', 'visible_since', 'updated_at']
+
+
+def export_queryset(coach: User, start: Optional[datetime.date] = None,
+                    end: Optional[datetime.date] = None) -> QuerySet:
+    trainings = Training.objects.filter(relation__coach=coach)
+    if start is not None:
+        trainings = trainings.filter(date__gte=start)
+    if end is not None:
+        trainings = trainings.filter(date__lte=end)
+    return trainings.order_by('relation_id', 'date').values_list(*FIELDS)
+
+
+def iterate_rows(trainings: QuerySet) -> Iterator[tuple]:
+    """Rows fetched in chunks, through a server-side cursor on databases that have them"""
+    for row in trainings.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield tuple(value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else value
+                    for value in row)
+
+
+def csv_chunks(rows: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_chunks(rows: Iterable[tuple]) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n')
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ''.join(lines)
+            lines = []
+    yield ''.join(lines)
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_trainings(trainings: QuerySet, fmt: str, compress: bool = False) -> Iterator[bytes]:
+    """
+    Trainings of export_queryset encoded as CSV or JSON Lines, gzipped on the fly with compress.
+    Memory use doesn't depend on the number of rows.
+    """
+    chunks = {'csv': csv_chunks, 'jsonl': jsonl_chunks}[fmt](iterate_rows(trainings))
+    encoded = (chunk.encode() for chunk in chunks if chunk)
+    return gzip_chunks(encoded) if compress else encoded
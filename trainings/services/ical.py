@@ -0,0 +1,74 @@
+import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+from trainings.models import CalendarFeed, Training
+
+FEED_CHUNK_SIZE = 2000
+EVENTS_PER_CHUNK = 100
+LINE_LIMIT = 75
+Row = Tuple[int, datetime.date, str, Optional[str], datetime.datetime]
+
+
+def feed_trainings(feed: CalendarFeed) -> QuerySet:
+    """Trainings of a feed, runners only see trainings their coach already made visible"""
+    if feed.relation_id is not None:
+        return Training.objects.filter(relation_id=feed.relation_id)
+    today = datetime.date.today()
+    return Training.objects.filter(Q(visible_since=None) | Q(visible_since__lte=today),
+                                   relation__runner_id=feed.user_id)
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n') \
+        .replace('\n', '\\n')
+
+
+def fold(line: str) -> str:
+    """Content line folded after LINE_LIMIT octets (RFC 5545, 3.1), without splitting UTF-8 characters"""
+    if len(line.encode()) <= LINE_LIMIT:
+        return line + '\r\n'
+    parts: List[str] = []
+    current, size = '', 0
+    for char in line:
+        length = len(char.encode())
+        if size + length > LINE_LIMIT:
+            parts.append(current)
+            current, size = ' ', 1
+        current += char
+        size += length
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def render_event(row: Row, host: str) -> str:
+    pk, date, description, execution, updated_at = row
+    summary = description.strip().splitlines()[0] if description.strip() else ''
+    details = description if execution is None else f'{description}\n\n{execution}'
+    lines = ['BEGIN:VEVENT',
+             f'UID:training-{pk}@{host}',
+             f'DTSTAMP:{updated_at.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}',
+             f'DTSTART;VALUE=DATE:{date:%Y%m%d}',
+             f'DTEND;VALUE=DATE:{date + datetime.timedelta(days=1):%Y%m%d}',
+             f'SUMMARY:{escape(summary)}',
+             f'DESCRIPTION:{escape(details)}',
+             'END:VEVENT']
+    return ''.join(fold(line) for line in lines)
+
+
+def stream_calendar(name: str, trainings: QuerySet, host: str) -> Iterator[str]:
+    """
+    iCalendar document of trainings, produced in chunks of EVENTS_PER_CHUNK events.
+    Rows are read as tuples in batches of FEED_CHUNK_SIZE, so memory doesn't grow with the history.
+    """
+    yield ''.join(fold(line) for line in ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//training_calendar//PL',
+                                          'CALSCALE:GREGORIAN', f'X-WR-CALNAME:{escape(name)}'])
+    rows = trainings.order_by('date').values_list('id', 'date', 'description', 'execution', 'updated_at')
+    events = []
+    for row in rows.iterator(chunk_size=FEED_CHUNK_SIZE):
+        events.append(render_event(row, host))
+        if len(events) >= EVENTS_PER_CHUNK:
+            yield ''.join(events)
+            events = []
+    yield ''.join(events) + fold('END:VCALENDAR')
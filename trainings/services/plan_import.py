@@ -0,0 +1,187 @@
+import codecs
+import csv
+import datetime
+from collections import Counter
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from training_calendar.utils import date_from_string
+from trainings.models import Training
+from trainings.services.assignment import AssignmentStatus
+from trainings.services.summary import refresh_summaries
+from trainings.services.week_cache import invalidate_relations
+from users.models import Relation, RelationStatus, User
+
+IMPORT_BATCH_SIZE = 1000
+# a batch colliding with concurrent writes this many times fails the import
+UPSERT_ATTEMPTS = 3
+COLUMNS = ['runner', 'date', 'description', 'visible_since']
+# utf-8-sig drops the byte order mark spreadsheets put in front of the header
+ENCODING = 'utf-8-sig'
+CHECK_CHUNK_SIZE = 64 * 1024
+
+
+def check_encoding(file: BinaryIO):
+    """
+    Raise UnicodeDecodeError unless the whole file decodes, before any batch is written,
+    then rewind it. The file is read in chunks, it's never loaded whole.
+    """
+    decoder = codecs.getincrementaldecoder(ENCODING)()
+    for chunk in iter(lambda: file.read(CHECK_CHUNK_SIZE), b''):
+        decoder.decode(chunk)
+    decoder.decode(b'', final=True)
+    file.seek(0)
+
+
+class PlanRow(NamedTuple):
+    line: int
+    relation: Relation
+    date: datetime.date
+    description: str
+    visible_since: Optional[datetime.date]
+
+
+class RowError(Exception):
+    pass
+
+
+class PlanImport:
+    """
+    Import of a CSV training plan with columns runner (username or nickname), date, description
+    and visible_since (optional), dates being yyyy-mm-dd.
+    Relations are fetched once, existing trainings once per batch, and each batch is upserted in a transaction.
+    Invalid rows are collected in errors, with dry_run nothing is written but the counts are the same.
+    """
+
+    def __init__(self, coach: User, dry_run: bool = False, batch_size: int = IMPORT_BATCH_SIZE):
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.relations: Dict[str, Relation] = {}
+        relations = list(Relation.objects.filter(coach=coach, status=RelationStatus.ESTABLISHED)
+                         .select_related('runner'))
+        for relation in relations:
+            self.relations[relation.runner.username] = relation
+        # a nickname equal to the username of another runner could mean either of them
+        self.ambiguous: Set[str] = set()
+        for relation in relations:
+            if not relation.nickname:
+                continue
+            if self.relations.get(relation.nickname, relation) is not relation:
+                self.ambiguous.add(relation.nickname)
+            else:
+                self.relations[relation.nickname] = relation
+        self.seen: Dict[Tuple[int, datetime.date], int] = {}
+        self.errors: List[Tuple[int, str]] = []
+        self.counts: Counter = Counter()
+
+    def run(self, lines: Iterable[str]) -> 'PlanImport':
+        reader = csv.DictReader(lines)
+        missing = [column for column in COLUMNS[:3] if column not in (reader.fieldnames or [])]
+        if missing:
+            self.errors.append((1, f'missing columns: {", ".join(missing)}'))
+            return self
+
+        batch: List[PlanRow] = []
+        # the header is line 1
+        for line, row in enumerate(reader, 2):
+            try:
+                batch.append(self.parse(line, row))
+            except RowError as e:
+                self.errors.append((line, str(e)))
+            if len(batch) >= self.batch_size:
+                self.upsert(batch)
+                batch = []
+        self.upsert(batch)
+        return self
+
+    def parse(self, line: int, row: dict) -> PlanRow:
+        runner = (row.get('runner') or '').strip()
+        if runner in self.ambiguous:
+            raise RowError(f'{runner!r} is both a username and a nickname of another runner')
+        relation = self.relations.get(runner)
+        if relation is None:
+            raise RowError(f'no runner {runner!r}')
+        try:
+            date = date_from_string((row.get('date') or '').strip())
+            visible_since = (row.get('visible_since') or '').strip()
+            visible_since = date_from_string(visible_since) if visible_since else None
+        except ValueError:
+            raise RowError('date format should be yyyy-mm-dd')
+        description = (row.get('description') or '').strip()
+        if not description:
+            raise RowError('description is required')
+
+        key = (relation.pk, date)
+        if key in self.seen:
+            raise RowError(f'training of {runner!r} on {date} is already on line {self.seen[key]}')
+        self.seen[key] = line
+        return PlanRow(line, relation, date, description, visible_since)
+
+    def existing(self, batch: List[PlanRow]) -> Dict[Tuple[int, datetime.date], Training]:
+        return {(training.relation_id, training.date): training for training in Training.objects.filter(
+            relation__in={row.relation.pk for row in batch}, date__in={row.date for row in batch})}
+
+    def upsert(self, batch: List[PlanRow]):
+        """
+        Trainings added by another request between reading the batch's trainings and writing it
+        fail the insert, the batch is then planned again against a fresh read.
+        """
+        if not batch:
+            return
+        for attempt in range(UPSERT_ATTEMPTS):
+            counts, to_create, to_update, touched = self.plan(batch, self.existing(batch))
+            if self.dry_run or not touched:
+                break
+            try:
+                with transaction.atomic():
+                    Training.objects.bulk_create(to_create)
+                    Training.objects.bulk_update(to_update, ['description', 'visible_since', 'updated_at'])
+                    # bulk writes don't send post_save
+                    invalidate_relations(touched)
+                    refresh_summaries((training.relation_id, training.date) for training in to_create + to_update)
+            except IntegrityError:
+                if attempt == UPSERT_ATTEMPTS - 1:
+                    raise
+            else:
+                break
+        self.counts += counts
+
+    @staticmethod
+    def plan(batch: List[PlanRow], existing: Dict[Tuple[int, datetime.date], Training]) \
+            -> Tuple[Counter, List[Training], List[Training], Set[Relation]]:
+        counts: Counter = Counter()
+        to_create: List[Training] = []
+        to_update: List[Training] = []
+        touched: Set[Relation] = set()
+        now = timezone.now()
+        for row in batch:
+            training = existing.get((row.relation.pk, row.date))
+            if training is None:
+                to_create.append(Training(relation=row.relation, date=row.date, description=row.description,
+                                          visible_since=row.visible_since))
+                counts[AssignmentStatus.CREATED] += 1
+            elif (training.description, training.visible_since) != (row.description, row.visible_since):
+                training.description = row.description
+                training.visible_since = row.visible_since
+                training.updated_at = now
+                to_update.append(training)
+                counts[AssignmentStatus.UPDATED] += 1
+            else:
+                counts[AssignmentStatus.SKIPPED] += 1
+                continue
+            touched.add(row.relation)
+        return counts, to_create, to_update, touched
+
+    @property
+    def created(self) -> int:
+        return self.counts[AssignmentStatus.CREATED]
+
+    @property
+    def updated(self) -> int:
+        return self.counts[AssignmentStatus.UPDATED]
+
+    @property
+    def unchanged(self) -> int:
+        return self.counts[AssignmentStatus.SKIPPED]
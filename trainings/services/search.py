@@ -0,0 +1,66 @@
+import re
+from typing import List
+
+from django.db import connection
+from django.db.models import Q
+
+from trainings.models import Training
+from users.models import RelationStatus, User
+
+SEARCH_PAGE_SIZE = 25
+MAX_SEARCH_PAGE_SIZE = 100
+# results further than that aren't worth ranking, it also keeps offsets within database integers
+MAX_SEARCH_OFFSET = 10000
+MAX_TERMS = 10
+
+# the index is maintained by triggers of migration 0004_training_search
+SQLITE_SEARCH = """
+    SELECT training.id FROM trainings_training_fts
+    JOIN trainings_training training ON training.id = trainings_training_fts.rowid
+    JOIN users_relation relation ON relation.id = training.relation_id
+    WHERE trainings_training_fts MATCH %s AND relation.coach_id = %s AND relation.status = %s
+    ORDER BY bm25(trainings_training_fts, 2.0, 1.0), training.date DESC
+    LIMIT %s OFFSET %s
+"""
+POSTGRESQL_SEARCH = """
+    SELECT training.id FROM trainings_training training
+    JOIN users_relation relation ON relation.id = training.relation_id
+    WHERE training.search_vector @@ to_tsquery('pg_catalog.simple', %s)
+        AND relation.coach_id = %s AND relation.status = %s
+    ORDER BY ts_rank(training.search_vector, to_tsquery('pg_catalog.simple', %s)) DESC, training.date DESC
+    LIMIT %s OFFSET %s
+"""
+
+
+def search_terms(text: str) -> List[str]:
+    """Words of the query, anything else (operators, quotes) is dropped"""
+    return re.findall(r'\w+', text.lower())[:MAX_TERMS]
+
+
+def ranked_ids(coach: User, terms: List[str], limit: int, offset: int) -> List[int]:
+    # every term has to match, the last one may be a prefix of a word still being typed
+    if connection.vendor == 'sqlite':
+        query = ' '.join(f'"{term}"' for term in terms) + '*'
+        sql, params = SQLITE_SEARCH, [query, coach.pk, RelationStatus.ESTABLISHED.value, limit, offset]
+    elif connection.vendor == 'postgresql':
+        query = ' & '.join(terms) + ':*'
+        sql, params = POSTGRESQL_SEARCH, [query, coach.pk, RelationStatus.ESTABLISHED.value, query, limit, offset]
+    else:
+        trainings = Training.objects.filter(relation__coach=coach, relation__status=RelationStatus.ESTABLISHED)
+        for term in terms:
+            trainings = trainings.filter(Q(description__icontains=term) | Q(execution__icontains=term))
+        return list(trainings.order_by('-date').values_list('pk', flat=True)[offset:offset + limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_trainings(coach: User, text: str, limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> List[Training]:
+    """Trainings of the established relations of the coach matching every word of text, best matches first"""
+    terms = search_terms(text)
+    if not terms:
+        return []
+    ids = ranked_ids(coach, terms, limit, offset)
+    trainings = Training.objects.select_related('relation__runner').in_bulk(ids)
+    return [trainings[pk] for pk in ids if pk in trainings]
@@ -0,0 +1,148 @@
+import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+
+from trainings.models import Training, WeeklySummary
+from trainings.services.week import DAY, WEEK
+from users.models import Relation, RelationStatus, User
+
+SUMMARY_CHUNK_SIZE = 500
+COMPLIANCE_WEEKS = 12
+MAX_COMPLIANCE_WEEKS = 53
+Slot = Tuple[int, datetime.date]
+
+
+def monday_of(date: datetime.date) -> datetime.date:
+    return date - datetime.timedelta(days=date.weekday())
+
+
+def training_slots(trainings: Iterable[Training]) -> Set[Slot]:
+    """(relation id, date) of trainings, including the dates they were loaded with"""
+    # trainings saved with a yyyy-mm-dd string still hold it until they are loaded again
+    to_date = Training._meta.get_field('date').to_python
+    slots = set()
+    for training in trainings:
+        slots.add((training.relation_id, to_date(training.date)))
+        if getattr(training, 'loaded_date', None) is not None:
+            slots.add((training.relation_id, to_date(training.loaded_date)))
+    return slots
+
+
+def count_weeks(trainings) -> dict:
+    rows = trainings.annotate(week=TruncWeek('date')).values('relation_id', 'week').annotate(
+        planned=Count('id'), executed=Count('execution')).order_by()
+    return {(row['relation_id'], row['week']): (row['planned'], row['executed']) for row in rows}
+
+
+def refresh_summaries(slots: Iterable[Slot]):
+    """
+    Recompute the summaries of the weeks of (relation id, date) slots after trainings were written,
+    with one aggregate query and one query per kind of write.
+    """
+    weeks = {(relation_id, monday_of(date)) for relation_id, date in slots if date is not None}
+    if not weeks:
+        return
+    relation_ids = {relation_id for relation_id, _ in weeks}
+    mondays = {monday for _, monday in weeks}
+    counts = count_weeks(Training.objects.filter(relation_id__in=relation_ids,
+                                                 date__range=(min(mondays), max(mondays) + 6 * DAY)))
+    existing = {(summary.relation_id, summary.week): summary for summary in
+                WeeklySummary.objects.filter(relation_id__in=relation_ids, week__in=mondays)}
+
+    to_create, to_update, to_delete = [], [], []
+    for key in weeks:
+        planned, executed = counts.get(key, (0, 0))
+        summary = existing.get(key)
+        if summary is None:
+            if planned:
+                to_create.append(WeeklySummary(relation_id=key[0], week=key[1], planned=planned, executed=executed))
+        elif not planned:
+            to_delete.append(summary.pk)
+        elif (summary.planned, summary.executed) != (planned, executed):
+            summary.planned, summary.executed = planned, executed
+            to_update.append(summary)
+
+    # callers writing trainings in bulk already hold a transaction, a savepoint would only add queries
+    with transaction.atomic(savepoint=False):
+        if to_delete:
+            WeeklySummary.objects.filter(pk__in=to_delete).delete()
+        WeeklySummary.objects.bulk_update(to_update, ['planned', 'executed'])
+        # a concurrent write of the same week may have created it, rebuild_summaries corrects such rows
+        WeeklySummary.objects.bulk_create(to_create, ignore_conflicts=True)
+
+
+def relation_chunks(relation_ids: Optional[Iterable[int]], chunk_size: int) -> Iterator[List[int]]:
+    if relation_ids is not None:
+        relation_ids = sorted(relation_ids)
+        for i in range(0, len(relation_ids), chunk_size):
+            yield relation_ids[i:i + chunk_size]
+        return
+    last = 0
+    while True:
+        chunk = list(Relation.objects.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def rebuild_summaries(relation_ids: Optional[Iterable[int]] = None, chunk_size: int = SUMMARY_CHUNK_SIZE,
+                      progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Recompute every summary of relation_ids (all relations by default), chunk_size relations per transaction.
+    progress is called after each chunk with the numbers of relations and summaries written so far.
+    Returns the number of summaries.
+    """
+    relations = summaries = 0
+    for chunk in relation_chunks(relation_ids, chunk_size):
+        counts = count_weeks(Training.objects.filter(relation_id__in=chunk))
+        with transaction.atomic():
+            WeeklySummary.objects.filter(relation_id__in=chunk).delete()
+            WeeklySummary.objects.bulk_create([
+                WeeklySummary(relation_id=relation_id, week=week, planned=planned, executed=executed)
+                for (relation_id, week), (planned, executed) in counts.items()])
+        relations += len(chunk)
+        summaries += len(counts)
+        if progress is not None:
+            progress(relations, summaries)
+    return summaries
+
+
+class ComplianceRow:
+    def __init__(self, relation: Relation, weeks: List[WeeklySummary]):
+        self.relation = relation
+        self.weeks = weeks
+
+    @property
+    def planned(self) -> int:
+        return sum(week.planned for week in self.weeks)
+
+    @property
+    def executed(self) -> int:
+        return sum(week.executed for week in self.weeks)
+
+
+def compliance_range(date: Optional[datetime.date], weeks: int) -> datetime.date:
+    """First monday of weeks starting at date, or of the last weeks up to the current one without date"""
+    if date is not None:
+        return monday_of(date)
+    return monday_of(datetime.date.today()) - (weeks - 1) * WEEK
+
+
+def resolve_compliance(coach: User, first: datetime.date, weeks: int = COMPLIANCE_WEEKS) -> List[ComplianceRow]:
+    """
+    Weekly summaries of the established runners of the coach for weeks starting at the monday of first,
+    weeks without trainings are filled with empty summaries. Uses one query for relations and one for summaries.
+    """
+    first = monday_of(first)
+    mondays = [first + i * WEEK for i in range(weeks)]
+    relations = list(Relation.objects.filter(coach=coach, status=RelationStatus.ESTABLISHED)
+                     .select_related('runner').order_by('runner__username'))
+    summaries = {(summary.relation_id, summary.week): summary for summary in WeeklySummary.objects.filter(
+        relation__in=relations, week__range=(mondays[0], mondays[-1]))} if relations else {}
+    return [ComplianceRow(relation, [summaries.get((relation.pk, monday)) or
+                                     WeeklySummary(relation=relation, week=monday) for monday in mondays])
+            for relation in relations]
@@ -0,0 +1,106 @@
+import datetime
+from typing import List, Optional, Tuple
+
+from django.core import signing
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from trainings.models import Tombstone, Training
+from users.models import Relation, User
+
+TOKEN_SALT = 'trainings.sync'
+CURSOR_SALT = 'trainings.sync.snapshot'
+# rows saved by transactions still open when a token is issued get a slightly older updated_at
+OVERLAP = datetime.timedelta(seconds=5)
+# older tokens are rejected, clients start over with a snapshot; tombstones are kept as long as tokens
+TOKEN_MAX_AGE = datetime.timedelta(days=30)
+SNAPSHOT_PAGE_SIZE = 500
+
+
+def encode_token(moment: datetime.datetime) -> str:
+    return signing.dumps(moment.isoformat(), salt=TOKEN_SALT)
+
+
+def decode_token(token: str) -> datetime.datetime:
+    """Raises signing.BadSignature for tokens not issued by encode_token or older than TOKEN_MAX_AGE"""
+    moment = parse_datetime(signing.loads(token, salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE))
+    if moment is None:
+        raise signing.BadSignature()
+    return moment
+
+
+def encode_cursor(started: datetime.datetime, after: int) -> str:
+    return signing.dumps([started.isoformat(), after], salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    """Raises signing.BadSignature for cursors not issued by encode_cursor or older than TOKEN_MAX_AGE"""
+    try:
+        started, after = signing.loads(cursor, salt=CURSOR_SALT, max_age=TOKEN_MAX_AGE)
+        started = parse_datetime(started)
+    except (TypeError, ValueError):
+        raise signing.BadSignature()
+    if started is None or not isinstance(after, int):
+        raise signing.BadSignature()
+    return started, after
+
+
+def last_deletion(coach_ids) -> Optional[datetime.datetime]:
+    """
+    When a training or relation of coaches (ids or a subquery of them) was last deleted.
+    Tombstones only know the coach, so deletions in every relation of the coaches count.
+    """
+    return Tombstone.objects.filter(coach_id__in=coach_ids).aggregate(deleted_at=Max('deleted_at'))['deleted_at']
+
+
+class Changes:
+    def __init__(self, token: str, trainings: List[Training], relations: List[Relation],
+                 tombstones: List[Tombstone], cursor: Optional[str] = None):
+        self.token = token
+        self.trainings = trainings
+        self.relations = relations
+        self.tombstones = tombstones
+        # next page of a snapshot
+        self.cursor = cursor
+
+
+def snapshot(coach: User, cursor: Optional[str] = None, page_size: int = SNAPSHOT_PAGE_SIZE) -> Changes:
+    """
+    Everything of the coach, trainings in pages of page_size ordered by id, relations with the first page.
+    Every page carries the token of the moment the snapshot started, so changes_since with it returns
+    whatever changed while the pages were fetched.
+    """
+    started, after = decode_cursor(cursor) if cursor else (timezone.now(), 0)
+    trainings = list(Training.objects.filter(relation__coach=coach, pk__gt=after).order_by('pk')[:page_size + 1])
+    next_cursor = None
+    if len(trainings) > page_size:
+        trainings = trainings[:page_size]
+        next_cursor = encode_cursor(started, trainings[-1].pk)
+    relations = []
+    if not after:
+        relations = list(Relation.objects.filter(coach=coach).select_related('runner').order_by('updated_at', 'id'))
+    return Changes(encode_token(started), trainings, relations, [], next_cursor)
+
+
+def changes_since(coach: User, since: Optional[datetime.datetime] = None) -> Changes:
+    """
+    Trainings and relations of the coach changed at or after since, plus tombstones of deleted ones.
+    Without since the first page of a snapshot is returned. The window starts OVERLAP before since, so rows
+    may be sent again rather than missed; clients should apply changes idempotently.
+    """
+    if since is None:
+        return snapshot(coach)
+    token = encode_token(timezone.now())
+    since -= OVERLAP
+    trainings = Training.objects.filter(relation__coach=coach, updated_at__gte=since)
+    relations = Relation.objects.filter(coach=coach, updated_at__gte=since).select_related('runner')
+    tombstones = Tombstone.objects.filter(coach_id=coach.pk, deleted_at__gte=since).order_by('deleted_at')
+    return Changes(token, list(trainings.order_by('updated_at', 'id')), list(relations.order_by('updated_at', 'id')),
+                   list(tombstones))
+
+
+def prune_tombstones() -> int:
+    """Delete tombstones no valid token can ask for anymore, returns how many were deleted"""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - TOKEN_MAX_AGE - OVERLAP).delete()
+    return deleted
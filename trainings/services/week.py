@@ -0,0 +1,122 @@
+import datetime
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+from django.db.models import QuerySet
+
+from trainings.models import Training
+from users.models import Relation
+
+DAY = datetime.timedelta(days=1)
+WEEK = datetime.timedelta(days=7)
+
+
+class EmptyTraining:
+    """Placeholder for a day without a training, rendered in place of an unsaved Training"""
+    __slots__ = ['relation', 'date']
+    pk = None
+    id = None
+    description = ''
+    execution = None
+    visible_since = None
+
+    def __init__(self, relation: Optional[Relation], date: datetime.date):
+        self.relation = relation
+        self.date = date
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EmptyTraining) and (self.relation, self.date) == (other.relation, other.date)
+
+    def __hash__(self) -> int:
+        return hash((self.relation, self.date))
+
+    def __repr__(self) -> str:
+        return f'EmptyTraining(date={self.date})'
+
+
+Day = Union[Training, EmptyTraining]
+
+
+class CalendarRange:
+    """Consecutive days starting at start, each holding a training or a placeholder"""
+
+    def __init__(self, relation: Optional[Relation], start: datetime.date, days: List[Day],
+                 entry: Optional[Training] = None):
+        self.relation = relation
+        self.start = start
+        self.days = days
+        self.entry = entry
+
+    @property
+    def end(self) -> datetime.date:
+        return self.start + (len(self.days) - 1) * DAY
+
+    @property
+    def weeks(self) -> List[List[Day]]:
+        return [self.days[i:i + 7] for i in range(0, len(self.days), 7)]
+
+
+class Week(CalendarRange):
+    @property
+    def monday(self) -> datetime.date:
+        return self.start
+
+    @property
+    def sunday(self) -> datetime.date:
+        return self.end
+
+    @property
+    def previous_week(self) -> datetime.date:
+        return self.monday - WEEK
+
+    @property
+    def next_week(self) -> datetime.date:
+        return self.monday + WEEK
+
+
+def group_by_date(trainings: Iterable[Training]) -> Dict[datetime.date, List[Training]]:
+    by_date = {}
+    for training in trainings:
+        by_date.setdefault(training.date, []).append(training)
+    return by_date
+
+
+def fill_days(by_date: Dict[datetime.date, List[Training]], relation: Optional[Relation], start: datetime.date,
+              days: int) -> List[Day]:
+    filled = []
+    for i in range(days):
+        date = start + i * DAY
+        trainings = by_date.get(date)
+        filled.append(trainings[0] if trainings else EmptyTraining(relation, date))
+    return filled
+
+
+def fetch_by_date(trainings: QuerySet, start: datetime.date, days: int) -> Dict[datetime.date, List[Training]]:
+    end = start + (days - 1) * DAY
+    return group_by_date(trainings.filter(date__range=(start, end)).select_related(
+        'relation__runner', 'relation__coach').order_by('date', 'pk'))
+
+
+def build_range(by_date: Dict[datetime.date, List[Training]], relation: Optional[Relation], start: datetime.date,
+                days: int, entry_date: Optional[datetime.date] = None,
+                range_class: Type[CalendarRange] = CalendarRange) -> CalendarRange:
+    entry = None
+    if entry_date is not None:
+        entries = by_date.get(entry_date, [])
+        if len(entries) == 1:
+            entry = entries[0]
+    return range_class(relation, start, fill_days(by_date, relation, start, days), entry)
+
+
+def resolve_range(relation: Optional[Relation], trainings: QuerySet, start: datetime.date, days: int,
+                  entry_date: Optional[datetime.date] = None, range_class: Type[CalendarRange] = CalendarRange
+                  ) -> CalendarRange:
+    """
+    Resolve days starting at start with a single query over trainings, regardless of the span length.
+    relation is only used for placeholder days, entry is set when exactly one training exists on entry_date.
+    """
+    return build_range(fetch_by_date(trainings, start, days), relation, start, days, entry_date, range_class)
+
+
+def resolve_week(relation: Optional[Relation], trainings: QuerySet, monday: datetime.date,
+                 entry_date: Optional[datetime.date] = None) -> Week:
+    return resolve_range(relation, trainings, monday, 7, entry_date, Week)
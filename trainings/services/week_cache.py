@@ -0,0 +1,168 @@
+import datetime
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.template.loader import render_to_string
+from django.utils.translation import get_language
+
+from trainings.models import Training
+from trainings.services.week import DAY, WEEK, CalendarRange, Day, build_range, group_by_date
+from users.models import Relation, User
+
+WEEK_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+TRAINING_FIELDS = [field.attname for field in Training._meta.concrete_fields]
+RELATION_FIELDS = ['relation__runner_id', 'relation__coach_id', 'relation__nickname', 'relation__runner__username']
+Row = Tuple
+
+
+def relation_scope(relation_id: int) -> str:
+    return f'relation:{relation_id}'
+
+
+def runner_scope(runner_id: int) -> str:
+    return f'runner:{runner_id}'
+
+
+def version_key(scope: str) -> str:
+    return f'trainings:version:{scope}'
+
+
+def get_version(scope: str) -> int:
+    """
+    Current version of a cache scope, entries of a scope are keyed by it and abandoned when it's bumped.
+    A missing (never set or evicted) version starts from the current time, so it never matches stale entries.
+    """
+    key = version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump(scopes: List[str]):
+    for scope in scopes:
+        try:
+            cache.incr(version_key(scope))
+        except ValueError:
+            # nothing was cached under a scope without a version
+            pass
+
+
+def bump_versions(*scopes: str):
+    """
+    Invalidate everything cached under scopes, now and again on commit,
+    so that data read by concurrent requests before the commit isn't kept either.
+    """
+    scopes = list(scopes)
+    _bump(scopes)
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def invalidate_relations(relations: Iterable[Relation]):
+    scopes = set()
+    for relation in relations:
+        scopes |= {relation_scope(relation.pk), runner_scope(relation.runner_id)}
+    bump_versions(*scopes)
+
+
+def week_key(scope: str, version: int, monday: datetime.date) -> str:
+    return f'trainings:week:{scope}:{version}:{monday}'
+
+
+def fragment_key(scope: str, version: int, template_name: str, monday: datetime.date,
+                 highlighted: Optional[datetime.date]) -> str:
+    return f'trainings:fragment:{scope}:{version}:{get_language()}:{template_name}:{monday}:{highlighted or ""}'
+
+
+def week_runs(mondays: List[datetime.date]) -> List[Tuple[datetime.date, datetime.date]]:
+    """First and last day of every run of consecutive weeks in mondays, which have to be sorted"""
+    runs = []
+    for monday in mondays:
+        if runs and runs[-1][1] + DAY == monday:
+            runs[-1] = (runs[-1][0], monday + WEEK - DAY)
+        else:
+            runs.append((monday, monday + WEEK - DAY))
+    return runs
+
+
+def fetch_rows(trainings: QuerySet, ranges: List[Tuple[datetime.date, datetime.date]]) -> List[Row]:
+    """
+    Plain values of trainings within the date ranges and of their relations, the only form trainings are cached in
+    """
+    condition = Q()
+    for date_range in ranges:
+        condition |= Q(date__range=date_range)
+    return list(trainings.filter(condition).order_by('date', 'pk').values_list(*TRAINING_FIELDS, *RELATION_FIELDS))
+
+
+def trainings_from_rows(db: str, rows: Iterable[Row], relation: Optional[Relation]) -> List[Training]:
+    """
+    Trainings of cached rows, attached to relation or to relations rebuilt from the row,
+    which only hold what calendars display (runner username and nickname).
+    """
+    relations = {relation.pk: relation} if relation is not None else {}
+    date_index = TRAINING_FIELDS.index('date')
+    trainings = []
+    for row in sorted(rows, key=lambda row: (row[date_index], row[0])):
+        training = Training.from_db(db, TRAINING_FIELDS, row[:len(TRAINING_FIELDS)])
+        if training.relation_id not in relations:
+            runner_id, coach_id, nickname, username = row[len(TRAINING_FIELDS):]
+            relations[training.relation_id] = Relation(id=training.relation_id, runner_id=runner_id,
+                                                       coach_id=coach_id, nickname=nickname)
+            relations[training.relation_id].runner = User(id=runner_id, username=username)
+        training.relation = relations[training.relation_id]
+        trainings.append(training)
+    return trainings
+
+
+def resolve_cached_range(scope: str, version: int, relation: Optional[Relation], trainings: QuerySet,
+                         start: datetime.date, days: int, entry_date: Optional[datetime.date] = None,
+                         range_class: Type[CalendarRange] = CalendarRange) -> CalendarRange:
+    """
+    resolve_range reading whole weeks from the cache, missing weeks (and only them) are fetched with a single query.
+    start has to be a monday and days a multiple of 7.
+    Weeks are cached as plain rows, model instances would drag whole users (password hashes included) along.
+    """
+    keys = {start + i * WEEK: week_key(scope, version, start + i * WEEK) for i in range(days // 7)}
+    cached = cache.get_many(list(keys.values()))
+    rows: List[Row] = []
+    for week_rows in cached.values():
+        rows.extend(week_rows)
+
+    missing = [monday for monday, key in keys.items() if key not in cached]
+    if missing:
+        fetched = fetch_rows(trainings, week_runs(missing))
+        rows.extend(fetched)
+        date_index = TRAINING_FIELDS.index('date')
+        cache.set_many({keys[monday]: [row for row in fetched if monday <= row[date_index] < monday + WEEK]
+                        for monday in missing}, WEEK_CACHE_TIMEOUT)
+    by_date: Dict[datetime.date, List[Training]] = group_by_date(trainings_from_rows(trainings.db, rows, relation))
+    return build_range(by_date, relation, start, days, entry_date, range_class)
+
+
+def render_weeks(scope: str, version: int, template_name: str, weeks: List[List[Day]],
+                 highlighted: Optional[datetime.date]) -> List[str]:
+    """
+    Rendered template_name for every week, highlighting the day of highlighted when it falls in the week.
+    version must be the one the weeks were resolved with, otherwise stale weeks could be cached as current.
+    """
+    keys = []
+    for week in weeks:
+        monday = week[0].date
+        keys.append(fragment_key(scope, version, template_name, monday,
+                                 highlighted if highlighted and monday <= highlighted < monday + WEEK else None))
+    cached = cache.get_many(keys)
+    fragments = []
+    to_cache = {}
+    for key, week in zip(keys, weeks):
+        if key not in cached:
+            cached[key] = to_cache[key] = render_to_string(template_name, {'week': week, 'highlighted': highlighted})
+        fragments.append(cached[key])
+    if to_cache:
+        cache.set_many(to_cache, WEEK_CACHE_TIMEOUT)
+    return fragments
@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from trainings.models import Tombstone, Training
+from trainings.services.deletion import is_marked, marked_relations, tombstone_relations
+from trainings.services.summary import refresh_summaries, training_slots
+from trainings.services.week_cache import bump_versions, invalidate_relations, relation_scope
+from users.models import Relation
+
+
+@receiver(post_delete, sender=Training)
+def training_deleted(sender, instance: Training, **kwargs):
+    if is_marked(instance):
+        return
+    try:
+        coach_id = instance.relation.coach_id
+    except Relation.DoesNotExist:
+        return
+    Tombstone.objects.create(model=Tombstone.TRAINING, object_id=instance.pk, coach_id=coach_id)
+
+
+@receiver(pre_delete, sender=Relation)
+def relation_deleting(sender, instance: Relation, **kwargs):
+    # trainings are deleted first, tombstoning them here spares a lookup and an insert per training
+    if instance.pk not in marked_relations():
+        tombstone_relations(Relation.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Relation)
+def relation_deleted(sender, instance: Relation, **kwargs):
+    marked_relations().discard(instance.pk)
+
+
+@receiver(post_save, sender=Training)
+@receiver(post_delete, sender=Training)
+def training_changed(sender, instance: Training, **kwargs):
+    if is_marked(instance):
+        # deleted as part of a set, whose relations are invalidated at once
+        return
+    try:
+        relation = instance.relation
+    except Relation.DoesNotExist:
+        # deleted along with its relation, which invalidates the runner on its own
+        bump_versions(relation_scope(instance.relation_id))
+        return
+    invalidate_relations([relation])
+
+
+@receiver(post_save, sender=Relation)
+@receiver(post_delete, sender=Relation)
+def relation_changed(sender, instance: Relation, **kwargs):
+    invalidate_relations([instance])
+
+
+@receiver(post_save, sender=Training)
+@receiver(post_delete, sender=Training)
+def training_summary_changed(sender, instance: Training, **kwargs):
+    if is_marked(instance):
+        # deleted as part of a set, refreshed once by deleting_trainings or deleted along with the relation
+        return
+    refresh_summaries(training_slots([instance]))
+    instance.loaded_date = instance.date
@@ -1,15 +1,28 @@
 from django.urls import path
 
 from trainings import views
+from trainings.api_views.batch_coach import TrainingsBatchView
+from trainings.api_views.board_coach import TeamBoardAPIView
+from trainings.api_views.compliance_coach import ComplianceAPIView
+from trainings.api_views.export_coach import ExportView
+from trainings.api_views.search_coach import SearchView
+from trainings.api_views.sync_coach import SyncView
 from trainings.api_views.trainings_coach import TrainingsCoachViewSet
 from trainings.views import home
 
 urlpatterns = [
     path('', home, name='trainings-home'),
     path('trainings/create/', views.TrainingCreateView.as_view(), name='trainings-create'),
+    path('trainings/import/', views.TrainingImportView.as_view(), name='trainings-import'),
+    path('trainings/search/', views.TrainingSearchView.as_view(), name='trainings-search'),
+    path('trainings/board/', views.TeamBoardView.as_view(), name='trainings-board'),
+    path('trainings/compliance/', views.ComplianceView.as_view(), name='trainings-compliance'),
     path('runners/<slug:runner>/trainings/', views.TrainingListView.as_view(), name='trainings-list'),
     path('runners/<slug:runner>/trainings/<str:date>/', views.TrainingListView.as_view(), name='trainings-list-entry'),
     path('runners/<slug:runner>/trainings/<str:date>/edit/', views.TrainingUpdateView.as_view(), name='trainings-edit'),
+    path('runners/<slug:runner>/calendar/', views.CalendarFeedLinkView.as_view(), name='trainings-feed-coach'),
+    path('calendar/', views.CalendarFeedLinkViewRunner.as_view(), name='trainings-feed-runner'),
+    path('calendar/<str:token>.ics', views.CalendarFeedView.as_view(), name='trainings-feed'),
 ]
 
 urlpatterns += [
@@ -23,10 +36,16 @@ urlpatterns += [
         {'get': 'list',
          'post': 'create'}),
          name='trainings-api-list'),
+    path('api/trainings/batch/', TrainingsBatchView.as_view(), name='trainings-api-batch'),
     path('api/trainings/<slug:pk>', TrainingsCoachViewSet.as_view(
         {'get': 'retrieve',
          'post': 'update',
          'patch': 'partial_update',
          'delete': "destroy"}),
-         name='trainings-api-entry')
+         name='trainings-api-entry'),
+    path('api/board/', TeamBoardAPIView.as_view(), name='trainings-api-board'),
+    path('api/sync/', SyncView.as_view(), name='trainings-api-sync'),
+    path('api/export/', ExportView.as_view(), name='trainings-api-export'),
+    path('api/search/', SearchView.as_view(), name='trainings-api-search'),
+    path('api/compliance/', ComplianceAPIView.as_view(), name='trainings-api-compliance')
 ]
@@ -1,30 +1,44 @@
 import datetime
-from typing import Optional
+import io
+from typing import List, Optional
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import Http404, HttpResponse, HttpResponseBadRequest
-from django.shortcuts import redirect
+from django.db import IntegrityError
+from django.db.models import Count, Max, QuerySet
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django.views.generic import CreateView, ListView, UpdateView
-
-from trainings.forms import AddTrainingForm, UpdateTrainingForm
-from trainings.models import Training
+from django.utils.functional import cached_property
+from django.views.generic import CreateView, FormView, ListView, TemplateView, UpdateView, View
+
+from training_calendar.conditional import ConditionalGetMixin, Validators, make_validators
+from trainings.forms import AddTrainingForm, ImportTrainingsForm, UpdateTrainingForm
+from trainings.models import CalendarFeed, Training, generate_feed_token
+from trainings.services.assignment import AssignmentStatus, prepare_assignment
+from trainings.services.board import resolve_board
+from trainings.services.ical import feed_trainings, stream_calendar
+from trainings.services.plan_import import COLUMNS, ENCODING, PlanImport, check_encoding
+from trainings.services.search import MAX_SEARCH_OFFSET, SEARCH_PAGE_SIZE, search_trainings
+from trainings.services.summary import COMPLIANCE_WEEKS, compliance_range, resolve_compliance
+from trainings.services.sync import last_deletion
+from trainings.services.week import DAY, WEEK
+from trainings.services.week_cache import get_version, relation_scope, render_weeks, resolve_cached_range, \
+    runner_scope
 from users.models import Relation, RelationStatus
 from users.views import UserIsCoachMixin, UserIsRunnerMixin
 
-DAY = datetime.timedelta(days=1)
-WEEK = datetime.timedelta(days=7)
+MAX_WEEKS = 26
 
 
 def home(request):
     if not request.user.is_authenticated:
         return redirect('users-login')
     if request.user.is_runner:
-        if request.user.has_coach:
+        if request.user.has_coach():
             return redirect('trainings-runner')
         else:
-            return redirect('trainings-invites')
+            return redirect('users-invites')
     else:
         return redirect('users-runners')
 
@@ -54,132 +68,282 @@ class TrainingCreateView(LoginRequiredMixin, UserIsCoachMixin, CreateView):
     def form_valid(self, form: AddTrainingForm):
         runners = form.cleaned_data['runners']
         force = form.cleaned_data['force']
-        date = form.cleaned_data['date']
-        has_training = Training.objects.filter(relation__runner__username__in=runners, date=date)
-        if not force and has_training.exists():
-            messages.warning(self.request, 'Some runners already have training for this day')
-            form.data = form.data.copy()
-            form.data['force'] = True
-            return self.render_to_response(self.get_context_data(has_training=has_training, form=form))
-
-        training = form.save(commit=False)
-        # TODO 400 if not all relations exist
-        for runner in runners:
-            try:
-                relation = Relation.objects.filter(coach=self.request.user, runner__username=runner).get()
-            except Relation.DoesNotExist:
-                return HttpResponseBadRequest()
+        assignment = prepare_assignment(self.request.user, runners, form.cleaned_data['date'])
+        if assignment.missing:
+            return HttpResponseBadRequest()
+        if not force and assignment.conflicts:
+            return self.conflicts(form, assignment.conflicts)
 
-            try:
-                t = Training.objects.get(relation=relation, date=training.date)
-                t.description = training.description
-                t.save()
-            except Training.DoesNotExist:
-                training.pk = None
-                training.relation = relation
-                training.save()
+        try:
+            results = assignment.apply(form.cleaned_data['description'], form.cleaned_data['visible_since'])
+        except IntegrityError:
+            # a training was added to one of the days after the conflicts were checked
+            assignment = prepare_assignment(self.request.user, runners, form.cleaned_data['date'])
+            return self.conflicts(form, assignment.conflicts)
         messages.success(self.request, "Successfully created training")
-        return self.get(self.request)
-
-
-class TrainingListMixin:
-    def fill_week(self, queryset, relation):
-        week_trainings = []
-        idx = 0
-        for i in range(7):
-            if idx < len(queryset) and queryset[idx].date == self.monday + i * DAY:
-                week_trainings.append(queryset[idx])
-                idx += 1
-            else:
-                week_trainings.append(
-                    Training(relation=relation, date=self.monday + i * DAY))
-        return week_trainings
+        return self.render_to_response(self.get_context_data(
+            results=[(assignment.relations[username].displayed_name, status) for username, status in results.items()],
+            AssignmentStatus=AssignmentStatus))
+
+    def conflicts(self, form: AddTrainingForm, conflicts: List[Training]):
+        messages.warning(self.request, 'Some runners already have training for this day')
+        form.data = form.data.copy()
+        form.data['force'] = True
+        return self.render_to_response(self.get_context_data(has_training=conflicts, form=form))
+
+
+class TrainingImportView(LoginRequiredMixin, UserIsCoachMixin, FormView):
+    template_name = 'trainings/coach_training_import.html'
+    form_class = ImportTrainingsForm
+    max_errors = 100
+
+    def form_valid(self, form: ImportTrainingsForm):
+        file = form.cleaned_data['file']
+        try:
+            # batches are committed as they are read, the whole upload is checked first
+            check_encoding(file)
+        except UnicodeDecodeError:
+            form.add_error('file', 'File should be encoded in UTF-8')
+            return self.form_invalid(form)
+        # the upload is decoded while it's read, it's never loaded whole
+        lines = io.TextIOWrapper(file, encoding=ENCODING, newline='')
+        plan = PlanImport(self.request.user, form.cleaned_data['dry_run']).run(lines)
+        if not form.cleaned_data['dry_run'] and (plan.created or plan.updated):
+            messages.success(self.request, 'Imported trainings')
+        return self.render_to_response(self.get_context_data(
+            form=form, plan=plan, errors=plan.errors[:self.max_errors], dry_run=form.cleaned_data['dry_run']))
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(columns=COLUMNS, **kwargs)
+
+
+class TrainingSearchView(LoginRequiredMixin, UserIsCoachMixin, TemplateView):
+    template_name = 'trainings/coach_training_search.html'
+
+    def get_context_data(self, **kwargs):
+        query = self.request.GET.get('q', '').strip()
+        last_page = MAX_SEARCH_OFFSET // SEARCH_PAGE_SIZE + 1
+        try:
+            page = min(max(int(self.request.GET.get('page', 1)), 1), last_page)
+        except ValueError:
+            page = 1
+        # one more than a page, to know if there's a next one
+        trainings = search_trainings(self.request.user, query, SEARCH_PAGE_SIZE + 1,
+                                     (page - 1) * SEARCH_PAGE_SIZE) if query else []
+        return super().get_context_data(query=query, trainings=trainings[:SEARCH_PAGE_SIZE], page=page,
+                                        has_next=len(trainings) > SEARCH_PAGE_SIZE and page < last_page, **kwargs)
+
+
+class TrainingListMixin(ConditionalGetMixin):
+    monday = None
+    previous_week = None
+    next_week = None
+    entry_date = None
+    current_date = None
+    start = None
+    days = 7
+    span_query = ''
+    spans_allowed = True
+    calendar = None
+    cache_version = None
+    week_template = None
 
     def get_date(self):
         date = self.kwargs.get('date') or self.request.GET.get('date')
+        self.entry_date = None
         if date:
             try:
                 date = datetime.datetime.strptime(date, '%Y-%m-%d').date()
+                if self.kwargs.get('date'):
+                    self.entry_date = date
             except ValueError:
                 date = datetime.date.today()
         else:
             date = datetime.date.today()
+        self.current_date = date
         self.monday = date - datetime.timedelta(days=date.weekday())
         self.previous_week = self.monday - WEEK
         self.next_week = self.monday + WEEK
+        self.start = self.monday
+        self.days = 7
+        if self.spans_allowed:
+            self.set_span(date)
         return date
 
+    def set_span(self, date: datetime.date):
+        """
+        Extend the displayed range with ?span=month (whole weeks covering the month of date)
+        or ?weeks=<n> (n weeks starting at monday), previous_week and next_week then move by the whole span.
+        """
+        if self.request.GET.get('span') == 'month':
+            first = date.replace(day=1)
+            last = (first + 31 * DAY).replace(day=1) - DAY
+            self.start = first - datetime.timedelta(days=first.weekday())
+            self.days = (last - self.start).days + 7 - last.weekday()
+            self.previous_week = (first - DAY).replace(day=1)
+            self.next_week = last + DAY
+            self.span_query = '&span=month'
+        elif self.request.GET.get('weeks'):
+            try:
+                weeks = min(max(int(self.request.GET['weeks']), 1), MAX_WEEKS)
+            except ValueError:
+                return
+            self.days = 7 * weeks
+            self.previous_week = self.monday - weeks * WEEK
+            self.next_week = self.monday + weeks * WEEK
+            self.span_query = f'&weeks={weeks}'
+
+    def get_relation(self) -> Optional[Relation]:
+        raise NotImplementedError()
+
+    def get_trainings(self) -> QuerySet:
+        raise NotImplementedError()
+
+    def get_cache_scope(self) -> str:
+        raise NotImplementedError()
+
+    def get_coach_ids(self):
+        """Coaches whose tombstones may hide trainings of the page, deletions don't leave an updated_at behind"""
+        raise NotImplementedError()
+
+    @property
+    def end(self) -> datetime.date:
+        return self.start + (self.days - 1) * DAY
+
+    def get_validators(self) -> Optional[Validators]:
+        relation = self.get_relation()
+        stats = self.get_trainings().filter(date__range=(self.start, self.end)).aggregate(
+            last_modified=Max('updated_at'), count=Count('id'))
+        return make_validators(self.request, stats['count'],
+                               [stats['last_modified'], relation.updated_at if relation else None,
+                                last_deletion(self.get_coach_ids())],
+                               relation.pk if relation else None)
+
+    def get_queryset(self):
+        scope = self.get_cache_scope()
+        self.cache_version = get_version(scope)
+        self.calendar = resolve_cached_range(scope, self.cache_version, self.get_relation(), self.get_trainings(),
+                                             self.start, self.days, self.entry_date)
+        return self.calendar.days
+
+    def get_object(self):
+        if not self.kwargs.get('date'):
+            return None
+        if self.calendar is None:
+            self.get_date()
+            self.object_list = self.get_queryset()
+        if self.calendar.entry is None:
+            raise Http404()
+        return self.calendar.entry
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({'previous_week': self.previous_week, 'next_week': self.next_week,
+                        'today': datetime.date.today(), 'current_date': self.current_date,
+                        'span_query': self.span_query})
+        if self.calendar is not None:
+            weeks = self.calendar.weeks
+            highlighted = self.calendar.entry.date if self.calendar.entry else None
+            context['weeks'] = weeks
+            context['week_fragments'] = list(zip(weeks, render_weeks(
+                self.get_cache_scope(), self.cache_version, self.week_template, weeks, highlighted)))
+        return context
+
 
 class TrainingListView(LoginRequiredMixin, UserIsCoachMixin, TrainingListMixin, ListView):
     template_name = 'trainings/coach_training_list.html'
+    week_template = 'trainings/coach_week.html'
     model = Training
-    monday = None
-    previous_week = None
-    next_week = None
     runner = None
     relation = None
 
     def get(self, request, *args, **kwargs):
         self.runner = self.kwargs['runner']
-        relation = Relation.objects.filter(runner__username=self.runner, coach=self.request.user,
-                                           status=RelationStatus.ESTABLISHED)
-        if not relation.exists():
+        self.relation = Relation.objects.filter(runner__username=self.runner, coach=self.request.user,
+                                                status=RelationStatus.ESTABLISHED).select_related(
+            'runner', 'coach').first()
+        if self.relation is None:
             return HttpResponseBadRequest()
-        self.relation = relation.get()
         self.get_date()
+        not_modified = self.conditional_get(request)
+        if not_modified:
+            return not_modified
         self.object_list = self.get_queryset()
         obj = self.get_object()
-        return self.render_to_response(
-            self.get_context_data(object=obj, previous_week=self.previous_week, next_week=self.next_week,
-                                  today=datetime.date.today(), relation=self.relation))
+        return self.with_validators(self.render_to_response(
+            self.get_context_data(object=obj, relation=self.relation)))
 
-    def get_queryset(self):
-        sunday = self.monday + datetime.timedelta(days=6)
-        queryset = Training.objects.filter(relation__coach=self.request.user, relation__runner__username=self.runner,
-                                           date__range=(self.monday, sunday))
-        return self.fill_week(queryset, self.relation)
+    def get_relation(self) -> Optional[Relation]:
+        return self.relation
 
-    def get_object(self):
-        runner = self.kwargs.get('runner')
-        date = self.kwargs.get('date')
-        if not (runner and date):
-            return None
-        try:
-            return Training.objects.get(relation__runner__username=runner, date=date)
-        except (Training.DoesNotExist, Training.MultipleObjectsReturned):
-            raise Http404()
+    def get_trainings(self) -> QuerySet:
+        return Training.objects.filter(relation=self.relation)
+
+    def get_cache_scope(self) -> str:
+        return relation_scope(self.relation.pk)
+
+    def get_coach_ids(self):
+        return [self.relation.coach_id]
 
 
 class TrainingListViewRunner(UserIsRunnerMixin, LoginRequiredMixin, TrainingListMixin, ListView):
     template_name = 'trainings/runner_training_list.html'
+    week_template = 'trainings/runner_week.html'
     model = Training
-    monday = None
-    previous_week = None
-    next_week = None
-
-    def get_queryset(self):
-        sunday = self.monday + datetime.timedelta(days=6)
-        queryset = Training.objects.filter(relation__runner__username=self.request.user.username,
-                                           date__range=(self.monday, sunday))
-        return self.fill_week(queryset, Relation.objects.filter(runner=self.request.user,
-                                                                status=RelationStatus.ESTABLISHED).first())
 
     def get(self, request, *args, **kwargs):
         self.get_date()
+        not_modified = self.conditional_get(request)
+        if not_modified:
+            return not_modified
         self.object_list = self.get_queryset()
         obj = self.get_object()
-        return self.render_to_response(
-            self.get_context_data(object=obj, previous_week=self.previous_week, next_week=self.next_week,
-                                  today=datetime.date.today()))
+        return self.with_validators(self.render_to_response(
+            self.get_context_data(object=obj)))
 
-    def get_object(self):
-        slug = self.kwargs.get('date')
-        if not slug:
-            return None
+    @cached_property
+    def relation(self) -> Optional[Relation]:
+        return Relation.objects.filter(runner=self.request.user, status=RelationStatus.ESTABLISHED).select_related(
+            'runner', 'coach').first()
+
+    def get_relation(self) -> Optional[Relation]:
+        return self.relation
+
+    def get_trainings(self) -> QuerySet:
+        return Training.objects.filter(relation__runner=self.request.user)
+
+    def get_cache_scope(self) -> str:
+        return runner_scope(self.request.user.pk)
+
+    def get_coach_ids(self):
+        return Relation.objects.filter(runner=self.request.user).values('coach_id')
+
+
+class TeamBoardView(LoginRequiredMixin, UserIsCoachMixin, TrainingListMixin, TemplateView):
+    template_name = 'trainings/coach_training_board.html'
+    spans_allowed = False
+
+    def get(self, request, *args, **kwargs):
+        self.get_date()
+        board = resolve_board(self.request.user, self.monday, self.request.GET.get('after'))
+        return self.render_to_response(self.get_context_data(board=board))
+
+
+class ComplianceView(LoginRequiredMixin, UserIsCoachMixin, TemplateView):
+    template_name = 'trainings/coach_compliance.html'
+    weeks = COMPLIANCE_WEEKS
+
+    def get_context_data(self, **kwargs):
+        date = self.request.GET.get('date')
         try:
-            return Training.objects.get(relation__runner__username=self.request.user.username, date=slug)
-        except (Training.DoesNotExist, Training.MultipleObjectsReturned):
-            raise Http404()
+            date = datetime.datetime.strptime(date, '%Y-%m-%d').date() if date else None
+        except ValueError:
+            date = None
+        first = compliance_range(date, self.weeks)
+        return super().get_context_data(rows=resolve_compliance(self.request.user, first, self.weeks),
+                                        mondays=[first + i * WEEK for i in range(self.weeks)],
+                                        previous_range=first - self.weeks * WEEK, next_range=first + self.weeks * WEEK,
+                                        **kwargs)
 
 
 class TrainingUpdateView(LoginRequiredMixin, UserIsCoachMixin, UpdateView):
@@ -237,3 +401,75 @@ class TrainingUpdateViewRunner(LoginRequiredMixin, UserIsRunnerMixin, UpdateView
         return reverse('trainings-entry-runner', kwargs={'date': self.object.date})
 
 
+class CalendarFeedView(ConditionalGetMixin, View):
+    """
+    iCalendar feed of a CalendarFeed token, polled by calendar apps without a session.
+    Polls of an unchanged feed are answered with 304 after a single aggregate query.
+    """
+    feed = None
+
+    def get(self, request, *args, **kwargs):
+        self.feed = get_object_or_404(CalendarFeed.objects.select_related('user', 'relation__runner'),
+                                      token=self.kwargs['token'])
+        relation = self.feed.relation
+        if relation is None and not self.feed.user.is_runner:
+            raise Http404()
+        if relation is not None and (relation.coach_id != self.feed.user_id
+                                     or relation.status != RelationStatus.ESTABLISHED):
+            raise Http404()
+
+        not_modified = self.conditional_get(request)
+        if not_modified:
+            return not_modified
+        name = relation.displayed_name if relation else 'Treningi'
+        response = StreamingHttpResponse(stream_calendar(name, feed_trainings(self.feed), request.get_host()),
+                                         content_type='text/calendar; charset=utf-8')
+        return self.with_validators(response)
+
+    def get_validators(self) -> Optional[Validators]:
+        stats = feed_trainings(self.feed).aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        relation = self.feed.relation
+        coach_ids = [relation.coach_id] if relation else Relation.objects.filter(runner_id=self.feed.user_id).values(
+            'coach_id')
+        return make_validators(self.request, stats['count'],
+                               [stats['last_modified'], relation.updated_at if relation else None,
+                                last_deletion(coach_ids)])
+
+
+class CalendarFeedLinkMixin:
+    """Shows the address of a feed, POST replaces its token so the old address stops working"""
+    template_name = 'trainings/calendar_feed.html'
+
+    def get_feed(self) -> CalendarFeed:
+        raise NotImplementedError()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        url = self.request.build_absolute_uri(self.get_feed().get_absolute_url())
+        context.update({'feed_url': url, 'webcal_url': 'webcal' + url[url.index(':'):]})
+        return context
+
+    def post(self, request, *args, **kwargs):
+        feed = self.get_feed()
+        feed.token = generate_feed_token()
+        feed.save()
+        messages.success(request, 'Generated a new calendar address')
+        return redirect(request.path)
+
+
+class CalendarFeedLinkViewRunner(LoginRequiredMixin, UserIsRunnerMixin, CalendarFeedLinkMixin, TemplateView):
+    def get_feed(self) -> CalendarFeed:
+        return CalendarFeed.get_for(self.request.user)
+
+
+class CalendarFeedLinkView(LoginRequiredMixin, UserIsCoachMixin, CalendarFeedLinkMixin, TemplateView):
+    @cached_property
+    def relation(self) -> Relation:
+        return get_object_or_404(Relation.objects.select_related('runner'), runner__username=self.kwargs['runner'],
+                                 coach=self.request.user, status=RelationStatus.ESTABLISHED)
+
+    def get_feed(self) -> CalendarFeed:
+        return CalendarFeed.get_for(self.request.user, self.relation)
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(relation=self.relation, **kwargs)
@@ -2,9 +2,11 @@ from typing import List
 
 import pytest
 from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.test import Client, RequestFactory
 from rest_framework.test import APIRequestFactory
 
+from users.authentication import token_cache
 from users.models import Relation, RelationStatus, User
 
 PASSWORD = 'testing321'
@@ -12,6 +14,12 @@ RUNNER_USERNAME = 'runner'
 COACH_USERNAME = 'coach'
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    token_cache.clear()
+
+
 @pytest.fixture
 def request_factory() -> RequestFactory:
     return RequestFactory()
@@ -0,0 +1,169 @@
+"""
+Query budgets of every named route of trainings/urls.py and users/urls.py.
+Each route is requested with a cold cache against datasets of growing size, its number of queries
+must stay within a budget that doesn't depend on the size of the data.
+"""
+import datetime
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from freezegun import freeze_time
+from rest_framework.authtoken.models import Token
+
+from trainings import urls as trainings_urls
+from trainings.models import CalendarFeed, Training
+from users import urls as users_urls
+from users.authentication import token_cache
+from users.models import Relation, RelationStatus, User
+
+TODAY = datetime.date(2019, 9, 30)
+TRAININGS = 1000
+
+
+class Dataset(NamedTuple):
+    coach: User
+    relations: List[Relation]
+    invited: User
+    token: Token
+
+
+class Route(NamedTuple):
+    user: Optional[str]
+    budget: int
+    kwargs: Callable[[Dataset], dict] = lambda data: {}
+    method: str = 'get'
+    data: Callable[[Dataset], dict] = lambda data: {}
+    api: bool = False
+    query: str = ''
+
+
+def runner_kwargs(data: Dataset) -> dict:
+    return {'runner': data.relations[0].runner.username}
+
+
+def entry_kwargs(data: Dataset) -> dict:
+    return {'runner': data.relations[0].runner.username, 'date': str(TODAY)}
+
+
+def plan_file(data: Dataset) -> dict:
+    rows = ''.join(f'{relation.runner.username},{TODAY},description\n' for relation in data.relations)
+    return {'file': SimpleUploadedFile('plan.csv', f'runner,date,description\n{rows}'.encode())}
+
+
+ROUTES: Dict[str, Route] = {
+    'trainings-home': Route('coach', 2),
+    'trainings-create': Route('coach', 11, method='post', data=lambda data: {
+        'runners': [relation.runner.username for relation in data.relations], 'date': str(TODAY),
+        'description': 'description', 'force': 'True'}),
+    'trainings-import': Route('coach', 6, method='post', data=plan_file),
+    'trainings-search': Route('coach', 4, query='?q=descr'),
+    'trainings-board': Route('coach', 4),
+    'trainings-compliance': Route('coach', 4),
+    'trainings-list': Route('coach', 6, runner_kwargs),
+    'trainings-list-entry': Route('coach', 6, entry_kwargs),
+    'trainings-edit': Route('coach', 5, entry_kwargs),
+    'trainings-entry-runner': Route('runner', 7, lambda data: {'date': str(TODAY)}),
+    'trainings-entry-edit-runner': Route('runner', 4, lambda data: {'date': str(TODAY)}),
+    'trainings-runner': Route('runner', 7),
+    'trainings-api-list': Route('coach', 5, lambda data: {'relation': data.relations[0].pk}, api=True),
+    'trainings-api-batch': Route('coach', 7, method='post', api=True, data=lambda data: {'operations': [
+        {'op': 'create', 'relation': relation.pk, 'date': str(TODAY + datetime.timedelta(days=1)),
+         'description': 'description'} for relation in data.relations]}),
+    'trainings-api-entry': Route('coach', 4, lambda data: {'pk': data.relations[0].training_set.first().pk},
+                                 api=True),
+    'trainings-api-board': Route('coach', 3, api=True),
+    'trainings-api-sync': Route('coach', 3, api=True),
+    'trainings-api-export': Route('coach', 1, api=True),
+    'trainings-api-search': Route('coach', 3, api=True, query='?q=description'),
+    'trainings-api-compliance': Route('coach', 3, api=True),
+    'trainings-feed-coach': Route('coach', 6, runner_kwargs),
+    'trainings-feed-runner': Route('runner', 6),
+    'trainings-feed': Route(None, 3, lambda data: {'token': CalendarFeed.get_for(data.relations[0].runner).token}),
+    'users-logout': Route('coach', 4),
+    'users-signup': Route(None, 0),
+    'users-login': Route(None, 1),
+    'users-profile': Route('runner', 3),
+    'users-runners': Route('coach', 4),
+    'users-runners-detail': Route('coach', 4, runner_kwargs),
+    'users-runners-delete': Route('coach', 4, runner_kwargs),
+    'users-invites': Route('invited', 5),
+    'users-invites-accept': Route('invited', 5, lambda data: {'coach': data.coach.username}),
+    'users-api-runners': Route('coach', 3, api=True),
+    'users-api-runner-profile': Route('coach', 2, lambda data: {'pk': data.relations[0].pk}, api=True),
+    'users-api-runner-trainings': Route('coach', 3, lambda data: {'pk': data.relations[0].pk}, api=True),
+}
+
+
+def route_names() -> List[str]:
+    return [pattern.name for module in [trainings_urls, users_urls] for pattern in module.urlpatterns
+            if isinstance(pattern, URLPattern) and pattern.name]
+
+
+def seed(runners: int) -> Dataset:
+    password = make_password('password')
+    coach = User.objects.create(username='coach', email='coach@users.com', is_coach=True, password=password)
+    User.objects.bulk_create([User(username=f'runner{i}', email=f'runner{i}@users.com', is_runner=True,
+                                   password=password) for i in range(runners + 1)])
+    users = list(User.objects.filter(is_runner=True).order_by('pk'))
+    invited = users.pop()
+    Relation.objects.bulk_create([Relation(coach=coach, runner=runner, status=RelationStatus.ESTABLISHED)
+                                  for runner in users])
+    Relation.objects.create(coach=coach, runner=invited, status=RelationStatus.INVITED_BY_COACH)
+    relations = list(Relation.objects.filter(status=RelationStatus.ESTABLISHED).select_related('runner')
+                     .order_by('pk'))
+    per_relation = TRAININGS // runners
+    start = TODAY - datetime.timedelta(days=per_relation // 2)
+    Training.objects.bulk_create([Training(relation=relation, date=start + datetime.timedelta(days=day),
+                                           description='description') for relation in relations
+                                  for day in range(per_relation)])
+    return Dataset(coach, relations, invited, Token.objects.create(user=coach))
+
+
+def client_for(route: Route, data: Dataset) -> Client:
+    if route.api:
+        return Client(HTTP_AUTHORIZATION=f'Token {data.token.key}')
+    client = Client()
+    if route.user is not None:
+        client.force_login({'coach': data.coach, 'runner': data.relations[0].runner,
+                            'invited': data.invited}[route.user])
+    return client
+
+
+def test_every_route_has_budget():
+    assert sorted(route_names()) == sorted(ROUTES)
+
+
+@pytest.mark.parametrize('runners', [1, 10, 100])
+@pytest.mark.usefixtures('transactional_db')
+def test_query_budget(runners: int):
+    with freeze_time(TODAY):
+        data = seed(runners)
+        failures = []
+        for name, route in ROUTES.items():
+            client = client_for(route, data)
+            url = reverse(name, kwargs=route.kwargs(data)) + route.query
+            cache.clear()
+            token_cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                if route.method == 'post' and route.api:
+                    response = client.post(url, data=route.data(data), content_type='application/json')
+                elif route.method == 'post':
+                    response = client.post(url, data=route.data(data))
+                else:
+                    response = client.get(url)
+            assert response.status_code < 400, f'{name}: {response.status_code}'
+
+            if len(context) > route.budget:
+                statements = Counter(query['sql'] for query in context.captured_queries)
+                duplicates = '\n'.join(f'    {count}x {sql}' for sql, count in statements.items() if count > 1)
+                failures.append(f'{name}: {len(context)} queries, budget {route.budget}\n{duplicates}')
+
+    assert not failures, '\n'.join(failures)
@@ -0,0 +1,83 @@
+import json
+import logging
+from typing import List
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from training_calendar.instrumentation import RequestProfile, timed
+from trainings.models import Training
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation, User
+
+
+@pytest.fixture
+def sampled(settings):
+    settings.INSTRUMENTATION_SAMPLE_RATE = 1.0
+
+
+class TestRequestProfile:
+    @pytest.mark.usefixtures('transactional_db')
+    def test_duplicates(self):
+        profile = RequestProfile()
+
+        with connection.execute_wrapper(profile.execute):
+            for pk in range(3):
+                User.objects.filter(pk=pk).exists()
+            Relation.objects.exists()
+
+        assert profile.queries == 4
+        assert profile.duplicates == 2
+        assert 'users_user' in profile.as_dict()['most_duplicated']
+
+    def test_nested_timers(self):
+        profile = RequestProfile()
+
+        with profile.timer('serializer'):
+            with profile.timer('serializer'):
+                pass
+
+        assert list(profile.timers) == ['serializer']
+
+    def test_timed_without_profile(self):
+        with timed('serializer'):
+            pass
+
+
+@pytest.mark.usefixtures('sampled')
+class TestInstrumentationMiddleware:
+    def test_view(self, relation: Relation, caplog):
+        client = Client()
+        client.force_login(relation.coach)
+
+        with caplog.at_level(logging.INFO, logger='training_calendar.instrumentation'):
+            response = client.get(reverse('users-runners'))
+
+        assert response['Server-Timing'].startswith('db;dur=')
+        assert 'template;dur=' in response['Server-Timing']
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['url_name'] == 'users-runners'
+        assert record['queries'] > 0 and record['status'] == 200
+
+    def test_api(self, setup_db: List[Relation], caplog):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        token = Token.objects.create(user=setup_db[0].coach)
+        client = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        with caplog.at_level(logging.INFO, logger='training_calendar.instrumentation'):
+            response = client.get(reverse('trainings-api-board'))
+
+        assert 'serializer;dur=' in response['Server-Timing']
+        assert json.loads(caplog.records[-1].getMessage())['url_name'] == 'trainings-api-board'
+
+    def test_not_sampled(self, relation: Relation, settings):
+        settings.INSTRUMENTATION_SAMPLE_RATE = 0
+        client = Client()
+        client.force_login(relation.coach)
+
+        response = client.get(reverse('users-runners'))
+
+        assert 'Server-Timing' not in response
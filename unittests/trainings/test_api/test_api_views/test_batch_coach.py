@@ -0,0 +1,39 @@
+from json import loads
+from typing import List
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from trainings.api_views.batch_coach import TrainingsBatchView
+from trainings.models import Training
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+class TestTrainingsBatchView:
+    def test_post(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        request = api_factory.post(reverse('trainings-api-batch'), data={'operations': [
+            {'op': 'create', 'relation': setup_db[1].pk, 'date': str(SOME_MONDAY), 'description': 'new'},
+            {'op': 'delete', 'id': training.pk},
+        ]}, format='json')
+        force_authenticate(request, setup_db[0].coach)
+
+        response = TrainingsBatchView.as_view()(request)
+
+        json_response = loads(response.rendered_content)
+        assert response.status_code == 200
+        assert [result['status'] for result in json_response['results']] == ['created', 'deleted']
+        assert Training.objects.get().relation == setup_db[1]
+
+    def test_post_invalid(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        request = api_factory.post(reverse('trainings-api-batch'), data={'operations': [
+            {'op': 'update', 'id': 123, 'description': 'new'},
+        ]}, format='json')
+        force_authenticate(request, setup_db[0].coach)
+
+        response = TrainingsBatchView.as_view()(request)
+
+        json_response = loads(response.rendered_content)
+        assert response.status_code == 400
+        assert json_response['results'][0]['status'] == 'error'
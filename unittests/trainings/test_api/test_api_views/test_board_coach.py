@@ -0,0 +1,35 @@
+from json import loads
+from typing import List
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from training_calendar.utils import format_date
+from trainings.api_views.board_coach import TeamBoardAPIView
+from trainings.models import Training
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+class TestTeamBoardAPIView:
+    def test_get(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        request = api_factory.get(f'{reverse("trainings-api-board")}?date={format_date(SOME_MONDAY)}&limit=1')
+        force_authenticate(request, setup_db[0].coach)
+
+        response = TeamBoardAPIView.as_view()(request)
+
+        json_response = loads(response.rendered_content)
+        assert json_response['monday'] == format_date(SOME_MONDAY)
+        assert json_response['after'] == setup_db[0].runner.username
+        assert len(json_response['results']) == 1
+        assert json_response['results'][0]['days'][0]['id'] == training.pk
+        assert json_response['results'][0]['days'][1]['id'] is None
+
+    def test_wrong_date(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        request = api_factory.get(f'{reverse("trainings-api-board")}?date=30-09-2019')
+        force_authenticate(request, setup_db[0].coach)
+
+        response = TeamBoardAPIView.as_view()(request)
+
+        assert response.status_code == 400
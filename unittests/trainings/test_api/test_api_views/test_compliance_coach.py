@@ -0,0 +1,32 @@
+from json import loads
+from typing import List
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from trainings.api_views.compliance_coach import ComplianceAPIView
+from trainings.models import Training
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+class TestComplianceAPIView:
+    def get(self, relation: Relation, api_factory: APIRequestFactory, query: str = ''):
+        request = api_factory.get(f"{reverse('trainings-api-compliance')}{query}")
+        force_authenticate(request, relation.coach)
+        return ComplianceAPIView.as_view()(request)
+
+    def test_get(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+
+        json_response = loads(self.get(setup_db[0], api_factory, f'?date={SOME_MONDAY}&weeks=2').rendered_content)
+
+        assert json_response['first_week'] == str(SOME_MONDAY)
+        row = next(row for row in json_response['results'] if row['relation'] == setup_db[0].pk)
+        assert row['weeks'] == [{'week': str(SOME_MONDAY), 'planned': 1, 'executed': 0},
+                                {'week': '2019-10-07', 'planned': 0, 'executed': 0}]
+        assert (row['planned'], row['executed']) == (1, 0)
+
+    def test_invalid(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        assert self.get(setup_db[0], api_factory, '?weeks=0').status_code == 400
+        assert self.get(setup_db[0], api_factory, '?date=30.09.2019').status_code == 400
@@ -0,0 +1,52 @@
+import gzip
+from typing import List
+
+import pytest
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from trainings.api_views.export_coach import ExportView
+from trainings.models import Training
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+class TestExportView:
+    def get(self, relation: Relation, api_factory: APIRequestFactory, query: str = '', **headers):
+        request = api_factory.get(f"{reverse('trainings-api-export')}{query}", **headers)
+        force_authenticate(request, relation.coach)
+        return ExportView.as_view()(request)
+
+    def test_get(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+
+        response = self.get(setup_db[0], api_factory, '?type=jsonl')
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert b'"description": "description"' in b''.join(response.streaming_content)
+
+    def test_gzip(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+
+        response = self.get(setup_db[0], api_factory, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(b''.join(response.streaming_content)).decode().count('\n') == 2
+
+    @pytest.mark.parametrize('accept_encoding', ['gzip;q=0', 'x-gzip-foo', 'deflate, gzip; q=0.0', '*;q=0'])
+    def test_gzip_not_accepted(self, setup_db: List[Relation], api_factory: APIRequestFactory, accept_encoding: str):
+        response = self.get(setup_db[0], api_factory, HTTP_ACCEPT_ENCODING=accept_encoding)
+
+        assert not response.has_header('Content-Encoding')
+        assert 'Accept-Encoding' in response['Vary']
+
+    def test_gzip_wildcard(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        response = self.get(setup_db[0], api_factory, HTTP_ACCEPT_ENCODING='deflate;q=0.5, *;q=0.1')
+
+        assert response['Content-Encoding'] == 'gzip'
+
+    def test_invalid(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        assert self.get(setup_db[0], api_factory, '?type=xml').status_code == 400
+        assert self.get(setup_db[0], api_factory, '?from=30.09.2019').status_code == 400
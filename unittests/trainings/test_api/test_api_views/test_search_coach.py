@@ -0,0 +1,32 @@
+from json import loads
+from typing import List
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from trainings.api_views.search_coach import SearchView
+from trainings.models import Training
+from trainings.services.search import MAX_SEARCH_OFFSET
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+class TestSearchView:
+    def get(self, relation: Relation, api_factory: APIRequestFactory, query: str):
+        request = api_factory.get(f"{reverse('trainings-api-search')}{query}")
+        force_authenticate(request, relation.coach)
+        return SearchView.as_view()(request)
+
+    def test_get(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='10x400m')
+
+        json_response = loads(self.get(setup_db[0], api_factory, '?q=10x400m&limit=1').rendered_content)
+
+        assert [t['id'] for t in json_response['results']] == [training.pk]
+        assert json_response['next_offset'] == 1
+
+    def test_invalid(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        assert self.get(setup_db[0], api_factory, '?q=""').status_code == 400
+        assert self.get(setup_db[0], api_factory, '?q=tempo&limit=x').status_code == 400
+        assert self.get(setup_db[0], api_factory, f'?q=tempo&offset={10 ** 20}').status_code == 400
+        assert self.get(setup_db[0], api_factory, f'?q=tempo&offset={MAX_SEARCH_OFFSET + 1}').status_code == 400
@@ -0,0 +1,54 @@
+from json import loads
+from typing import List
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from trainings.api_views.sync_coach import SyncView
+from trainings.models import Training
+from trainings.services.sync import SNAPSHOT_PAGE_SIZE
+from unittests.trainings.test_views import DAY, SOME_MONDAY
+from users.models import Relation
+
+
+class TestSyncView:
+    def test_get(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        request = api_factory.get(reverse('trainings-api-sync'))
+        force_authenticate(request, setup_db[0].coach)
+
+        json_response = loads(SyncView.as_view()(request).rendered_content)
+
+        assert [t['id'] for t in json_response['trainings']] == [training.pk]
+        assert len(json_response['relations']) == 2
+
+        training_pk = training.pk
+        training.delete()
+        request = api_factory.get(f"{reverse('trainings-api-sync')}?since={json_response['token']}")
+        force_authenticate(request, setup_db[0].coach)
+
+        json_response = loads(SyncView.as_view()(request).rendered_content)
+
+        assert json_response['deleted'] == [{'model': 'training', 'id': training_pk}]
+
+    def test_invalid_token(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        request = api_factory.get(f"{reverse('trainings-api-sync')}?since=invalid")
+        force_authenticate(request, setup_db[0].coach)
+
+        assert SyncView.as_view()(request).status_code == 400
+
+    def test_snapshot_pages(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        Training.objects.bulk_create([Training(relation=setup_db[0], date=SOME_MONDAY + day * DAY,
+                                               description='description') for day in range(SNAPSHOT_PAGE_SIZE + 1)])
+        trainings = Training.objects.order_by('pk')
+        request = api_factory.get(reverse('trainings-api-sync'))
+        force_authenticate(request, setup_db[0].coach)
+        first = loads(SyncView.as_view()(request).rendered_content)
+        request = api_factory.get(f"{reverse('trainings-api-sync')}?cursor={first['next']}")
+        force_authenticate(request, setup_db[0].coach)
+
+        second = loads(SyncView.as_view()(request).rendered_content)
+
+        assert [t['id'] for t in first['trainings'] + second['trainings']] == [t.pk for t in trainings]
+        assert len(second['trainings']) == 1
+        assert second['next'] is None and second['relations'] == []
@@ -1,5 +1,6 @@
 import datetime
-from unittest.mock import Mock
+from json import loads
+from unittest.mock import Mock, patch
 
 import pytest
 from django.http import Http404
@@ -11,6 +12,7 @@ from rest_framework.test import APIRequestFactory, force_authenticate
 from training_calendar.utils import format_date
 from trainings.api_views.trainings_coach import TrainingsCoachViewSet
 from trainings.models import Training
+from trainings.serializers.training_serializer import TrainingSerializer
 from unittests.trainings.test_views import SOME_MONDAY
 from users.models import Relation, User
 
@@ -112,16 +114,101 @@ class TestTrainingsCoachViewSet:
         with pytest.raises(PermissionDenied):
             view.get_queryset()
 
+    def test_list_unpaginated(self, relation: Relation, api_factory: APIRequestFactory):
+        for i in range(3):
+            Training.objects.create(relation=relation, date=SOME_MONDAY + datetime.timedelta(days=i),
+                                    description='description')
+        request = api_factory.get(f'{reverse("trainings-api-list", kwargs={"relation": relation.pk})}')
+        force_authenticate(request, relation.coach)
+        view = TrainingsCoachViewSet.as_view({'get': 'list'})
+
+        with patch.object(TrainingsCoachViewSet, 'serializer_class', TrainingSerializer):
+            response = view(request, relation=relation.pk)
+
+        assert len(loads(response.rendered_content)) == 3
+
+    def test_list_cursor_pagination(self, relation: Relation, api_factory: APIRequestFactory):
+        for i in range(5):
+            Training.objects.create(relation=relation, date=SOME_MONDAY - datetime.timedelta(days=i),
+                                    description='description')
+        url = f'{reverse("trainings-api-list", kwargs={"relation": relation.pk})}?page_size=2&start_date=' \
+            f'{format_date(SOME_MONDAY - datetime.timedelta(days=3))}'
+        view = TrainingsCoachViewSet.as_view({'get': 'list'})
+        dates = []
+
+        with patch.object(TrainingsCoachViewSet, 'serializer_class', TrainingSerializer):
+            while url:
+                request = api_factory.get(url)
+                force_authenticate(request, relation.coach)
+                json_response = loads(view(request, relation=relation.pk).rendered_content)
+                assert len(json_response['results']) <= 2
+                dates += [training['date'] for training in json_response['results']]
+                url = json_response['next']
+
+        assert dates == [format_date(SOME_MONDAY - datetime.timedelta(days=i)) for i in range(3, -1, -1)]
+
+    @pytest.mark.parametrize('query, accept', [('?compact=true', 'application/json'),
+                                               ('', 'application/json; compact=true')])
+    def test_list_compact(self, query: str, accept: str, relation: Relation, api_factory: APIRequestFactory):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        request = api_factory.get(f'{reverse("trainings-api-list", kwargs={"relation": relation.pk})}{query}',
+                                  HTTP_ACCEPT=accept)
+        force_authenticate(request, relation.coach)
+        view = TrainingsCoachViewSet.as_view({'get': 'list'})
+
+        with patch.object(TrainingsCoachViewSet, 'serializer_class', TrainingSerializer):
+            response = view(request, relation=relation.pk)
+
+        assert loads(response.rendered_content)[0]['id'] == training.pk
+        assert loads(response.rendered_content)[0]['relation'] == relation.pk
+
+    @pytest.mark.parametrize('compact', ['false', 'true'])
+    def test_list_sparse_fields(self, compact: str, relation: Relation, api_factory: APIRequestFactory):
+        Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        request = api_factory.get(f'{reverse("trainings-api-list", kwargs={"relation": relation.pk})}'
+                                  f'?fields=date,description,execution&exclude=execution&compact={compact}')
+        force_authenticate(request, relation.coach)
+        view = TrainingsCoachViewSet()
+        view.setup(Request(request), relation=relation.pk)
+        view.format_kwarg = None
+
+        queryset = view.get_queryset()
+        data = view.get_serializer(queryset, many=True).data
+
+        assert queryset[0].get_deferred_fields() == {'execution', 'visible_since', 'relation_id', 'updated_at'}
+        assert [dict(training) for training in data] == [{'date': format_date(SOME_MONDAY),
+                                                          'description': 'description'}]
+
+    def test_list_not_modified(self, relation: Relation, api_factory: APIRequestFactory):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        url = f'{reverse("trainings-api-list", kwargs={"relation": relation.pk})}'
+        view = TrainingsCoachViewSet.as_view({'get': 'list'})
+
+        with patch.object(TrainingsCoachViewSet, 'serializer_class', TrainingSerializer):
+            request = api_factory.get(url)
+            force_authenticate(request, relation.coach)
+            etag = view(request, relation=relation.pk)['ETag']
+            request = api_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+            force_authenticate(request, relation.coach)
+            not_modified = view(request, relation=relation.pk)
+            training.delete()
+            request = api_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+            force_authenticate(request, relation.coach)
+            modified = view(request, relation=relation.pk)
+
+        assert not_modified.status_code == 304
+        assert modified.status_code == 200
+
     def test_create(self, relation: Relation, api_factory: APIRequestFactory):
         request = api_factory.post(f'{reverse("trainings-api-list", kwargs={"relation": relation.pk})}',
                                    data={'training': 'data'})
         force_authenticate(request, user=relation.coach)
         serializer_mock = Mock()
         serializer_mock().is_valid.return_value = True
-        TrainingsCoachViewSet.serializer_class = serializer_mock
         view = TrainingsCoachViewSet.as_view({'post': 'create'})
 
-        view(request)
+        with patch.object(TrainingsCoachViewSet, 'serializer_class', serializer_mock):
+            view(request)
 
         serializer_mock().save.assert_called()
 
@@ -132,9 +219,9 @@ class TestTrainingsCoachViewSet:
         force_authenticate(request, user=relation.coach)
         serializer_mock = Mock()
         serializer_mock().is_valid.return_value = True
-        TrainingsCoachViewSet.serializer_class = serializer_mock
         view = TrainingsCoachViewSet.as_view({'patch': 'partial_update'})
 
-        view(request, pk=training.pk)
+        with patch.object(TrainingsCoachViewSet, 'serializer_class', serializer_mock):
+            view(request, pk=training.pk)
 
         serializer_mock().save.assert_called()
@@ -7,7 +7,7 @@ from rest_framework import serializers
 from rest_framework.test import APIRequestFactory
 
 from trainings.models import Training
-from trainings.serializers.training_serializer import TrainingSerializer
+from trainings.serializers.training_serializer import CompactTrainingSerializer, TrainingSerializer
 from users.models import Relation, RelationStatus
 
 
@@ -94,3 +94,33 @@ class TestTrainingSerializer:
 
         with pytest.raises(serializers.ValidationError):
             serializer.validate_relation(relation)
+
+
+class TestCompactTrainingSerializer:
+    def test_serialize(self, relation: Relation, api_factory: APIRequestFactory):
+        trainings = [Training.objects.create(relation=relation, date=datetime.date(2019, 12, 12 + i),
+                                             description='description') for i in range(2)]
+        request = api_factory.get('/')
+        serializer = CompactTrainingSerializer(trainings, many=True, context={'request': request})
+
+        data = serializer.data
+
+        assert data[1] == {'id': trainings[1].pk,
+                           'url': 'http://testserver' + reverse('trainings-api-entry', kwargs={'pk': trainings[1].pk}),
+                           'relation': relation.pk,
+                           'date': '2019-12-13',
+                           'description': 'description',
+                           'execution': None,
+                           'visible_since': None}
+
+    def test_create(self, relation: Relation, api_factory: APIRequestFactory):
+        relation.status = RelationStatus.ESTABLISHED
+        relation.save()
+        request = api_factory.get('/')
+        request.user = relation.coach
+        serializer = CompactTrainingSerializer(
+            data={'relation': relation.pk, 'date': '2019-12-12', 'description': 'description'},
+            context={'request': request})
+
+        assert serializer.is_valid()
+        assert serializer.save().relation == relation
@@ -0,0 +1,102 @@
+import csv
+import gzip
+from io import BytesIO, StringIO, TextIOWrapper
+from typing import List
+
+import pytest
+from django.core.management import CommandError, call_command
+from freezegun import freeze_time
+
+from trainings.models import Tombstone, Training, WeeklySummary
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+class TestExportTrainings:
+    def test_export(self, setup_db: List[Relation], tmp_path):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        path = tmp_path / 'trainings.csv'
+
+        call_command('export_trainings', setup_db[0].coach.username, output=str(path), stderr=StringIO())
+
+        rows = list(csv.reader(path.open()))
+        assert rows[1][4:] == [str(SOME_MONDAY), 'description', '', '', Training.objects.get().updated_at.isoformat()]
+
+    def test_stdout(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        out = StringIO()
+
+        call_command('export_trainings', setup_db[0].coach.username, stdout=out, stderr=StringIO())
+
+        assert list(csv.reader(StringIO(out.getvalue())))[1][5] == 'description'
+
+    def test_gzip_stdout(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        out = TextIOWrapper(BytesIO())
+
+        call_command('export_trainings', setup_db[0].coach.username, '--gzip', stdout=out, stderr=StringIO())
+
+        assert b'description' in gzip.decompress(out.buffer.getvalue())
+        with pytest.raises(CommandError):
+            call_command('export_trainings', setup_db[0].coach.username, '--gzip', stdout=StringIO())
+
+    def test_unknown_coach(self, setup_db: List[Relation]):
+        with pytest.raises(CommandError):
+            call_command('export_trainings', setup_db[0].runner.username)
+
+
+class TestImportTrainings:
+    def test_import(self, setup_db: List[Relation], tmp_path):
+        path = tmp_path / 'plan.csv'
+        path.write_text(f'﻿runner,date,description\n{setup_db[0].runner.username},{SOME_MONDAY},description\n'
+                        f'unknown,{SOME_MONDAY},description\n', encoding='utf-8')
+        out, err = StringIO(), StringIO()
+
+        call_command('import_trainings', setup_db[0].coach.username, str(path), stdout=out, stderr=err)
+
+        assert Training.objects.get().description == 'description'
+        assert out.getvalue().startswith('1 created, 0 updated, 0 unchanged')
+        assert "line 3: no runner 'unknown'" in err.getvalue()
+
+    def test_dry_run(self, setup_db: List[Relation], tmp_path):
+        path = tmp_path / 'plan.csv'
+        path.write_text(f'runner,date,description\n{setup_db[0].runner.username},{SOME_MONDAY},description\n')
+        out = StringIO()
+
+        call_command('import_trainings', setup_db[0].coach.username, str(path), '--dry-run', stdout=out)
+
+        assert not Training.objects.exists()
+        assert out.getvalue().startswith('1 would be created')
+
+    def test_invalid_encoding(self, setup_db: List[Relation], tmp_path):
+        path = tmp_path / 'plan.csv'
+        path.write_bytes(f'runner,date,description\n{setup_db[0].runner.username},{SOME_MONDAY},x\n'.encode() +
+                         'zażółć\n'.encode('cp1250'))
+
+        with pytest.raises(CommandError, match='UTF-8'):
+            call_command('import_trainings', setup_db[0].coach.username, str(path), '--batch-size', '1')
+
+        assert not Training.objects.exists()
+
+class TestRebuildSummaries:
+    def test_rebuild(self, setup_db: List[Relation]):
+        Training.objects.bulk_create([Training(relation=relation, date=SOME_MONDAY, description='description')
+                                      for relation in setup_db])
+        out = StringIO()
+
+        call_command('rebuild_summaries', stdout=out)
+
+        assert WeeklySummary.objects.count() == 2
+        assert out.getvalue().startswith('2 relations, 2 summaries')
+
+
+class TestPruneTombstones:
+    def test_prune(self, setup_db: List[Relation]):
+        with freeze_time('2019-09-01'):
+            Tombstone.objects.create(model=Tombstone.TRAINING, object_id=1, coach_id=setup_db[0].coach_id)
+        out = StringIO()
+
+        call_command('prune_tombstones', stdout=out)
+
+        assert out.getvalue() == '1 tombstones deleted\n'
+        assert not Tombstone.objects.exists()
@@ -1,3 +1,35 @@
+import datetime
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from trainings.models import CalendarFeed, Training
+from users.models import Relation
+
+
+class TestTraining:
+    def test_unique_relation_date(self, relation: Relation):
+        Training.objects.create(relation=relation, date=datetime.date(2019, 9, 30), description='description')
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Training.objects.create(relation=relation, date=datetime.date(2019, 9, 30), description='description')
+
+
+class TestCalendarFeed:
+    def test_get_for(self, relation: Relation):
+        feed = CalendarFeed.get_for(relation.runner)
+
+        assert CalendarFeed.get_for(relation.runner) == feed
+        assert CalendarFeed.get_for(relation.runner, relation) != feed
+
+    @pytest.mark.parametrize('with_relation', [False, True])
+    def test_unique(self, relation: Relation, with_relation: bool):
+        CalendarFeed.objects.create(user=relation.coach, relation=relation if with_relation else None)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            CalendarFeed.objects.create(user=relation.coach, relation=relation if with_relation else None)
+
+
 # from datetime import date
 #
 # from trainings.models import RunnerCoachRelation
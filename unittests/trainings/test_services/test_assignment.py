@@ -0,0 +1,48 @@
+import datetime
+from typing import List
+
+from trainings.models import Training
+from trainings.services.assignment import AssignmentStatus, prepare_assignment
+from users.models import Relation, User
+
+DATE = datetime.date(year=2019, month=9, day=30)
+
+
+class TestAssignment:
+    def test_conflicts(self, setup_db: List[Relation]):
+        training = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+
+        assignment = prepare_assignment(setup_db[0].coach, [r.runner.username for r in setup_db], DATE)
+
+        assert assignment.conflicts == [training]
+        assert assignment.missing == []
+
+    def test_missing(self, setup_db: List[Relation]):
+        User.objects.create(username='other', email='other@users.com', is_runner=True)
+
+        assignment = prepare_assignment(setup_db[0].coach, [setup_db[0].runner.username, 'other'], DATE)
+
+        assert assignment.missing == ['other']
+        assert assignment.apply('description')['other'] == AssignmentStatus.SKIPPED
+
+    def test_apply(self, setup_db: List[Relation], django_assert_num_queries):
+        Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        runners = [r.runner.username for r in setup_db]
+
+        with django_assert_num_queries(2):
+            assignment = prepare_assignment(setup_db[0].coach, runners, DATE)
+        results = assignment.apply('new_description', DATE - datetime.timedelta(days=7))
+
+        assert results == {runners[0]: AssignmentStatus.UPDATED, runners[1]: AssignmentStatus.CREATED}
+        assert all(t.description == 'new_description' for t in Training.objects.filter(date=DATE))
+        assert set(Training.objects.filter(date=DATE).values_list('visible_since', flat=True)) == {
+            DATE - datetime.timedelta(days=7)}
+        assert Training.objects.filter(date=DATE).count() == 2
+
+    def test_apply_unchanged(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=DATE, description='description', visible_since=DATE)
+
+        results = prepare_assignment(setup_db[0].coach, [setup_db[0].runner.username], DATE).apply(
+            'description', DATE)
+
+        assert results == {setup_db[0].runner.username: AssignmentStatus.SKIPPED}
@@ -0,0 +1,80 @@
+import datetime
+from typing import List
+
+from trainings.models import Training
+from trainings.services.batch import Batch
+from users.models import Relation, RelationStatus, User
+
+DATE = datetime.date(year=2019, month=9, day=30)
+DAY = datetime.timedelta(days=1)
+
+
+class TestBatch:
+    def test_apply(self, setup_db: List[Relation], django_assert_max_num_queries):
+        updated = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        deleted = Training.objects.create(relation=setup_db[1], date=DATE, description='description')
+        operations = [
+            {'op': 'create', 'relation': setup_db[0].pk, 'date': DATE + DAY, 'description': 'new'},
+            {'op': 'create', 'relation': setup_db[1].pk, 'date': DATE + DAY, 'description': 'new'},
+            {'op': 'update', 'id': updated.pk, 'description': 'changed', 'date': DATE + 2 * DAY},
+            {'op': 'delete', 'id': deleted.pk},
+        ]
+        batch = Batch(setup_db[0].coach, operations)
+
+        with django_assert_max_num_queries(3):
+            assert batch.validate()
+        results = batch.apply()
+
+        assert [result.status for result in results] == ['created', 'created', 'updated', 'deleted']
+        assert Training.objects.get(pk=updated.pk).date == DATE + 2 * DAY
+        assert not Training.objects.filter(pk=deleted.pk).exists()
+        assert Training.objects.filter(date=DATE + DAY).count() == 2
+
+    def test_create_existing_day_updates(self, setup_db: List[Relation]):
+        training = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        batch = Batch(setup_db[0].coach, [{'op': 'create', 'relation': setup_db[0].pk, 'date': DATE,
+                                           'description': 'new'}])
+
+        assert batch.validate()
+        batch.apply()
+
+        assert Training.objects.get(pk=training.pk).description == 'new'
+
+    def test_day_taken_after_validation(self, setup_db: List[Relation]):
+        moved = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        batch = Batch(setup_db[0].coach, [
+            {'op': 'create', 'relation': setup_db[1].pk, 'date': DATE, 'description': 'new'},
+            {'op': 'update', 'id': moved.pk, 'date': DATE + DAY},
+            {'op': 'create', 'relation': setup_db[0].pk, 'date': DATE + 2 * DAY, 'description': 'new'},
+        ])
+        assert batch.validate()
+        # written by another request
+        Training.objects.create(relation=setup_db[1], date=DATE, description='other')
+        Training.objects.create(relation=setup_db[0], date=DATE + DAY, description='other')
+
+        results = batch.apply()
+
+        assert [result.status for result in results] == ['error', 'error', 'created']
+        assert not batch.valid
+        assert Training.objects.get(pk=moved.pk).date == DATE
+        assert not Training.objects.filter(date=DATE + 2 * DAY).exists()
+
+    def test_invalid_nothing_written(self, setup_db: List[Relation]):
+        coach = User.objects.create(username='coach2', email='coach2@users.com', is_coach=True)
+        runner = User.objects.create(username='runner3', email='runner3@users.com', is_runner=True)
+        other = Relation.objects.create(coach=coach, runner=runner, status=RelationStatus.ESTABLISHED)
+        batch = Batch(setup_db[0].coach, [
+            {'op': 'create', 'relation': setup_db[0].pk, 'date': DATE, 'description': 'new'},
+            {'op': 'create', 'relation': other.pk, 'date': DATE, 'description': 'new'},
+        ])
+
+        assert not batch.validate()
+        assert batch.results[0].error is None and batch.results[1].error is not None
+        assert not Training.objects.exists()
+
+    def test_update_to_occupied_day(self, setup_db: List[Relation]):
+        t1 = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        Training.objects.create(relation=setup_db[0], date=DATE + DAY, description='description')
+        batch = Batch(setup_db[0].coach, [{'op': 'update', 'id': t1.pk, 'date': DATE + DAY}])
+
+        assert not batch.validate()
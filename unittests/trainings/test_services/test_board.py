@@ -0,0 +1,41 @@
+import datetime
+from typing import List
+
+from trainings.models import Training
+from trainings.services.board import resolve_board
+from users.models import Relation, RelationStatus, User
+
+SOME_MONDAY = datetime.date(year=2019, month=9, day=30)
+DAY = datetime.timedelta(days=1)
+
+
+class TestResolveBoard:
+    def test_rows(self, setup_db: List[Relation], django_assert_num_queries):
+        t1 = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        t2 = Training.objects.create(relation=setup_db[1], date=SOME_MONDAY + 3 * DAY, description='description')
+
+        with django_assert_num_queries(2):
+            board = resolve_board(setup_db[0].coach, SOME_MONDAY)
+            assert [row.days[0].get_absolute_url() for row in board.rows if row.days[0].pk]
+
+        assert [row.relation for row in board.rows] == setup_db
+        assert board.rows[0].days[0] == t1 and board.rows[1].days[3] == t2
+        assert all(len(row.days) == 7 for row in board.rows)
+        assert board.next_cursor is None
+
+    def test_only_established(self, setup_db: List[Relation]):
+        runner = User.objects.create(username='runner3', email='runner3@users.com', is_runner=True)
+        Relation.objects.create(coach=setup_db[0].coach, runner=runner, status=RelationStatus.INVITED_BY_COACH)
+
+        board = resolve_board(setup_db[0].coach, SOME_MONDAY)
+
+        assert runner not in [row.relation.runner for row in board.rows]
+
+    def test_keyset_pagination(self, setup_db: List[Relation]):
+        first = resolve_board(setup_db[0].coach, SOME_MONDAY, limit=1)
+        second = resolve_board(setup_db[0].coach, SOME_MONDAY, after=first.next_cursor, limit=1)
+
+        assert [row.relation for row in first.rows] == [setup_db[0]]
+        assert first.next_cursor == setup_db[0].runner.username
+        assert [row.relation for row in second.rows] == [setup_db[1]]
+        assert second.next_cursor is None
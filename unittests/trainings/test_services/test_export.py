@@ -0,0 +1,53 @@
+import csv
+import gzip
+import io
+import json
+from typing import List
+
+from trainings.models import Training
+from trainings.services.export import COLUMNS, export_queryset, export_trainings
+from unittests.trainings.test_views import DAY, SOME_MONDAY
+from users.models import Relation
+
+
+def create_trainings(setup_db: List[Relation], days: int = 3):
+    for relation in setup_db:
+        for day in range(days):
+            Training.objects.create(relation=relation, date=SOME_MONDAY + day * DAY, description='easy, "run"\n8km')
+
+
+class TestExport:
+    def test_csv(self, setup_db: List[Relation]):
+        create_trainings(setup_db)
+
+        content = b''.join(export_trainings(export_queryset(setup_db[0].coach), 'csv')).decode()
+
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == COLUMNS
+        assert len(rows) == 7
+        assert rows[1][2:6] == [setup_db[0].runner.username, '', str(SOME_MONDAY), 'easy, "run"\n8km']
+
+    def test_jsonl_gzip(self, setup_db: List[Relation]):
+        create_trainings(setup_db)
+
+        content = gzip.decompress(b''.join(export_trainings(export_queryset(setup_db[0].coach), 'jsonl', True)))
+
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        assert len(rows) == 6
+        assert rows[0]['date'] == str(SOME_MONDAY) and rows[0]['execution'] is None
+
+    def test_range(self, setup_db: List[Relation]):
+        create_trainings(setup_db)
+
+        trainings = export_queryset(setup_db[0].coach, SOME_MONDAY + DAY, SOME_MONDAY + DAY)
+
+        assert [row[4] for row in trainings] == [SOME_MONDAY + DAY] * 2
+
+    def test_chunked(self, setup_db: List[Relation], django_assert_num_queries):
+        create_trainings(setup_db, 600)
+
+        with django_assert_num_queries(1):
+            chunks = list(export_trainings(export_queryset(setup_db[0].coach), 'jsonl'))
+
+        assert len(chunks) == 3
+        assert sum(chunk.count(b'\n') for chunk in chunks) == 1200
@@ -0,0 +1,57 @@
+import datetime
+
+from freezegun import freeze_time
+
+from trainings.models import CalendarFeed, Training
+from trainings.services.ical import escape, feed_trainings, fold, render_event, stream_calendar
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+UPDATED_AT = datetime.datetime(2019, 9, 30, 12, tzinfo=datetime.timezone.utc)
+
+
+def test_escape():
+    assert escape('a;b,c\\d\ne') == 'a\\;b\\,c\\\\d\\ne'
+
+
+def test_fold():
+    folded = fold('DESCRIPTION:' + 'ł' * 80)
+
+    lines = folded.split('\r\n')
+    assert all(len(line.encode()) <= 75 for line in lines)
+    assert all(line.startswith(' ') for line in lines[1:-1])
+    assert ''.join(line[1:] if i else line for i, line in enumerate(lines)) == 'DESCRIPTION:' + 'ł' * 80
+
+
+def test_render_event():
+    event = render_event((1, SOME_MONDAY, 'easy run\n8km', 'done', UPDATED_AT), 'example.com')
+
+    assert event.split('\r\n') == ['BEGIN:VEVENT', 'UID:training-1@example.com', 'DTSTAMP:20190930T120000Z',
+                                   'DTSTART;VALUE=DATE:20190930', 'DTEND;VALUE=DATE:20191001', 'SUMMARY:easy run',
+                                   'DESCRIPTION:easy run\\n8km\\n\\ndone', 'END:VEVENT', '']
+
+
+@freeze_time(SOME_MONDAY)
+def test_stream_calendar(relation: Relation, django_assert_num_queries):
+    for day in range(150):
+        Training.objects.create(relation=relation, date=SOME_MONDAY + datetime.timedelta(days=day),
+                                description=f'training {day}')
+
+    with django_assert_num_queries(1):
+        chunks = list(stream_calendar('runner', Training.objects.all(), 'example.com'))
+
+    document = ''.join(chunks)
+    assert len(chunks) == 3
+    assert document.startswith('BEGIN:VCALENDAR\r\n') and document.endswith('END:VCALENDAR\r\n')
+    assert document.count('BEGIN:VEVENT') == 150
+    assert document.index('SUMMARY:training 0\r\n') < document.index('SUMMARY:training 149\r\n')
+
+
+@freeze_time(SOME_MONDAY)
+def test_feed_trainings(relation: Relation):
+    visible = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+    hidden = Training.objects.create(relation=relation, date=SOME_MONDAY + datetime.timedelta(days=7),
+                                     description='description', visible_since=SOME_MONDAY + datetime.timedelta(days=1))
+
+    assert list(feed_trainings(CalendarFeed.get_for(relation.runner))) == [visible]
+    assert set(feed_trainings(CalendarFeed.get_for(relation.coach, relation))) == {visible, hidden}
@@ -0,0 +1,90 @@
+from typing import List
+from unittest.mock import patch
+
+from trainings.models import Training
+from trainings.services.plan_import import PlanImport
+from unittests.trainings.test_views import DAY, SOME_MONDAY
+from users.models import Relation, RelationStatus
+
+HEADER = 'runner,date,description,visible_since\n'
+
+
+def run(relation: Relation, rows: str, **kwargs) -> PlanImport:
+    return PlanImport(relation.coach, **kwargs).run((HEADER + rows).splitlines(keepends=True))
+
+
+class TestPlanImport:
+    def test_upsert(self, setup_db: List[Relation], django_assert_num_queries):
+        setup_db[1].nickname = 'nick'
+        setup_db[1].save()
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='old')
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY + DAY, description='same')
+        rows = f'{setup_db[0].runner.username},{SOME_MONDAY},new,{SOME_MONDAY - DAY}\n' \
+            f'{setup_db[0].runner.username},{SOME_MONDAY + DAY},same,\n' \
+            f'nick,{SOME_MONDAY},"easy, 8km",\n' \
+            f'nick,{SOME_MONDAY + DAY},long run,\n'
+
+        with django_assert_num_queries(12):
+            plan = run(setup_db[0], rows, batch_size=2)
+
+        assert (plan.created, plan.updated, plan.unchanged) == (2, 1, 1)
+        assert not plan.errors
+        updated = Training.objects.get(relation=setup_db[0], date=SOME_MONDAY)
+        assert (updated.description, updated.visible_since) == ('new', SOME_MONDAY - DAY)
+        assert Training.objects.get(relation=setup_db[1], date=SOME_MONDAY).description == 'easy, 8km'
+
+    def test_concurrent_training(self, setup_db: List[Relation]):
+        existing = PlanImport.existing
+
+        def read(plan: PlanImport, batch):
+            trainings = existing(plan, batch)
+            if not Training.objects.exists():
+                # added by another request after the batch's trainings were read
+                Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='old')
+            return trainings
+
+        with patch.object(PlanImport, 'existing', read):
+            plan = run(setup_db[0], f'{setup_db[0].runner.username},{SOME_MONDAY},new,\n'
+                                    f'{setup_db[1].runner.username},{SOME_MONDAY},new,\n')
+
+        assert (plan.created, plan.updated) == (1, 1)
+        assert list(Training.objects.order_by('relation').values_list('description', flat=True)) == ['new', 'new']
+
+    def test_dry_run(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='old')
+
+        plan = run(setup_db[0], f'{setup_db[0].runner.username},{SOME_MONDAY},new,\n'
+                                f'{setup_db[1].runner.username},{SOME_MONDAY},new,\n', dry_run=True)
+
+        assert (plan.created, plan.updated) == (1, 1)
+        assert list(Training.objects.values_list('description', flat=True)) == ['old']
+
+    def test_errors(self, setup_db: List[Relation]):
+        setup_db[1].status = RelationStatus.INVITED_BY_COACH
+        setup_db[1].save()
+        username = setup_db[0].runner.username
+
+        plan = run(setup_db[0], f'{username},{SOME_MONDAY},description,\n'
+                                f'{setup_db[1].runner.username},{SOME_MONDAY},description,\n'
+                                f'{username},30.09.2019,description,\n'
+                                f'{username},{SOME_MONDAY + DAY},,\n'
+                                f'{username},{SOME_MONDAY},other,\n')
+
+        assert [line for line, _ in plan.errors] == [3, 4, 5, 6]
+        assert plan.errors[3][1] == f"training of '{username}' on {SOME_MONDAY} is already on line 2"
+        assert plan.created == 1
+
+    def test_missing_columns(self, relation: Relation):
+        plan = PlanImport(relation.coach).run(['runner,day\n'])
+
+        assert plan.errors == [(1, 'missing columns: date, description')]
+
+    def test_ambiguous_nickname(self, setup_db: List[Relation]):
+        setup_db[1].nickname = setup_db[0].runner.username
+        setup_db[1].save()
+
+        plan = run(setup_db[0], f'{setup_db[0].runner.username},{SOME_MONDAY},description,\n')
+
+        assert plan.errors == [(2, f"'{setup_db[0].runner.username}' is both a username and a nickname of another "
+                                   f"runner")]
+        assert not Training.objects.exists()
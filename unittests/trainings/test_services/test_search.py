@@ -0,0 +1,78 @@
+from typing import List
+
+import pytest
+from django.db import connection
+
+from trainings.models import Training
+from trainings.services.assignment import prepare_assignment
+from trainings.services.search import search_terms, search_trainings
+from unittests.trainings.test_views import DAY, SOME_MONDAY
+from users.models import Relation, RelationStatus
+
+
+@pytest.mark.django_db
+def test_triggers_kept():
+    # SQLite drops triggers of a table a later migration remakes, they have to be created again by it
+    if connection.vendor == 'sqlite':
+        sql = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'trainings_training'"
+        expected = {'trainings_training_fts_insert', 'trainings_training_fts_delete', 'trainings_training_fts_update'}
+    elif connection.vendor == 'postgresql':
+        sql = "SELECT tgname FROM pg_trigger WHERE tgrelid = 'trainings_training'::regclass AND NOT tgisinternal"
+        expected = {'trainings_training_search_update'}
+    else:
+        pytest.skip('search falls back to icontains')
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        assert expected <= {row[0] for row in cursor.fetchall()}
+
+
+def test_search_terms():
+    assert search_terms('10x400m "tempo" OR (hills*)') == ['10x400m', 'tempo', 'or', 'hills']
+
+
+class TestSearchTrainings:
+    def test_ranked(self, setup_db: List[Relation]):
+        weak = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='easy run',
+                                       execution='felt like 10x400m')
+        strong = Training.objects.create(relation=setup_db[1], date=SOME_MONDAY, description='10x400m on track')
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY + DAY, description='12x200m')
+
+        assert search_trainings(setup_db[0].coach, '10x400m') == [strong, weak]
+
+    def test_every_term_and_prefix(self, setup_db: List[Relation]):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='Tempo na bieżni')
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY + DAY, description='tempo w terenie')
+
+        assert search_trainings(setup_db[0].coach, 'tempo bież') == [training]
+        assert search_trainings(setup_db[0].coach, 'biezni') == [training]
+
+    def test_scoped(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='tempo')
+        setup_db[0].status = RelationStatus.REVOKED
+        setup_db[0].save()
+
+        assert search_trainings(setup_db[0].coach, 'tempo') == []
+
+    def test_synced(self, setup_db: List[Relation]):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='tempo')
+        training.description = 'hills'
+        training.save()
+        prepare_assignment(setup_db[0].coach, [setup_db[1].runner.username], SOME_MONDAY).apply('bulk hills')
+
+        assert search_trainings(setup_db[0].coach, 'tempo') == []
+        assert len(search_trainings(setup_db[0].coach, 'hills')) == 2
+
+        training.delete()
+
+        assert len(search_trainings(setup_db[0].coach, 'hills')) == 1
+
+    def test_paged(self, setup_db: List[Relation]):
+        for day in range(5):
+            Training.objects.create(relation=setup_db[0], date=SOME_MONDAY + day * DAY, description='tempo')
+
+        first = search_trainings(setup_db[0].coach, 'tempo', 3)
+        second = search_trainings(setup_db[0].coach, 'tempo', 3, 3)
+
+        assert len(first) == 3 and len(second) == 2
+        assert not set(first) & set(second)
@@ -0,0 +1,130 @@
+from typing import List
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from trainings.models import Training, WeeklySummary
+from trainings.services.assignment import prepare_assignment
+from trainings.services.batch import Batch
+from trainings.services.summary import rebuild_summaries, resolve_compliance
+from trainings.services.week import WEEK
+from unittests.trainings.test_views import DAY, SOME_MONDAY
+from users.models import Relation, RelationStatus
+
+
+def summaries() -> dict:
+    return {(summary.relation_id, summary.week): (summary.planned, summary.executed)
+            for summary in WeeklySummary.objects.all()}
+
+
+class TestSummarySignals:
+    def test_save(self, relation: Relation):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        Training.objects.create(relation=relation, date=SOME_MONDAY + 6 * DAY, description='description')
+
+        assert summaries() == {(relation.pk, SOME_MONDAY): (2, 0)}
+
+        training.execution = 'execution'
+        training.save()
+
+        assert summaries() == {(relation.pk, SOME_MONDAY): (2, 1)}
+
+    def test_moved(self, relation: Relation):
+        Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        training = Training.objects.get()
+
+        training.date = SOME_MONDAY + WEEK
+        training.save()
+
+        assert summaries() == {(relation.pk, SOME_MONDAY + WEEK): (1, 0)}
+
+    def test_deleted(self, relation: Relation):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        Training.objects.create(relation=relation, date=SOME_MONDAY + DAY, description='description')
+
+        training.delete()
+        assert summaries() == {(relation.pk, SOME_MONDAY): (1, 0)}
+
+        relation.delete()
+        assert summaries() == {}
+
+
+    def test_relation_deleted(self, relation: Relation):
+        def delete_relation(trainings: int) -> int:
+            relation = Relation.objects.create(runner=runner, coach=coach)
+            Training.objects.bulk_create([Training(relation=relation, date=SOME_MONDAY + day * DAY,
+                                                   description='description') for day in range(trainings)])
+            rebuild_summaries([relation.pk])
+            with CaptureQueriesContext(connection) as queries:
+                relation.delete()
+            return len(queries)
+
+        runner, coach = relation.runner, relation.coach
+        relation.delete()
+
+        # queries don't depend on the number of trainings
+        assert delete_relation(1) == delete_relation(30)
+        assert summaries() == {}
+
+
+class TestSummaryBulkWrites:
+    def test_assignment(self, setup_db: List[Relation]):
+        prepare_assignment(setup_db[0].coach, [relation.runner.username for relation in setup_db],
+                           SOME_MONDAY).apply('description')
+
+        assert summaries() == {(relation.pk, SOME_MONDAY): (1, 0) for relation in setup_db}
+
+    def test_batch(self, setup_db: List[Relation]):
+        moved = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        batch = Batch(setup_db[0].coach, [
+            {'op': 'update', 'id': moved.pk, 'date': SOME_MONDAY + WEEK},
+            {'op': 'create', 'relation': setup_db[1].pk, 'date': SOME_MONDAY, 'description': 'new'},
+        ])
+        assert batch.validate()
+
+        batch.apply()
+
+        assert summaries() == {(setup_db[0].pk, SOME_MONDAY + WEEK): (1, 0), (setup_db[1].pk, SOME_MONDAY): (1, 0)}
+
+    def test_batch_delete(self, setup_db: List[Relation]):
+        trainings = [Training.objects.create(relation=setup_db[0], date=SOME_MONDAY + day * DAY,
+                                             description='description') for day in range(3)]
+        batch = Batch(setup_db[0].coach, [{'op': 'delete', 'id': training.pk} for training in trainings[1:]])
+        assert batch.validate()
+
+        batch.apply()
+
+        assert summaries() == {(setup_db[0].pk, SOME_MONDAY): (1, 0)}
+
+
+class TestRebuildSummaries:
+    def test_rebuild(self, setup_db: List[Relation]):
+        Training.objects.bulk_create([Training(relation=relation, date=SOME_MONDAY + day * DAY, description='d',
+                                               execution='e' if day % 2 else None)
+                                      for relation in setup_db for day in range(10)])
+        WeeklySummary.objects.create(relation=setup_db[0], week=SOME_MONDAY - WEEK, planned=3)
+        progress = []
+
+        count = rebuild_summaries(chunk_size=1, progress=lambda *args: progress.append(args))
+
+        assert count == 4
+        assert progress == [(1, 2), (2, 4)]
+        assert summaries() == {key: value for relation in setup_db for key, value in [
+            ((relation.pk, SOME_MONDAY), (7, 3)), ((relation.pk, SOME_MONDAY + WEEK), (3, 2))]}
+
+
+class TestResolveCompliance:
+    def test_resolve(self, setup_db: List[Relation], django_assert_num_queries):
+        setup_db[1].status = RelationStatus.REVOKED
+        setup_db[1].save()
+        for relation in setup_db:
+            Training.objects.create(relation=relation, date=SOME_MONDAY + WEEK, description='description',
+                                    execution='execution')
+
+        with django_assert_num_queries(2):
+            rows = resolve_compliance(setup_db[0].coach, SOME_MONDAY + 2 * DAY, 3)
+
+        assert [row.relation for row in rows] == [setup_db[0]]
+        assert [(week.week, week.planned, week.executed) for week in rows[0].weeks] == [
+            (SOME_MONDAY, 0, 0), (SOME_MONDAY + WEEK, 1, 1), (SOME_MONDAY + 2 * WEEK, 0, 0)]
+        assert (rows[0].planned, rows[0].executed) == (1, 1)
@@ -0,0 +1,118 @@
+import datetime
+from typing import List
+
+import pytest
+from django.core import signing
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+
+from trainings.models import Tombstone, Training
+from trainings.services.batch import Batch
+from trainings.services.sync import TOKEN_MAX_AGE, changes_since, decode_token, encode_token, prune_tombstones, \
+    snapshot
+from users.models import Relation
+
+DATE = datetime.date(year=2019, month=9, day=30)
+
+
+class TestSync:
+    def test_token(self):
+        moment = datetime.datetime(2019, 9, 30, 12, tzinfo=datetime.timezone.utc)
+
+        assert decode_token(encode_token(moment)) == moment
+        with pytest.raises(signing.BadSignature):
+            decode_token('invalid')
+
+    def test_token_expired(self):
+        with freeze_time('2019-09-01'):
+            token = encode_token(datetime.datetime.now(tz=datetime.timezone.utc))
+
+        with freeze_time(datetime.datetime(2019, 9, 2) + TOKEN_MAX_AGE):
+            with pytest.raises(signing.BadSignature):
+                decode_token(token)
+
+    def test_full(self, setup_db: List[Relation]):
+        training = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+
+        changes = changes_since(setup_db[0].coach)
+
+        assert changes.trainings == [training]
+        assert changes.relations == setup_db
+        assert changes.tombstones == []
+
+    def test_since(self, setup_db: List[Relation]):
+        with freeze_time('2019-09-01'):
+            old = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+            deleted = Training.objects.create(relation=setup_db[1], date=DATE, description='description')
+            setup_db[0].save()
+            setup_db[1].save()
+        with freeze_time('2019-09-01 12:00'):
+            token = changes_since(setup_db[0].coach).token
+        with freeze_time('2019-09-02'):
+            new = Training.objects.create(relation=setup_db[0], date=DATE + datetime.timedelta(days=1),
+                                          description='description')
+            old.description = 'changed'
+            old.save()
+            deleted_pk = deleted.pk
+            deleted.delete()
+
+            changes = changes_since(setup_db[0].coach, decode_token(token))
+
+        assert set(changes.trainings) == {old, new}
+        assert changes.relations == []
+        assert [(t.model, t.object_id) for t in changes.tombstones] == [(Tombstone.TRAINING, deleted_pk)]
+
+    def test_relation_deleted(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        relation_pk = setup_db[0].pk
+        since = datetime.datetime.now(tz=datetime.timezone.utc)
+
+        setup_db[0].delete()
+
+        tombstones = changes_since(setup_db[1].coach, since).tombstones
+        assert (Tombstone.RELATION, relation_pk) in [(t.model, t.object_id) for t in tombstones]
+        assert Tombstone.TRAINING in [t.model for t in tombstones]
+
+    def test_relation_deleted_tombstones_inserted_once(self, setup_db: List[Relation]):
+        Training.objects.bulk_create([Training(relation=setup_db[0], date=DATE + datetime.timedelta(days=day),
+                                               description='description') for day in range(10)])
+
+        with CaptureQueriesContext(connection) as queries:
+            setup_db[0].delete()
+
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "trainings_tombstone"')]
+        assert len(inserts) == 1
+        assert Tombstone.objects.filter(model=Tombstone.TRAINING).count() == 10
+
+    def test_batch_deleted(self, setup_db: List[Relation]):
+        Training.objects.bulk_create([
+            Training(relation=setup_db[0], date=DATE + datetime.timedelta(days=day), description='description')
+            for day in range(3)])
+        trainings = list(Training.objects.filter(relation=setup_db[0]))
+        batch = Batch(setup_db[0].coach, [{'op': 'delete', 'id': training.pk} for training in trainings])
+        assert batch.validate()
+
+        batch.apply()
+
+        assert sorted(Tombstone.objects.values_list('object_id', flat=True)) == sorted(t.pk for t in trainings)
+
+    def test_snapshot_pages(self, setup_db: List[Relation]):
+        trainings = [Training.objects.create(relation=setup_db[0], date=DATE + datetime.timedelta(days=day),
+                                             description='description') for day in range(3)]
+
+        first = snapshot(setup_db[0].coach, page_size=2)
+        second = snapshot(setup_db[0].coach, first.cursor, page_size=2)
+
+        assert first.trainings == trainings[:2] and first.relations == setup_db
+        assert second.trainings == trainings[2:] and second.relations == []
+        assert second.cursor is None
+        assert decode_token(second.token) == decode_token(first.token)
+
+    def test_prune(self, setup_db: List[Relation]):
+        with freeze_time('2019-09-01'):
+            Tombstone.objects.create(model=Tombstone.TRAINING, object_id=1, coach_id=setup_db[0].coach_id)
+        Tombstone.objects.create(model=Tombstone.TRAINING, object_id=2, coach_id=setup_db[0].coach_id)
+
+        assert prune_tombstones() == 1
+        assert list(Tombstone.objects.values_list('object_id', flat=True)) == [2]
@@ -0,0 +1,56 @@
+import datetime
+
+from trainings.models import Training
+from trainings.services.week import EmptyTraining, resolve_range, resolve_week
+from users.models import Relation
+
+SOME_MONDAY = datetime.date(year=2019, month=9, day=30)
+DAY = datetime.timedelta(days=1)
+
+
+class TestResolveWeek:
+    def test_fill(self, relation: Relation):
+        monday = Training.objects.create(relation=relation, description='description', date=SOME_MONDAY)
+        sunday = Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + 6 * DAY)
+        Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + 7 * DAY)
+
+        week = resolve_week(relation, Training.objects.filter(relation=relation), SOME_MONDAY)
+
+        assert len(week.days) == 7
+        assert week.days[0] == monday and week.days[6] == sunday
+        assert all(isinstance(day, EmptyTraining) and day.pk is None for day in week.days[1:6])
+        assert [day.date for day in week.days] == [SOME_MONDAY + i * DAY for i in range(7)]
+        assert week.entry is None
+
+    def test_entry(self, relation: Relation, django_assert_num_queries):
+        training = Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + DAY)
+
+        with django_assert_num_queries(1):
+            week = resolve_week(relation, Training.objects.filter(relation=relation), SOME_MONDAY,
+                                SOME_MONDAY + DAY)
+            assert week.entry.relation.runner.username == relation.runner.username
+
+        assert week.entry == training
+
+    def test_entry_missing(self, relation: Relation):
+        week = resolve_week(relation, Training.objects.filter(relation=relation), SOME_MONDAY, SOME_MONDAY)
+
+        assert week.entry is None
+
+    def test_navigation(self, relation: Relation):
+        week = resolve_week(relation, Training.objects.none(), SOME_MONDAY)
+
+        assert week.previous_week == SOME_MONDAY - 7 * DAY
+        assert week.next_week == SOME_MONDAY + 7 * DAY
+        assert week.sunday == SOME_MONDAY + 6 * DAY
+
+
+class TestResolveRange:
+    def test_weeks(self, relation: Relation):
+        training = Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + 10 * DAY)
+
+        calendar = resolve_range(relation, Training.objects.filter(relation=relation), SOME_MONDAY, 14)
+
+        assert len(calendar.weeks) == 2
+        assert calendar.weeks[1][3] == training
+        assert calendar.end == SOME_MONDAY + 13 * DAY
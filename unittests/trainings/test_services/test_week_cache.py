@@ -0,0 +1,147 @@
+from typing import List
+
+import pytest
+from django.core.cache import cache
+from django.db.models import Model
+from django.urls import reverse
+
+from trainings.models import Training
+from trainings.services.assignment import prepare_assignment
+from trainings.services.week import WEEK
+from trainings.services.week_cache import get_version, relation_scope, render_weeks, resolve_cached_range, \
+    runner_scope, week_key
+from unittests.trainings.test_views import SOME_MONDAY
+from users.models import Relation
+
+
+@pytest.fixture(params=['locmem', 'filebased'], autouse=True)
+def backend(request, settings, tmp_path):
+    if request.param == 'locmem':
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                       'LOCATION': 'week-cache-tests'}}
+    else:
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                       'LOCATION': str(tmp_path)}}
+    cache.clear()
+
+
+def resolve(relation: Relation, days: int = 7):
+    scope = relation_scope(relation.pk)
+    return resolve_cached_range(scope, get_version(scope), relation, Training.objects.filter(relation=relation),
+                                SOME_MONDAY, days)
+
+
+class TestResolveCachedRange:
+    def test_cached(self, relation: Relation, django_assert_num_queries):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        resolve(relation)
+
+        with django_assert_num_queries(0):
+            calendar = resolve(relation)
+
+        assert calendar.days[0] == training
+        assert calendar.days[0].relation.runner == relation.runner
+
+    def test_cached_values(self, relation: Relation):
+        Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        resolve(relation)
+        scope = relation_scope(relation.pk)
+
+        rows = cache.get(week_key(scope, get_version(scope), SOME_MONDAY))
+
+        assert [type(value) for value in rows[0] if isinstance(value, Model)] == []
+        assert relation.runner.password not in rows[0]
+
+    def test_other_relations(self, setup_db: List[Relation]):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        scope = runner_scope(setup_db[0].runner_id)
+        resolve_cached_range(scope, get_version(scope), None, Training.objects.filter(relation=setup_db[0]),
+                             SOME_MONDAY, 7)
+
+        calendar = resolve_cached_range(scope, get_version(scope), None,
+                                        Training.objects.filter(relation=setup_db[0]), SOME_MONDAY, 7)
+
+        assert calendar.days[0].relation.displayed_name == setup_db[0].displayed_name
+        assert calendar.days[0].get_absolute_url() == reverse(
+            'trainings-list-entry', kwargs={'runner': setup_db[0].runner.username, 'date': SOME_MONDAY})
+
+    def test_missing_weeks(self, relation: Relation, django_assert_num_queries):
+        Training.objects.create(relation=relation, date=SOME_MONDAY + WEEK, description='description')
+        resolve(relation)
+
+        with django_assert_num_queries(1):
+            calendar = resolve(relation, 21)
+
+        assert [day.pk is not None for day in calendar.days].count(True) == 1
+        assert calendar.days[7].description == 'description'
+
+    def test_cached_week_between_missing(self, relation: Relation):
+        for week in range(3):
+            Training.objects.create(relation=relation, date=SOME_MONDAY + week * WEEK, description=f'week {week}')
+        scope = relation_scope(relation.pk)
+        resolve_cached_range(scope, get_version(scope), relation, Training.objects.filter(relation=relation),
+                             SOME_MONDAY + WEEK, 7)
+
+        calendar = resolve_cached_range(scope, get_version(scope), relation,
+                                        Training.objects.filter(relation=relation), SOME_MONDAY, 21,
+                                        entry_date=SOME_MONDAY + WEEK)
+
+        assert [day.description for day in calendar.days if day.pk is not None] == ['week 0', 'week 1', 'week 2']
+        assert calendar.entry.description == 'week 1'
+
+    def test_invalidated_by_save(self, relation: Relation):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        resolve(relation)
+
+        training.description = 'new_description'
+        training.save()
+
+        assert resolve(relation).days[0].description == 'new_description'
+
+    def test_invalidated_by_delete(self, relation: Relation):
+        training = Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        resolve(relation)
+
+        training.delete()
+
+        assert resolve(relation).days[0].pk is None
+
+    def test_invalidated_by_relation(self, relation: Relation):
+        versions = get_version(relation_scope(relation.pk)), get_version(runner_scope(relation.runner_id))
+
+        relation.nickname = 'nickname'
+        relation.save()
+
+        assert versions[0] != get_version(relation_scope(relation.pk))
+        assert versions[1] != get_version(runner_scope(relation.runner_id))
+
+    def test_invalidated_by_bulk_writes(self, setup_db: List[Relation]):
+        resolve(setup_db[0])
+
+        prepare_assignment(setup_db[0].coach, [setup_db[0].runner.username], SOME_MONDAY).apply('description')
+
+        assert resolve(setup_db[0]).days[0].description == 'description'
+
+    def test_other_relations_kept(self, setup_db: List[Relation]):
+        version = get_version(relation_scope(setup_db[1].pk))
+
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+
+        assert get_version(relation_scope(setup_db[1].pk)) == version
+
+
+class TestRenderWeeks:
+    def test_cached(self, relation: Relation):
+        Training.objects.create(relation=relation, date=SOME_MONDAY, description='description')
+        scope = relation_scope(relation.pk)
+        version = get_version(scope)
+        weeks = resolve(relation).weeks
+        fragments = render_weeks(scope, version, 'trainings/coach_week.html', weeks, SOME_MONDAY)
+        weeks[0][0].description = 'new_description'
+
+        cached = render_weeks(scope, version, 'trainings/coach_week.html', weeks, SOME_MONDAY)
+        other = render_weeks(scope, version, 'trainings/coach_week.html', weeks, None)
+
+        assert cached == fragments
+        assert 'border-info' in fragments[0] and 'description' in fragments[0]
+        assert 'border-info' not in other[0] and 'new_description' in other[0]
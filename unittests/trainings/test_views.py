@@ -1,17 +1,23 @@
 import datetime
 from typing import List
-from unittest.mock import ANY, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import Http404
 from django.template.response import TemplateResponse
 from django.test import RequestFactory
 from django.urls import reverse
+from django.utils import timezone
 from freezegun import freeze_time
 
-from trainings.models import Training
-from trainings.views import TrainingCreateView, TrainingListMixin, TrainingListView, TrainingListViewRunner, \
-    TrainingUpdateView, TrainingUpdateViewRunner
+from trainings.models import CalendarFeed, Training
+from trainings.services.assignment import AssignmentStatus, prepare_assignment
+from trainings.services.board import Board
+from trainings.services.search import MAX_SEARCH_OFFSET, SEARCH_PAGE_SIZE
+from trainings.views import CalendarFeedView, TeamBoardView, TrainingCreateView, TrainingListMixin, TrainingListView, \
+    TrainingListViewRunner, TrainingUpdateView, TrainingUpdateViewRunner, home
 from users.models import Relation, RelationStatus, User
 
 DATE = datetime.date(year=2019, month=9, day=30)
@@ -19,6 +25,20 @@ SOME_MONDAY = DATE - datetime.timedelta(days=DATE.weekday())
 DAY = datetime.timedelta(days=1)
 
 
+class TestHome:
+    @pytest.mark.parametrize('status, url', [(RelationStatus.ESTABLISHED, 'trainings-runner'),
+                                             (RelationStatus.INVITED_BY_COACH, 'users-invites')])
+    def test_runner(self, status: RelationStatus, url: str, relation: Relation, request_factory: RequestFactory):
+        relation.status = status
+        relation.save()
+        request = request_factory.get(reverse('trainings-home'))
+        request.user = relation.runner
+
+        response = home(request)
+
+        assert response.url == reverse(url)
+
+
 class TestCreateTrainingView:
     def test_has_training(self, setup_db: List[Relation], request_factory: RequestFactory):
         t1 = Training.objects.create(relation=setup_db[0], date=DATE, description='description')
@@ -46,17 +66,16 @@ class TestCreateTrainingView:
                                              'date': '30.09.2019',
                                              'description': 'new_description',
                                              'force': 'True',
-                                             'visible_since': ''})
+                                             'visible_since': '2019-09-23'})
         request.user = setup_db[0].coach
         view = TrainingCreateView.as_view()
 
         with patch('trainings.views.messages'):
             view(request)
 
-        assert Training.objects.filter(relation__runner=runners[0], relation__coach=setup_db[0].coach,
-                                       date=DATE).get().description == 'new_description'
-        assert Training.objects.filter(relation__runner=runners[1], relation__coach=setup_db[1].coach,
-                                       date=DATE).get().description == 'new_description'
+        for relation in setup_db:
+            training = Training.objects.get(relation=relation, date=DATE)
+            assert (training.description, training.visible_since) == ('new_description', DATE - 7 * DAY)
 
     def test_force_true(self, setup_db: List[Relation], request_factory: RequestFactory):
         Training.objects.create(relation=setup_db[0], date=DATE, description='description')
@@ -74,6 +93,45 @@ class TestCreateTrainingView:
 
         assert response.context_data['form'].data['force'] is True
 
+    def test_results(self, setup_db: List[Relation], request_factory: RequestFactory):
+        Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+        request = request_factory.post(reverse('trainings-create'),
+                                       data={'runners': [relation.runner.username for relation in setup_db],
+                                             'date': '2019-09-30',
+                                             'description': 'new_description',
+                                             'force': 'True',
+                                             'visible_since': ''})
+        request.user = setup_db[0].coach
+
+        with patch('trainings.views.messages'):
+            response: TemplateResponse = TrainingCreateView.as_view()(request)
+
+        assert sorted(response.context_data['results']) == sorted([
+            (setup_db[0].displayed_name, AssignmentStatus.UPDATED),
+            (setup_db[1].displayed_name, AssignmentStatus.CREATED)])
+
+    def test_concurrent_training(self, setup_db: List[Relation], request_factory: RequestFactory):
+        def prepare(*args):
+            assignment = prepare_assignment(*args)
+            if not Training.objects.exists():
+                # added by another request after the conflicts were checked
+                Training.objects.create(relation=setup_db[0], date=DATE, description='description')
+            return assignment
+
+        request = request_factory.post(reverse('trainings-create'),
+                                       data={'runners': [setup_db[0].runner.username],
+                                             'date': '2019-09-30',
+                                             'description': 'new_description',
+                                             'force': 'False',
+                                             'visible_since': ''})
+        request.user = setup_db[0].coach
+
+        with patch('trainings.views.messages'), patch('trainings.views.prepare_assignment', prepare):
+            response: TemplateResponse = TrainingCreateView.as_view()(request)
+
+        assert [training.description for training in response.context_data['has_training']] == ['description']
+        assert response.context_data['form'].data['force'] is True
+
     def test_get_runner(self, setup_db: List[Relation], request_factory: RequestFactory):
         request = request_factory.get(f"{reverse('trainings-create')}?runner={setup_db[0].runner.username}")
         request.user = setup_db[0].coach
@@ -175,6 +233,156 @@ class TestTrainingListView:
         assert queryset[5].date == SOME_MONDAY + 5 * DAY and queryset[1].pk is None
         assert queryset[6].date == SOME_MONDAY + 6 * DAY and queryset[1].pk is None
 
+    def test_query_count(self, relation: Relation, request_factory: RequestFactory, django_assert_num_queries):
+        relation.status = RelationStatus.ESTABLISHED
+        relation.save()
+        for i in range(3):
+            Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + i * DAY)
+        request = request_factory.get(reverse('trainings-list-entry', kwargs={'runner': relation.runner.username,
+                                                                              'date': SOME_MONDAY}))
+        request.user = relation.coach
+        view = TrainingListView.as_view()
+
+        with django_assert_num_queries(4):
+            response: TemplateResponse = view(request, runner=relation.runner.username, date=str(SOME_MONDAY))
+            response.render()
+
+        assert response.context_data['object'].date == SOME_MONDAY
+
+
+class TestTrainingListSpans:
+    @pytest.fixture(autouse=True)
+    def setup(self, relation: Relation):
+        relation.status = RelationStatus.ESTABLISHED
+        relation.save()
+
+    def get(self, relation: Relation, request_factory: RequestFactory, query: str) -> TemplateResponse:
+        request = request_factory.get(f"{reverse('trainings-list', kwargs={'runner': relation.runner.username})}"
+                                      f"?date=2019-09-11{query}")
+        request.user = relation.coach
+        response = TrainingListView.as_view()(request, runner=relation.runner.username)
+        response.render()
+        return response
+
+    def test_month(self, relation: Relation, request_factory: RequestFactory):
+        response = self.get(relation, request_factory, '&span=month')
+
+        object_list = response.context_data['object_list']
+        assert object_list[0].date == datetime.date(2019, 8, 26)
+        assert object_list[-1].date == datetime.date(2019, 10, 6)
+        assert len(response.context_data['weeks']) == 6
+        assert response.context_data['previous_week'] == datetime.date(2019, 8, 1)
+        assert response.context_data['next_week'] == datetime.date(2019, 10, 1)
+
+    def test_weeks(self, relation: Relation, request_factory: RequestFactory):
+        response = self.get(relation, request_factory, '&weeks=3')
+
+        object_list = response.context_data['object_list']
+        assert object_list[0].date == datetime.date(2019, 9, 9)
+        assert len(object_list) == 21
+        assert response.context_data['next_week'] == datetime.date(2019, 9, 30)
+        assert response.context_data['span_query'] == '&weeks=3'
+
+    @pytest.mark.parametrize('weeks', [1, 4, 26])
+    def test_constant_query_count(self, weeks: int, relation: Relation, request_factory: RequestFactory,
+                                  django_assert_num_queries):
+        monday = datetime.date(2019, 9, 9)
+        Training.objects.bulk_create(
+            [Training(relation=relation, date=monday + i * DAY, description='description') for i in range(7 * weeks)])
+
+        with django_assert_num_queries(4):
+            response = self.get(relation, request_factory, f'&weeks={weeks}')
+
+        assert all(training.pk for training in response.context_data['object_list'])
+
+    def test_cached_weeks(self, relation: Relation, request_factory: RequestFactory, django_assert_num_queries):
+        training = Training.objects.create(relation=relation, date=datetime.date(2019, 9, 10), description='first')
+        self.get(relation, request_factory, '&weeks=2')
+        training.description = 'second'
+        training.save()
+        self.get(relation, request_factory, '&weeks=2')
+
+        with django_assert_num_queries(3):
+            response = self.get(relation, request_factory, '&weeks=2')
+
+        assert 'second' in response.content.decode() and 'first' not in response.content.decode()
+
+
+class TestTrainingListConditional:
+    @pytest.fixture(autouse=True)
+    def setup(self, relation: Relation):
+        relation.status = RelationStatus.ESTABLISHED
+        relation.save()
+        self.training = Training.objects.create(relation=relation, description='description', date=SOME_MONDAY)
+
+    def get(self, relation: Relation, request_factory: RequestFactory, **headers):
+        request = request_factory.get(reverse('trainings-entry-runner', kwargs={'date': str(SOME_MONDAY)}),
+                                      **headers)
+        request.user = relation.runner
+        return TrainingListViewRunner.as_view()(request, date=str(SOME_MONDAY))
+
+    def test_not_modified(self, relation: Relation, request_factory: RequestFactory, django_assert_num_queries):
+        etag = self.get(relation, request_factory).render()['ETag']
+
+        with django_assert_num_queries(3):
+            response = self.get(relation, request_factory, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_modified(self, relation: Relation, request_factory: RequestFactory):
+        etag = self.get(relation, request_factory).render()['ETag']
+        self.training.execution = 'execution'
+        self.training.save()
+
+        response = self.get(relation, request_factory, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_deleted_since(self, relation: Relation, request_factory: RequestFactory):
+        training = Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + DAY)
+        last_modified = self.get(relation, request_factory).render()['Last-Modified']
+        with freeze_time(timezone.now() + datetime.timedelta(minutes=1)):
+            training.delete()
+
+            response = self.get(relation, request_factory, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 200
+        assert response['Last-Modified'] != last_modified
+
+    def test_other_span(self, relation: Relation, request_factory: RequestFactory):
+        etag = self.get(relation, request_factory).render()['ETag']
+        Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + 7 * DAY)
+
+        response = self.get(relation, request_factory, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+
+class TestTeamBoardView:
+    def test_get(self, setup_db: List[Relation], request_factory: RequestFactory):
+        training = Training.objects.create(relation=setup_db[1], date=SOME_MONDAY, description='description')
+        request = request_factory.get(f"{reverse('trainings-board')}?date={SOME_MONDAY}")
+        request.user = setup_db[0].coach
+        view = TeamBoardView.as_view()
+
+        response: TemplateResponse = view(request)
+        response.render()
+
+        board = response.context_data['board']
+        assert board.monday == SOME_MONDAY
+        assert board.rows[1].days[0] == training
+
+
+    def test_next_cursor_encoded(self, setup_db: List[Relation], request_factory: RequestFactory):
+        request = request_factory.get(f"{reverse('trainings-board')}?date={SOME_MONDAY}")
+        request.user = setup_db[0].coach
+
+        with patch('trainings.views.resolve_board', return_value=Board(SOME_MONDAY, [], 'runner+1@users.com')):
+            response = TeamBoardView.as_view()(request).render()
+
+        assert b'after=runner%2B1%40users.com' in response.content
 
 class TestTrainingUpdateView:
     def test_initial_date(self, relation: Relation, request_factory: RequestFactory):
@@ -243,13 +451,13 @@ class TestTrainingListViewRunner:
             reverse('trainings-entry-runner', kwargs={'date': SOME_MONDAY.strftime('%Y-%m-%d')}))
         request.user = relation.runner
         view = TrainingListViewRunner()
-        view.fill_week = Mock()
         view.setup(request)
         view.get_date()
 
         view.get_queryset()
 
-        view.fill_week.assert_called_once_with(ANY, relation)
+        assert view.calendar.relation == relation
+        assert all(day.relation == relation for day in view.calendar.days)
 
 
 class TestTrainingUpdateViewRunner:
@@ -295,3 +503,145 @@ class TestTrainingListMixin:
         date = mixin.get_date()
 
         assert date == datetime.date(2018, 12, 31)
+
+
+class TestCalendarFeedView:
+    @pytest.fixture(autouse=True)
+    def setup(self, relation: Relation):
+        relation.status = RelationStatus.ESTABLISHED
+        relation.save()
+        Training.objects.create(relation=relation, description='description', date=SOME_MONDAY)
+
+    def get(self, feed: CalendarFeed, request_factory: RequestFactory, **headers):
+        request = request_factory.get(feed.get_absolute_url(), **headers)
+        request.user = AnonymousUser()
+        return CalendarFeedView.as_view()(request, token=feed.token)
+
+    def test_runner(self, relation: Relation, request_factory: RequestFactory):
+        response = self.get(CalendarFeed.get_for(relation.runner), request_factory)
+
+        content = b''.join(response.streaming_content).decode()
+        assert response['Content-Type'] == 'text/calendar; charset=utf-8'
+        assert 'SUMMARY:description' in content
+
+    def test_coach(self, relation: Relation, request_factory: RequestFactory):
+        response = self.get(CalendarFeed.get_for(relation.coach, relation), request_factory)
+
+        assert f'X-WR-CALNAME:{relation.runner.username}' in b''.join(response.streaming_content).decode()
+
+    def test_revoked(self, relation: Relation, request_factory: RequestFactory):
+        feed = CalendarFeed.get_for(relation.coach, relation)
+        relation.status = RelationStatus.REVOKED
+        relation.save()
+
+        with pytest.raises(Http404):
+            self.get(feed, request_factory)
+
+    def test_not_modified(self, relation: Relation, request_factory: RequestFactory, django_assert_num_queries):
+        feed = CalendarFeed.get_for(relation.runner)
+        etag = self.get(feed, request_factory)['ETag']
+
+        with django_assert_num_queries(3):
+            response = self.get(feed, request_factory, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_modified(self, relation: Relation, request_factory: RequestFactory):
+        feed = CalendarFeed.get_for(relation.runner)
+        etag = self.get(feed, request_factory)['ETag']
+        Training.objects.create(relation=relation, description='description', date=SOME_MONDAY + DAY)
+
+        assert self.get(feed, request_factory, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_deleted_since(self, relation: Relation, request_factory: RequestFactory):
+        feed = CalendarFeed.get_for(relation.coach, relation)
+        last_modified = self.get(feed, request_factory)['Last-Modified']
+        with freeze_time(timezone.now() + datetime.timedelta(minutes=1)):
+            Training.objects.get(relation=relation).delete()
+
+            assert self.get(feed, request_factory, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 200
+
+
+class TestCalendarFeedLinkView:
+    def test_reset(self, relation: Relation, client):
+        relation.status = RelationStatus.ESTABLISHED
+        relation.save()
+        client.force_login(relation.coach)
+        url = reverse('trainings-feed-coach', kwargs={'runner': relation.runner.username})
+        old = client.get(url).context['feed_url']
+
+        client.post(url)
+
+        new = client.get(url).context['feed_url']
+        assert new != old
+        assert client.get(old).status_code == 404
+        assert client.get(new).status_code == 200
+
+
+    def test_anonymous(self, client):
+        response = client.get(reverse('trainings-feed-runner'))
+
+        assert response.status_code == 302
+        assert response.url.startswith(reverse('users-login'))
+
+class TestTrainingImportView:
+    def test_import(self, setup_db: List[Relation], client):
+        client.force_login(setup_db[0].coach)
+        upload = SimpleUploadedFile('plan.csv', f'runner,date,description\n{setup_db[0].runner.username},'
+                                                f'{SOME_MONDAY},zażółć\n'.encode())
+
+        response = client.post(reverse('trainings-import'), {'file': upload})
+
+        assert response.context['plan'].created == 1
+        assert Training.objects.get().description == 'zażółć'
+
+    def test_dry_run(self, setup_db: List[Relation], client):
+        client.force_login(setup_db[0].coach)
+        upload = SimpleUploadedFile('plan.csv', f'runner,date,description\nunknown,{SOME_MONDAY},x\n'.encode())
+
+        response = client.post(reverse('trainings-import'), {'file': upload, 'dry_run': 'on'})
+
+        assert response.context['errors'] == [(2, "no runner 'unknown'")]
+        assert not Training.objects.exists()
+
+
+    def test_invalid_encoding(self, setup_db: List[Relation], client):
+        client.force_login(setup_db[0].coach)
+        # the first row is valid, the invalid bytes come after it
+        upload = SimpleUploadedFile('plan.csv', f'runner,date,description\n{setup_db[0].runner.username},'
+                                                f'{SOME_MONDAY},x\n'.encode() + 'zażółć\n'.encode('cp1250'))
+
+        response = client.post(reverse('trainings-import'), {'file': upload})
+
+        assert response.context['form'].errors == {'file': ['File should be encoded in UTF-8']}
+        assert not Training.objects.exists()
+
+class TestTrainingSearchView:
+    def test_get(self, setup_db: List[Relation], client):
+        training = Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='10x400m')
+        client.force_login(setup_db[0].coach)
+
+        response = client.get(reverse('trainings-search'), {'q': '10x400'})
+
+        assert response.context['trainings'] == [training]
+        assert not response.context['has_next']
+
+    def test_page_clamped(self, setup_db: List[Relation], client):
+        client.force_login(setup_db[0].coach)
+
+        response = client.get(reverse('trainings-search'), {'q': 'tempo', 'page': str(10 ** 20)})
+
+        assert response.status_code == 200
+        assert response.context['page'] == MAX_SEARCH_OFFSET // SEARCH_PAGE_SIZE + 1
+
+
+class TestComplianceView:
+    def test_get(self, setup_db: List[Relation], client):
+        Training.objects.create(relation=setup_db[0], date=SOME_MONDAY, description='description')
+        client.force_login(setup_db[0].coach)
+
+        response = client.get(reverse('trainings-compliance'), {'date': str(SOME_MONDAY)})
+
+        assert response.context['mondays'][0] == SOME_MONDAY
+        assert response.context['rows'][0].planned == 1
+        assert b'0/1' in response.content
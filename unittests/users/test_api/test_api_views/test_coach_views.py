@@ -1,9 +1,10 @@
 from json import loads
 from typing import List
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.reverse import reverse
 from rest_framework.test import APIRequestFactory
 
@@ -35,6 +36,17 @@ class TestRunnerListView:
         for relation in setup_db:
             assert relation in queryset
 
+    def test_get_queryset_sparse_fields(self, setup_db: List[Relation], api_factory: APIRequestFactory):
+        request = Request(api_factory.get(f"{reverse('users-api-runners')}?fields=runner_name,nickname"))
+        request.user = setup_db[0].coach
+        view = RunnerListView()
+        view.setup(request)
+
+        queryset = view.get_queryset()
+
+        assert queryset[0].get_deferred_fields() == {'coach_id', 'status', 'updated_at'}
+        assert queryset[0].runner.username == setup_db[0].runner.username
+
     @pytest.mark.usefixtures('transactional_db')
     def test_default_pagination(self, api_factory: APIRequestFactory):
         coach = User.objects.create(username='coach', email='coach@users.com', is_coach=True)
@@ -43,10 +55,10 @@ class TestRunnerListView:
             Relation.objects.create(runner=runner, coach=coach)
         request = api_factory.get(f"{reverse('users-api-runners')}?limit={20}&offset={20}")
         request._user = coach
-        RunnerListView.permission_classes = []
         view = RunnerListView.as_view()
 
-        result = view(request)
+        with patch.object(RunnerListView, 'permission_classes', []):
+            result = view(request)
 
         json_response = loads(result.rendered_content)
         assert json_response['count'] == 60
@@ -57,12 +69,12 @@ class TestRunnerListView:
     def test_create(self, runner: User, coach: User, api_factory: APIRequestFactory):
         request = api_factory.post(reverse('users-api-runners'), data={'runner': runner.username})
         request.user = coach
-        RunnerListView.permission_classes = []
         serializer_mock = Mock()
-        RunnerListView.get_serializer_class = serializer_mock
         view = RunnerListView.as_view()
 
-        view(request)
+        with patch.object(RunnerListView, 'permission_classes', []), \
+                patch.object(RunnerListView, 'get_serializer_class', serializer_mock):
+            view(request)
 
         serializer_mock()().save.assert_called()
 
@@ -79,12 +91,12 @@ class TestRunnerDetailView:
         request = api_factory.patch(reverse('users-api-runner-profile', kwargs={'pk': relation.runner_id}),
                                     data={'nickname': 'new_nickname'})
         request.user = relation.coach
-        RunnerDetailView.permission_classes = []
         serializer_mock = Mock()
         serializer_mock.is_valid.return_value = True
-        RunnerDetailView.serializer_class = serializer_mock
         view = RunnerDetailView.as_view()
 
-        view(request, pk=relation.pk)
+        with patch.object(RunnerDetailView, 'permission_classes', []), \
+                patch.object(RunnerDetailView, 'serializer_class', serializer_mock):
+            view(request, pk=relation.pk)
 
         serializer_mock().save.assert_called()
@@ -0,0 +1,105 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from users.authentication import CachedTokenAuthentication, TokenCache, shared_key, token_cache
+from users.models import User
+
+
+@pytest.fixture
+def token(coach: User) -> Token:
+    return Token.objects.create(user=coach)
+
+
+class TestCachedTokenAuthentication:
+    def test_cached(self, token: Token, django_assert_num_queries):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        with django_assert_num_queries(0):
+            user, auth = authentication.authenticate_credentials(token.key)
+
+        assert user == token.user and auth == token
+        assert token_cache.stats()['local_hits'] == 1
+        assert token_cache.stats()['misses'] == 1
+
+    def test_shared(self, token: Token, django_assert_num_queries):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+        token_cache.local.clear()
+
+        with django_assert_num_queries(0):
+            user, _ = authentication.authenticate_credentials(token.key)
+
+        assert user == token.user
+        assert token_cache.stats()['shared_hits'] == 1
+
+    def test_user_values(self, token: Token):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        user, _ = authentication.authenticate_credentials(token.key)
+
+        assert token.user.password not in cache.get(shared_key(token.key))
+        assert 'password' in user.get_deferred_fields()
+        assert (user.username, user.is_coach) == (token.user.username, True)
+
+    def test_revoked_in_other_process(self, token: Token):
+        other = TokenCache()
+        other.set(token.key, token)
+        assert other.get(token.key) is not None
+
+        token_cache.invalidate([token.key])
+
+        assert other.get(token.key) is None
+        assert other.stats()['local_hits'] == 1
+
+    def test_not_shared_between_requests(self, token: Token):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        first, _ = authentication.authenticate_credentials(token.key)
+        second, _ = authentication.authenticate_credentials(token.key)
+
+        assert first == second and first is not second
+
+    def test_lru(self, coach: User, runner: User, monkeypatch):
+        monkeypatch.setattr(token_cache, 'size', 1)
+        tokens = [Token.objects.create(user=coach), Token.objects.create(user=runner)]
+        authentication = CachedTokenAuthentication()
+
+        for token in tokens:
+            authentication.authenticate_credentials(token.key)
+
+        assert list(token_cache.local) == [tokens[1].key]
+
+    def test_deleted(self, token: Token):
+        authentication = CachedTokenAuthentication()
+        key = token.key
+        authentication.authenticate_credentials(key)
+
+        token.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            authentication.authenticate_credentials(key)
+
+    def test_user_changed(self, token: Token):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+        token.user.is_active = False
+        token.user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authentication.authenticate_credentials(token.key)
+
+    def test_logout(self, token: Token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        assert client.get(reverse('trainings-api-board')).status_code == 200
+
+        client.post(reverse('rest_logout'))
+
+        assert client.get(reverse('trainings-api-board')).status_code == 401
@@ -4,7 +4,7 @@ from rest_framework.reverse import reverse
 from rest_framework.test import APIRequestFactory
 
 from users.models import Relation, RelationStatus, User
-from users.serializers.relation_serializer import RelationSerializer
+from users.serializers.relation_serializer import CompactRelationSerializer, RelationSerializer
 
 
 class TestRelationSerializer:
@@ -88,3 +88,19 @@ class TestRelationSerializer:
         serializer = RelationSerializer(instance=relation, context={'request': request})
 
         serializer.validate_nickname('new_nickname')
+
+
+class TestCompactRelationSerializer:
+    def test_serialize(self, relation: Relation, api_factory: APIRequestFactory):
+        request = api_factory.get('/')
+        serializer = CompactRelationSerializer(instance=relation, context={'request': request})
+
+        assert serializer.data == {
+            'id': relation.id,
+            'url': 'http://testserver' + reverse('users-api-runner-profile', kwargs={'pk': relation.id}),
+            'runner': relation.runner_id,
+            'runner_name': relation.runner.username,
+            'status': relation.status,
+            'trainings': 'http://testserver' + reverse('users-api-runner-trainings', kwargs={'pk': relation.id}),
+            'nickname': relation.nickname,
+        }
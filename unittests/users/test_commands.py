@@ -0,0 +1,179 @@
+import datetime
+from io import StringIO
+from typing import Optional
+
+import pytest
+from django.core.management import call_command
+from freezegun import freeze_time
+
+from trainings.models import Training
+from users.models import Relation, RelationStatus, User
+
+
+def generate(**options) -> str:
+    out = StringIO()
+    options = {'seed': 1, **options}
+    call_command('generate', coaches=3, runners=20, days=30, end=datetime.date(2019, 9, 30), stdout=out, **options)
+    return out.getvalue()
+
+
+def snapshot() -> list:
+    return [list(Relation.objects.order_by('runner__username', 'coach__username')
+                 .values_list('runner__username', 'coach__username', 'status')),
+            list(Training.objects.order_by('relation__runner__username', 'date')
+                 .values_list('relation__runner__username', 'date', 'description', 'execution'))]
+
+
+@pytest.mark.django_db
+class TestGenerate:
+    def test_generated(self):
+        out = generate(batch_size=7, chunk_size=50)
+
+        assert User.objects.filter(is_coach=True).count() == 3
+        assert User.objects.filter(is_runner=True).count() == 20
+        assert Relation.objects.filter(status=RelationStatus.ESTABLISHED).exists()
+        assert not Training.objects.exclude(relation__status=RelationStatus.ESTABLISHED).exists()
+        assert Training.objects.exclude(execution=None).exists()
+        assert 'rows/s' in out
+
+    def test_deterministic(self):
+        generate()
+        first = snapshot()
+        User.objects.all().delete()
+
+        generate()
+
+        assert snapshot() == first
+
+    def test_seed(self):
+        generate()
+        first = snapshot()
+        User.objects.all().delete()
+
+        generate(prefix='other')
+
+        assert [row[2:] for row in snapshot()[1]] == [row[2:] for row in first[1]]
+
+    def test_other_seed(self):
+        generate()
+        first = snapshot()
+        User.objects.all().delete()
+
+        generate(seed=2)
+
+        assert snapshot() != first
+
+    def test_future_end(self):
+        with freeze_time('2019-09-01'):
+            generate()
+        first = snapshot()
+        User.objects.all().delete()
+
+        with freeze_time('2019-09-20'):
+            generate()
+
+        assert snapshot() == first
+        assert Training.objects.filter(date__gt='2019-09-01').exclude(execution=None).exists()
+        assert not Training.objects.filter(date='2019-09-30').exclude(execution=None).exists()
+
+    @freeze_time('2019-09-30')
+    def test_end_today(self):
+        call_command('generate', coaches=1, runners=5, days=3, stdout=StringIO())
+
+        assert Training.objects.latest('date').date == datetime.date(2019, 9, 30)
+
+
+FILL = """coach coach
+runner runner1
+runner runner2
+relation runner1-coach-0
+relation runner2-coach-1
+training runner1-coach-2019.09.30-easy run - 8km
+training runner1-coach-2019.10.01-tempo
+"""
+
+
+def fill(tmp_path, content: str, *args, out: Optional[StringIO] = None) -> StringIO:
+    path = tmp_path / 'fill.txt'
+    path.write_text(content)
+    err = StringIO()
+    call_command('fill', str(path), *args, batch_size=2, stdout=out or StringIO(), stderr=err)
+    return err
+
+
+@pytest.mark.django_db
+class TestFill:
+    def test_loaded(self, tmp_path):
+        err = fill(tmp_path, FILL)
+
+        assert not err.getvalue()
+        assert list(Relation.objects.order_by('runner__username').values_list('runner__username', 'status')) == \
+            [('runner1', RelationStatus.ESTABLISHED), ('runner2', RelationStatus.INVITED_BY_COACH)]
+        assert list(Training.objects.order_by('date').values_list('date', 'description')) == \
+            [(datetime.date(2019, 9, 30), 'easy run - 8km'), (datetime.date(2019, 10, 1), 'tempo')]
+        assert User.objects.get(username='runner1').check_password('testing321')
+
+    def test_replaces(self, tmp_path, relation: Relation):
+        fill(tmp_path, FILL)
+
+        assert not User.objects.filter(pk=relation.runner_id).exists()
+
+    def test_append(self, tmp_path):
+        fill(tmp_path, FILL)
+        out = StringIO()
+
+        err = fill(tmp_path, 'runner runner3\nrelation runner3-coach-0\ntraining runner2-coach-2019.09.30-long run\n'
+                             'training runner1-coach-2019.09.30-other\n', '--append', out=out)
+
+        assert not err.getvalue()
+        # the training of runner1 already existed
+        assert out.getvalue().startswith('3 rows')
+        assert User.objects.count() == 4
+        assert Relation.objects.filter(runner__username='runner3', coach__username='coach').exists()
+        assert Training.objects.get(relation__runner__username='runner2').description == 'long run'
+        assert Training.objects.get(relation__runner__username='runner1', date='2019-09-30').description == \
+            'easy run - 8km'
+
+    def test_errors(self, tmp_path):
+        err = fill(tmp_path, FILL + 'runner runner1\nrelation runner9-coach-0\nrelation runner1-coach-7\n'
+                                    'training runner2-coach-30.09.2019-x\ntraining runner1-coach-2019.09.30-x\n'
+                                    'swim x\n')
+
+        lines = err.getvalue().splitlines()
+        assert lines[0] == '6 lines skipped:'
+        assert [line.split(':')[0].strip() for line in lines[1:]] == [f'line {number}' for number in range(8, 14)]
+        assert Training.objects.count() == 2
+
+    def test_email_taken(self, tmp_path):
+        fill(tmp_path, FILL)
+        User.objects.create(username='other', email='runner3@users.com')
+
+        err = fill(tmp_path, 'runner runner3\nrunner runner4\n', '--append')
+
+        assert err.getvalue().splitlines()[1] == "  line 1: email 'runner3@users.com' is already taken"
+        assert User.objects.filter(username='runner4').exists()
+
+
+@pytest.mark.django_db
+class TestImportUsers:
+    def test_imported(self, tmp_path, runner: User):
+        path = tmp_path / 'users.csv'
+        path.write_text('username,email,password,role\n'
+                        'athlete1,athlete1@users.com,secret123,runner\n'
+                        'club,club@users.com,secret456,coach\n'
+                        'bad name,bad@users.com,secret,runner\n'
+                        f'{runner.username},other@users.com,secret,runner\n'
+                        'athlete2,athlete1@users.com,secret,runner\n'
+                        'athlete3,athlete3@users.com,,runner\n'
+                        'athlete4,athlete4@users.com,secret,swimmer\n')
+        out, err = StringIO(), StringIO()
+
+        call_command('import_users', str(path), workers=2, batch_size=2, stdout=out, stderr=err)
+
+        assert User.objects.get(username='athlete1').check_password('secret123')
+        assert User.objects.get(username='athlete1').is_runner
+        assert User.objects.get(username='club').is_coach
+        assert User.objects.count() == 3
+        assert '2 users' in out.getvalue()
+        assert [line.split(':')[0].strip() for line in err.getvalue().splitlines()[1:]] == \
+            [f'line {number}' for number in range(4, 9)]
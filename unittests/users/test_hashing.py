@@ -0,0 +1,23 @@
+from django.contrib.auth.hashers import check_password, get_hasher
+
+from users.hashing import ParallelHasher
+
+
+class TestParallelHasher:
+    def test_parallel(self):
+        with ParallelHasher(2) as hasher:
+            hashes = hasher.hash(['password1', 'password2', 'password3'])
+
+        assert [check_password(f'password{i}', encoded) for i, encoded in enumerate(hashes, 1)] == [True] * 3
+        assert all(encoded.startswith(get_hasher().algorithm) for encoded in hashes)
+
+    def test_serial(self):
+        with ParallelHasher(1) as hasher:
+            assert hasher.executor is None
+            assert check_password('password', hasher.hash(['password'])[0])
+
+    def test_workers_setting(self, settings):
+        settings.PASSWORD_HASHING_WORKERS = 3
+
+        with ParallelHasher() as hasher:
+            assert hasher.workers == 3
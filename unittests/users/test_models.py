@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from django.db import IntegrityError
 from django.urls import reverse
@@ -42,6 +44,32 @@ class TestUser:
     def test_hes_been_invited_negative(self, runner: User, coach: User):
         assert runner.has_been_invited(coach) is False
 
+    @pytest.mark.usefixtures('relation')
+    def test_relationships_loaded_once(self, runner: User, coach: User, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert runner.has_coach() is False
+            assert runner.has_been_invited(coach) is True
+            assert runner.coaches == [coach]
+
+    def test_relationships_invalidated(self, runner: User, coach: User):
+        assert runner.has_coach() is False
+        relation = Relation.objects.create(runner_id=runner.pk, coach=coach, status=RelationStatus.ESTABLISHED)
+        assert runner.has_coach() is False
+
+        runner.invalidate_relationships()
+
+        assert runner.has_coach() is True
+        relation.runner = runner
+        relation.status = RelationStatus.REVOKED
+        relation.save()
+        assert runner.has_coach() is False
+
+    def test_relationships_not_pickled(self, runner: User):
+        runner.has_coach()
+
+        assert '_relationships' not in pickle.loads(pickle.dumps(runner)).__dict__
+        assert '_relationships' in runner.__dict__
+
 
 class TestRelation:
     def test_str(self, runner: User, coach: User):
@@ -1,17 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Type
 from unittest.mock import Mock, patch
 
 import pytest
 from django.core.exceptions import PermissionDenied
+from django.db import connection
 from django.http import Http404, HttpRequest
 from django.template.response import TemplateResponse
-from django.test import RequestFactory
+from django.test import Client, RequestFactory
 from django.urls import reverse
 from django.views.generic import DeleteView
 
 from users.models import Relation, RelationStatus, User
 from users.views import AcceptInviteView, DoesntHaveTrainerMixin, InviteListView, RunnerDeleteView, RunnerDetailView, \
-    RunnerListView, UserIsCoachMixin, UserIsRunnerMixin
+    RunnerListView, RunnerProfileView, UserIsCoachMixin, UserIsRunnerMixin
 
 
 class TestRunnerListView:
@@ -119,6 +121,40 @@ class TestRunnerListView:
         assert messages.warning.callled()
 
 
+class TestRunnerProfileView:
+    def test_state_per_instance(self):
+        first = RunnerProfileView()
+        second = RunnerProfileView()
+
+        assert first.form_classes is not second.form_classes
+        assert first.forms_valid_func['invite'] == first.invite_form_valid
+        assert RunnerProfileView.form_classes == {}
+
+    def test_concurrent_requests(self, runner: User):
+        client = Client()
+        client.force_login(runner)
+        cookies = client.cookies
+
+        def post(i: int) -> str:
+            thread_client = Client()
+            thread_client.cookies = cookies
+            try:
+                if i % 2:
+                    # invalid password change, its data must not be bound to forms of other requests
+                    data = {'action': 'change_password', 'new_password1': f'password{i}', 'new_password2': 'other'}
+                else:
+                    data = {'action': 'invite', 'runner': ''}
+                return thread_client.post(reverse('users-profile'), data=data).content.decode()
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(post, range(80)))
+
+        # each response only shows the errors of the form it submitted
+        assert all(response.count('errorlist') == 1 for response in responses)
+
+
 class TestRunnerDetailView:
 
     def test_only_established(self, coach: User, request_factory: RequestFactory):
@@ -214,10 +250,10 @@ class TestRunnerDeleteView:
         request: HttpRequest = request_factory.post(
             reverse('users-runners-delete', kwargs={'runner': relation.runner.username}))
         request.user = relation.coach
-        RunnerDeleteView.post = DeleteView.post
         view = RunnerDeleteView.as_view()
 
-        view(request, runner=relation.runner.username)
+        with patch.object(RunnerDeleteView, 'post', DeleteView.post):
+            view(request, runner=relation.runner.username)
 
         assert not Relation.objects.filter(id=relation.id).exists()
 
@@ -243,13 +279,24 @@ class TestAcceptInviteView:
         request.user = relation.runner
         view = AcceptInviteView.as_view()
         get_object_mock = Mock()
-        AcceptInviteView.get_object = get_object_mock
 
-        with patch('users.views.messages'):
+        with patch.object(AcceptInviteView, 'get_object', get_object_mock), patch('users.views.messages'):
             view(request, coach=relation.coach.username)
 
         get_object_mock().save.assert_called()
 
+    def test_post_invalidates_relationships(self, relation: Relation, request_factory: RequestFactory):
+        request = request_factory.post(reverse('users-invites-accept', kwargs={'coach': relation.coach.username}))
+        request.user = User.objects.get(pk=relation.runner.pk)
+        assert request.user.has_coach() is False
+        view = AcceptInviteView.as_view()
+
+        with patch.object(AcceptInviteView, 'get_object', lambda self: Relation.objects.get(pk=relation.pk)), \
+                patch('users.views.messages'):
+            view(request, coach=relation.coach.username)
+
+        assert request.user.has_coach() is True
+
 
 class TestInviteListView:
     @pytest.mark.usefixtures('transactional_db')
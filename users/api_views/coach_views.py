@@ -2,24 +2,46 @@ from rest_framework.filters import OrderingFilter
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from training_calendar.sparse_fields import SparseFieldsViewMixin
+from training_calendar.utils import is_compact
 from users.models import Relation
 from users.permissions import IsCoachPermission
-from users.serializers.relation_serializer import RelationSerializer
+from users.serializers.relation_serializer import CompactRelationSerializer, RelationSerializer
 
+RELATION_FIELD_COLUMNS = {'id': [], 'url': [], 'trainings': [], 'runner': ['runner'],
+                          'runner_name': ['runner__username'], 'status': ['status'], 'nickname': ['nickname']}
 
-class RunnerListView(ListCreateAPIView):
+
+class RunnerListView(SparseFieldsViewMixin, ListCreateAPIView):
     permission_classes = [IsAuthenticated, IsCoachPermission]
     queryset = Relation.objects.all()
     filter_backends = [OrderingFilter]
     ordering_fields = ['username']
     serializer_class = RelationSerializer
+    sparse_field_columns = RELATION_FIELD_COLUMNS
+    sparse_required_columns = ['runner__username']
 
     def get_queryset(self):
-        return super().get_queryset().filter(coach=self.request.user)
+        return self.sparse_queryset(super().get_queryset().filter(coach=self.request.user).select_related('runner'))
 
+    def get_serializer_class(self):
+        if is_compact(self.request):
+            return CompactRelationSerializer
+        return super().get_serializer_class()
 
-class RunnerDetailView(RetrieveUpdateDestroyAPIView):
-    queryset = Relation.objects.all()
+
+class RunnerDetailView(SparseFieldsViewMixin, RetrieveUpdateDestroyAPIView):
+    queryset = Relation.objects.select_related('runner', 'coach')
     lookup_url_kwarg = 'pk'
     serializer_class = RelationSerializer
     permission_classes = [IsAuthenticated, IsCoachPermission]
+    sparse_field_columns = RELATION_FIELD_COLUMNS
+    sparse_required_columns = ['runner__username', 'coach__id']
+
+    def get_queryset(self):
+        return self.sparse_queryset(super().get_queryset())
+
+    def get_serializer_class(self):
+        if is_compact(self.request):
+            return CompactRelationSerializer
+        return super().get_serializer_class()
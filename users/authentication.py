@@ -0,0 +1,148 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from users.models import User
+
+LOCAL_SIZE = 1024
+LOCAL_TTL = 30
+SHARED_TTL = 5 * 60
+REVOCATIONS_KEY = 'users:token:revocations'
+# what authentication and permission checks read, the rest of the user (password included) is never cached
+USER_FIELDS = [field.attname for field in User._meta.concrete_fields
+               if field.attname in {'id', 'username', 'is_active', 'is_staff', 'is_superuser', 'is_runner', 'is_coach'}]
+
+
+def shared_key(key: str) -> str:
+    # raw tokens are credentials, they are not written to the cache
+    return f'users:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def token_entry(token: Token) -> tuple:
+    return (token.created, *(getattr(token.user, field) for field in USER_FIELDS))
+
+
+def token_from_entry(key: str, entry: tuple) -> Token:
+    """Token with a user holding only USER_FIELDS, other fields are loaded from the database when accessed"""
+    created, *values = entry
+    user = User.from_db('default', USER_FIELDS, values)
+    token = Token.from_db('default', ['key', 'user_id', 'created'], [key, user.pk, created])
+    token.user = user
+    return token
+
+
+def revocations() -> int:
+    """Shared number of invalidations, local entries cached under an older one are dropped"""
+    version = cache.get(REVOCATIONS_KEY)
+    if version is None:
+        # a lost counter starts from the current time, so it never matches entries cached before
+        version = time.time_ns()
+        if not cache.add(REVOCATIONS_KEY, version, None):
+            version = cache.get(REVOCATIONS_KEY, version)
+    return version
+
+
+class TokenCache:
+    """
+    Token -> user lookups, in a per-process LRU with TTL in front of the shared cache.
+    Entries hold plain values (token_entry), so requests never share (and mutate) the same user instance.
+    Local hits are checked against the shared revocation counter, so a logout in one process applies to all.
+    """
+
+    def __init__(self, size: int = LOCAL_SIZE, local_ttl: int = LOCAL_TTL, shared_ttl: int = SHARED_TTL):
+        self.size = size
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self.local: 'OrderedDict[str, tuple]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Token]:
+        now = time.monotonic()
+        version = revocations()
+        with self.lock:
+            local = self.local.get(key)
+            if local is not None:
+                entry, cached_version, expires = local
+                if expires > now and cached_version == version:
+                    self.local.move_to_end(key)
+                    self.local_hits += 1
+                    return token_from_entry(key, entry)
+                del self.local[key]
+
+        entry = cache.get(shared_key(key))
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.shared_hits += 1
+        self._set_local(key, entry, version)
+        return token_from_entry(key, entry)
+
+    def set(self, key: str, token: Token):
+        version = revocations()
+        entry = token_entry(token)
+        cache.set(shared_key(key), entry, self.shared_ttl)
+        self._set_local(key, entry, version)
+
+    def _set_local(self, key: str, entry: tuple, version: int):
+        with self.lock:
+            self.local[key] = (entry, version, time.monotonic() + self.local_ttl)
+            self.local.move_to_end(key)
+            while len(self.local) > self.size:
+                self.local.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[str]):
+        keys = list(keys)
+        with self.lock:
+            for key in keys:
+                self.local.pop(key, None)
+        cache.delete_many([shared_key(key) for key in keys])
+        try:
+            cache.incr(REVOCATIONS_KEY)
+        except ValueError:
+            # without a counter no process has local entries to drop
+            pass
+
+    def clear(self):
+        with self.lock:
+            self.local.clear()
+            self.local_hits = self.shared_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {'local_hits': self.local_hits, 'shared_hits': self.shared_hits, 'misses': self.misses,
+                    'size': len(self.local)}
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication resolving tokens through token_cache, the database is only queried on misses"""
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            token_cache.set(key, token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return token.user, token
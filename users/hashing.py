@@ -0,0 +1,40 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+
+
+def _hash(password: str, algorithm: str) -> str:
+    return make_password(password, hasher=algorithm)
+
+
+class ParallelHasher:
+    """
+    make_password over a pool of worker processes, for imports hashing thousands of passwords.
+    Workers hash with the parent's default hasher, passwords are checked as usual afterwards.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or getattr(settings, 'PASSWORD_HASHING_WORKERS', None) or os.cpu_count() or 1
+        self.algorithm = get_hasher().algorithm
+        self.executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+
+    def hash(self, passwords: Sequence[str]) -> List[str]:
+        if self.executor is None:
+            return [_hash(password, self.algorithm) for password in passwords]
+        # a few chunks per worker, so one slow chunk doesn't leave the others idle
+        chunk_size = max(1, len(passwords) // (self.workers * 4))
+        return list(self.executor.map(_hash, passwords, repeat(self.algorithm), chunksize=chunk_size))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def __enter__(self) -> 'ParallelHasher':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,39 +1,196 @@
 import datetime
+import time
+from typing import Dict, List, Set, Tuple
 
 from django.contrib.auth.hashers import make_password
 from django.core.management import BaseCommand
+from django.db import transaction
 
 from trainings.models import Training
-from users.models import Relation, User
+from trainings.services.deletion import deleting_relations
+from trainings.services.summary import rebuild_summaries
+from trainings.services.week_cache import invalidate_relations
+from users.models import Relation, RelationStatus, User
 
 PASSWORD = 'testing321'
 EMAIL = '@users.com'
+BATCH_SIZE = 500
+
+
+class LineError(Exception):
+    pass
 
 
 class Command(BaseCommand):
+    """
+    Loads a file of lines:
+        runner <username>
+        coach <username>
+        relation <runner>-<coach>-<status>
+        training <runner>-<coach>-<yyyy.mm.dd>-<description>
+    Rows are buffered and written with bulk_create, names are resolved through maps built while loading.
+    """
+    help = 'Load users, relations and trainings from a file'
+
     def add_arguments(self, parser):
         parser.add_argument('file_name', type=str)
+        parser.add_argument('--append', action='store_true',
+                            help='keep existing data, trainings already planned for a day are left unchanged')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='rows buffered before a flush')
 
     def handle(self, *args, **options):
-        Relation.objects.all().delete()
-        User.objects.all().delete()
-        with open(f"{options['file_name']}") as file:
-            for line in file:
-                command, value = line.split()
-
-                if command == 'runner':
-                    User.objects.create(username=value, password=make_password(PASSWORD), email=f'{value}@users.com',
-                                        is_runner=True)
-                elif command == 'coach':
-                    User.objects.create(username=value, password=make_password(PASSWORD), email=f'{value}@users.com',
-                                        is_coach=True)
-                elif command == 'relation':
-                    runner, coach, status = value.split('-')
-                    runner = User.objects.get(username=runner)
-                    coach = User.objects.get(username=coach)
-                    Relation.objects.create(runner=runner, coach=coach, status=status)
-                elif command == 'training':
-                    runner, coach, date, description = value.split('-')
-                    relation = Relation.objects.get(coach__username=coach, runner__username=runner)
-                    Training.objects.create(relation=relation, date=datetime.datetime.strptime(date, '%Y.%m.%d'),
-                                            description=description)
+        self.batch_size = options['batch_size']
+        self.append = options['append']
+        # every user gets the same hash, computed once
+        self.password = make_password(PASSWORD)
+        self.users: Dict[str, int] = {}
+        self.emails: Set[str] = set()
+        self.relations: Dict[Tuple[str, str], Relation] = {}
+        self.trainings: Set[Tuple[int, datetime.date]] = set()
+        self.pending_users: Dict[str, User] = {}
+        self.pending_relations: Dict[Tuple[str, str], Relation] = {}
+        self.pending_trainings: List[Training] = []
+        self.touched: Dict[int, Relation] = {}
+        self.created = 0
+        errors: List[Tuple[int, str]] = []
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            if self.append:
+                self.users = dict(User.objects.values_list('username', 'id'))
+                self.emails = set(User.objects.values_list('email', flat=True))
+                self.relations = {(relation.runner.username, relation.coach.username): relation
+                                  for relation in Relation.objects.select_related('runner', 'coach')
+                                  .only('runner_id', 'runner__username', 'coach__username')}
+            else:
+                # tombstones of everything deleted are written at once, not by a signal per training
+                with deleting_relations(Relation.objects.all()):
+                    Relation.objects.all().delete()
+                User.objects.all().delete()
+
+            with open(options['file_name']) as file:
+                for number, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        self.load(line)
+                    except LineError as e:
+                        errors.append((number, str(e)))
+            self.flush_users()
+            self.flush_relations()
+            self.flush_trainings()
+            # bulk_create doesn't send signals, summaries of the loaded weeks are computed at once
+            rebuild_summaries(self.touched)
+            if self.append:
+                # bulk_create doesn't send signals, relations loaded before may have cached weeks
+                invalidate_relations(self.touched.values())
+
+        elapsed = time.perf_counter() - started
+        rate = self.created / elapsed if elapsed else 0
+        self.stdout.write(f'{self.created} rows in {elapsed:.1f}s ({rate:.0f} rows/s)')
+        if errors:
+            self.stderr.write(f'{len(errors)} lines skipped:')
+            for number, message in errors:
+                self.stderr.write(f'  line {number}: {message}')
+
+    def load(self, line: str):
+        try:
+            command, value = line.split(maxsplit=1)
+        except ValueError:
+            raise LineError(f'expected "<command> <value>", got {line.strip()!r}')
+        value = value.strip()
+
+        if command in ['runner', 'coach']:
+            if value in self.users or value in self.pending_users:
+                raise LineError(f'user {value!r} already exists')
+            email = f'{value}{EMAIL}'
+            if email in self.emails:
+                raise LineError(f'email {email!r} is already taken')
+            self.emails.add(email)
+            self.pending_users[value] = User(username=value, password=self.password, email=email,
+                                             is_runner=command == 'runner', is_coach=command == 'coach')
+            if len(self.pending_users) >= self.batch_size:
+                self.flush_users()
+        elif command == 'relation':
+            try:
+                runner, coach, status = value.split('-')
+                status = RelationStatus(int(status))
+            except ValueError:
+                raise LineError(f'expected "<runner>-<coach>-<status>", got {value!r}')
+            key = (runner, coach)
+            if key in self.relations or key in self.pending_relations:
+                raise LineError(f'relation of {runner!r} and {coach!r} already exists')
+            self.pending_relations[key] = Relation(runner_id=self.user_id(runner), coach_id=self.user_id(coach),
+                                                   status=status)
+            if len(self.pending_relations) >= self.batch_size:
+                self.flush_relations()
+        elif command == 'training':
+            try:
+                runner, coach, date, description = value.split('-', 3)
+                date = datetime.datetime.strptime(date, '%Y.%m.%d').date()
+            except ValueError:
+                raise LineError(f'expected "<runner>-<coach>-<yyyy.mm.dd>-<description>", got {value!r}')
+            relation = self.relation(runner, coach)
+            if (relation.pk, date) in self.trainings:
+                raise LineError(f'training of {runner!r} and {coach!r} on {date} already exists')
+            self.trainings.add((relation.pk, date))
+            self.pending_trainings.append(Training(relation_id=relation.pk, date=date, description=description))
+            self.touched[relation.pk] = relation
+            if len(self.pending_trainings) >= self.batch_size:
+                self.flush_trainings()
+        else:
+            raise LineError(f'unknown command {command!r}')
+
+    def user_id(self, username: str) -> int:
+        if username in self.pending_users:
+            self.flush_users()
+        try:
+            return self.users[username]
+        except KeyError:
+            raise LineError(f'unknown user {username!r}')
+
+    def relation(self, runner: str, coach: str) -> Relation:
+        if (runner, coach) in self.pending_relations:
+            self.flush_relations()
+        try:
+            return self.relations[(runner, coach)]
+        except KeyError:
+            raise LineError(f'unknown relation of {runner!r} and {coach!r}')
+
+    def flush_users(self):
+        if not self.pending_users:
+            return
+        User.objects.bulk_create(self.pending_users.values())
+        # bulk_create doesn't set primary keys on every database
+        self.users.update(User.objects.filter(username__in=self.pending_users).values_list('username', 'id'))
+        self.created += len(self.pending_users)
+        self.pending_users = {}
+
+    def flush_relations(self):
+        if not self.pending_relations:
+            return
+        self.flush_users()
+        Relation.objects.bulk_create(self.pending_relations.values())
+        keys = {(relation.runner_id, relation.coach_id): key for key, relation in self.pending_relations.items()}
+        created = Relation.objects.filter(runner_id__in={runner_id for runner_id, _ in keys},
+                                          coach_id__in={coach_id for _, coach_id in keys})
+        for relation in created.only('runner_id', 'coach_id'):
+            key = keys.get((relation.runner_id, relation.coach_id))
+            if key is not None:
+                self.relations[key] = relation
+        self.created += len(self.pending_relations)
+        self.pending_relations = {}
+
+    def flush_trainings(self):
+        if not self.pending_trainings:
+            return
+        trainings = self.pending_trainings
+        if self.append:
+            # days the calendar already has are left unchanged and not counted as created
+            existing = set(Training.objects.filter(
+                relation_id__in={training.relation_id for training in trainings},
+                date__in={training.date for training in trainings}).values_list('relation_id', 'date'))
+            trainings = [training for training in trainings if (training.relation_id, training.date) not in existing]
+        Training.objects.bulk_create(trainings, ignore_conflicts=self.append)
+        self.created += len(trainings)
+        self.pending_trainings = []
@@ -0,0 +1,125 @@
+import datetime
+import random
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Type
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.db import models, transaction
+
+from trainings.models import Training
+from trainings.services.summary import rebuild_summaries
+from users.models import Relation, RelationStatus, User
+
+PASSWORD = 'testing321'
+CHUNK_SIZE = 50000
+# share of runners in each status of their current relation
+STATUS_WEIGHTS = {RelationStatus.ESTABLISHED: 70, RelationStatus.INVITED_BY_COACH: 10,
+                  RelationStatus.INVITED_BY_RUNNER: 10, RelationStatus.REVOKED: 10}
+# share of runners that also have a revoked relation with a previous coach
+PREVIOUS_COACH_RATE = 0.1
+REST_DAY_RATE = 0.15
+EXECUTION_RATE = 0.8
+DESCRIPTIONS = ['easy run 8km', 'long run 20km', 'tempo 3x3km', 'intervals 10x400m', 'recovery jog 5km',
+                'hills 8x200m', 'fartlek 45min', 'strength and core', 'threshold 2x5km', 'race pace 12km']
+EXECUTIONS = ['done as planned', 'felt heavy', 'shortened, sore calf', 'faster than planned', 'done on treadmill']
+
+
+def dates_between(start: datetime.date, end: datetime.date) -> Iterator[datetime.date]:
+    day = datetime.timedelta(days=1)
+    while start <= end:
+        yield start
+        start += day
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset of coaches, runners, relations and daily trainings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--coaches', type=int, default=10)
+        parser.add_argument('--runners', type=int, default=200)
+        parser.add_argument('--days', type=int, default=5 * 365, help='days of trainings of every relation')
+        parser.add_argument('--end', type=datetime.date.fromisoformat,
+                            help='date of the last training (yyyy-mm-dd), earlier trainings may have executions, '
+                                 'today by default, pass it for reproducible datasets')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='gen', help='prefix of generated usernames')
+        parser.add_argument('--batch-size', type=int,
+                            help='rows per INSERT, as many as the database allows by default')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='rows per transaction')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.chunk_size = options['chunk_size']
+        prefix = options['prefix']
+        started = time.perf_counter()
+
+        # every user gets the same hash, computed once
+        password = make_password(PASSWORD, salt=f'{prefix}{options["seed"]}')
+        coach_names = [f'{prefix}-coach{i}' for i in range(options['coaches'])]
+        runner_names = [f'{prefix}-runner{i}' for i in range(options['runners'])]
+        self.insert(User, (User(username=name, email=f'{name}@users.com', password=password, is_coach=True)
+                           for name in coach_names))
+        self.insert(User, (User(username=name, email=f'{name}@users.com', password=password, is_runner=True)
+                           for name in runner_names))
+        ids = dict(User.objects.filter(username__startswith=f'{prefix}-').values_list('username', 'id'))
+        coach_ids = [ids[name] for name in coach_names]
+        runner_ids = [ids[name] for name in runner_names]
+
+        self.insert(Relation, self.relations(runner_ids, coach_ids))
+        established = list(Relation.objects.filter(coach_id__in=coach_ids, status=RelationStatus.ESTABLISHED)
+                           .order_by('pk').values_list('pk', flat=True))
+        end = options['end'] or datetime.date.today()
+        start = end - datetime.timedelta(days=options['days'] - 1)
+        self.insert(Training, self.trainings(established, start, end))
+        self.summarize(established)
+
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.perf_counter() - started:.1f}s'))
+
+    def relations(self, runner_ids: List[int], coach_ids: List[int]) -> Iterator[Relation]:
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        for runner_id in runner_ids:
+            coach_id = self.random.choice(coach_ids)
+            yield Relation(runner_id=runner_id, coach_id=coach_id,
+                           status=self.random.choices(statuses, weights)[0])
+            if len(coach_ids) > 1 and self.random.random() < PREVIOUS_COACH_RATE:
+                previous = self.random.choice([coach for coach in coach_ids if coach != coach_id])
+                yield Relation(runner_id=runner_id, coach_id=previous, status=RelationStatus.REVOKED)
+
+    def trainings(self, relation_ids: List[int], start: datetime.date, end: datetime.date) -> Iterator[Training]:
+        for relation_id in relation_ids:
+            for date in dates_between(start, end):
+                if self.random.random() < REST_DAY_RATE:
+                    continue
+                # neither draws nor executions depend on today, so a seed and end always yield the same dataset
+                executed = self.random.random() < EXECUTION_RATE
+                execution = self.random.choice(EXECUTIONS)
+                yield Training(relation_id=relation_id, date=date, description=self.random.choice(DESCRIPTIONS),
+                               execution=execution if executed and date < end else None,
+                               visible_since=date - datetime.timedelta(days=7))
+
+    def summarize(self, relation_ids: List[int]):
+        started = time.perf_counter()
+        count = rebuild_summaries(relation_ids)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'weekly summaries: {count} rows in {elapsed:.1f}s '
+                          f'({count / elapsed if elapsed else 0:.0f} rows/s)')
+
+    def insert(self, model: Type[models.Model], objects: Iterable[models.Model]):
+        """bulk_create objects in transactions of chunk_size rows, printing the throughput"""
+        started = time.perf_counter()
+        count = 0
+        objects = iter(objects)
+        while True:
+            chunk = list(islice(objects, self.chunk_size))
+            if not chunk:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(chunk, batch_size=self.batch_size)
+            count += len(chunk)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {count} rows in {elapsed:.1f}s '
+                          f'({count / elapsed if elapsed else 0:.0f} rows/s)')
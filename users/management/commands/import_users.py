@@ -0,0 +1,90 @@
+import csv
+import time
+from typing import Dict, List, Set, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.management import BaseCommand
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+
+from users.hashing import ParallelHasher
+from users.models import User
+
+BATCH_SIZE = 1000
+ROLES = ['runner', 'coach']
+
+
+class Command(BaseCommand):
+    """
+    Creates accounts from a CSV file with a username,email,password,role header, role being runner or coach.
+    Passwords are hashed by a pool of processes (--workers, PASSWORD_HASHING_WORKERS), users are bulk inserted.
+    """
+    help = 'Import users from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file_name', type=str)
+        parser.add_argument('--workers', type=int, help='hashing processes, one per CPU by default')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='users hashed and inserted at once')
+
+    def handle(self, *args, **options):
+        self.usernames: Set[str] = set()
+        self.emails: Set[str] = set()
+        self.errors: List[Tuple[int, str]] = []
+        self.created = 0
+        started = time.perf_counter()
+
+        with ParallelHasher(options['workers']) as self.hasher, transaction.atomic():
+            with open(options['file_name'], newline='') as file:
+                batch: Dict[int, dict] = {}
+                # the header is line 1
+                for number, row in enumerate(csv.DictReader(file), 2):
+                    try:
+                        batch[number] = self.clean(row)
+                    except ValidationError as e:
+                        self.errors.append((number, ' '.join(e.messages)))
+                    if len(batch) >= options['batch_size']:
+                        self.insert(batch)
+                        batch = {}
+                self.insert(batch)
+
+        elapsed = time.perf_counter() - started
+        rate = self.created / elapsed if elapsed else 0
+        self.stdout.write(f'{self.created} users in {elapsed:.1f}s ({rate:.0f} users/s, '
+                          f'{self.hasher.workers} hashing processes)')
+        if self.errors:
+            self.stderr.write(f'{len(self.errors)} lines skipped:')
+            for number, message in sorted(self.errors):
+                self.stderr.write(f'  line {number}: {message}')
+
+    def clean(self, row: dict) -> dict:
+        row = {key: (row.get(key) or '').strip() for key in ['username', 'email', 'password', 'role']}
+        User.username_validator(row['username'])
+        validate_email(row['email'])
+        if not row['password']:
+            raise ValidationError('password is required')
+        if row['role'] not in ROLES:
+            raise ValidationError(f'role must be one of {", ".join(ROLES)}')
+        if row['username'] in self.usernames or row['email'] in self.emails:
+            raise ValidationError('username or email repeated in the file')
+        self.usernames.add(row['username'])
+        self.emails.add(row['email'])
+        return row
+
+    def insert(self, batch: Dict[int, dict]):
+        taken = User.objects.filter(Q(username__in=[row['username'] for row in batch.values()]) |
+                                    Q(email__in=[row['email'] for row in batch.values()]))
+        taken = list(taken.values_list('username', 'email'))
+        usernames, emails = {username for username, _ in taken}, {email for _, email in taken}
+        for number, row in list(batch.items()):
+            if row['username'] in usernames or row['email'] in emails:
+                self.errors.append((number, 'username or email already taken'))
+                del batch[number]
+        if not batch:
+            return
+
+        passwords = self.hasher.hash([row['password'] for row in batch.values()])
+        User.objects.bulk_create([User(username=row['username'], email=row['email'], password=password,
+                                       is_runner=row['role'] == 'runner', is_coach=row['role'] == 'coach')
+                                  for row, password in zip(batch.values(), passwords)])
+        self.created += len(batch)
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.8 on 2026-10-18 05:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(blank=True, max_length=254, unique=True, verbose_name='email address'),
+        ),
+        migrations.CreateModel(
+            name='Relation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.IntegerField(blank=True, choices=[(0, 'ESTABLISHED'), (1, 'INVITED_BY_COACH'), (2, 'INVITED_BY_RUNNER'), (3, 'REVOKED')], default=users.models.RelationStatus(1))),
+                ('nickname', models.CharField(blank=True, max_length=150, null=True, verbose_name='nickname')),
+                ('coach', models.ForeignKey(blank=True, on_delete=django.db.models.deletion.CASCADE, related_name='coach_relation', to=settings.AUTH_USER_MODEL)),
+                ('runner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runner_relation', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('coach', 'nickname'), ('runner', 'coach')},
+            },
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='runners',
+            field=models.ManyToManyField(through='users.Relation', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
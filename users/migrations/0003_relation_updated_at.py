@@ -0,0 +1,18 @@
+# Generated by Django 2.2.8 on 2026-10-18 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_relation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='relation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -31,15 +31,35 @@ class User(AbstractUser):
     is_coach = models.BooleanField(default=False)
     runners = models.ManyToManyField('User', through='Relation')
 
+    @property
+    def relationships(self) -> 'RelationshipSnapshot':
+        """
+        Relations of the user as a runner, loaded on first use and kept for the lifetime of the instance,
+        which for request.user is one request. Views mutating them call invalidate_relationships.
+        """
+        snapshot = self.__dict__.get('_relationships')
+        if snapshot is None:
+            snapshot = self.__dict__['_relationships'] = RelationshipSnapshot(self)
+        return snapshot
+
+    def invalidate_relationships(self):
+        self.__dict__.pop('_relationships', None)
+
+    def __getstate__(self):
+        # pickled users (sessions, caches) outlive the request their snapshot belongs to
+        state = super().__getstate__().copy()
+        state.pop('_relationships', None)
+        return state
+
     @property
     def coaches(self) -> List['User']:
-        return [r.coach for r in self.runner_relation.all()]
+        return self.relationships.coaches
 
     def has_coach(self) -> bool:
-        return self.is_runner and self.runner_relation.filter(status=RelationStatus.ESTABLISHED).exists()
+        return self.is_runner and self.relationships.has_coach
 
     def has_been_invited(self, user: 'User') -> bool:
-        return self.runner_relation.filter(coach=user).exists()
+        return self.relationships.has_been_invited(user)
 
     def __str__(self):
         return f'username: {self.username}, is_runner: {self.is_runner}, is_coach: {self.is_coach}'
@@ -51,6 +71,7 @@ class Relation(models.Model):
     status = models.IntegerField(choices=[(s.value, s.name) for s in RelationStatus],
                                  default=RelationStatus.INVITED_BY_COACH, blank=True)
     nickname = models.CharField(max_length=150, null=True, blank=True, verbose_name=gettext_lazy('nickname'))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = [['runner', 'coach'], ['coach', 'nickname']]
@@ -64,3 +85,22 @@ class Relation(models.Model):
 
     def get_absolute_url(self):
         return reverse('users-runners-detail', kwargs={'runner': self.runner.username})
+
+
+class RelationshipSnapshot:
+    """Relations of a runner with their coaches, fetched with a single query"""
+
+    def __init__(self, user: User):
+        self.relations: List[Relation] = list(user.runner_relation.select_related('coach').order_by('pk'))
+        self.coach_ids = {relation.coach_id for relation in self.relations}
+
+    @property
+    def coaches(self) -> List[User]:
+        return [relation.coach for relation in self.relations]
+
+    @property
+    def has_coach(self) -> bool:
+        return any(relation.status == RelationStatus.ESTABLISHED for relation in self.relations)
+
+    def has_been_invited(self, user: User) -> bool:
+        return user.pk in self.coach_ids
@@ -1,11 +1,17 @@
+from typing import Tuple
+
+from django.utils.functional import cached_property
 from django.utils.translation import gettext
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
+from training_calendar.instrumentation import TimedSerializerMixin, timed
+from training_calendar.sparse_fields import SparseFieldsSerializerMixin
+from training_calendar.utils import url_template
 from users.models import Relation, RelationStatus, User
 
 
-class RelationSerializer(serializers.HyperlinkedModelSerializer):
+class RelationSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin, serializers.HyperlinkedModelSerializer):
     url = serializers.HyperlinkedIdentityField(view_name='users-api-runner-profile')
     trainings = serializers.HyperlinkedRelatedField(view_name='users-api-runner-trainings', read_only=True,
                                                     source='*')
@@ -46,3 +52,26 @@ class RelationSerializer(serializers.HyperlinkedModelSerializer):
         instance.nickname = validated_data.get('nickname', instance.nickname)
         instance.save()
         return instance
+
+
+class CompactRelationSerializer(RelationSerializer):
+    """Flat representation with integer ids, urls are filled from templates resolved once per serializer"""
+    flat_fields = {
+        'id': lambda serializer, relation: relation.pk,
+        'url': lambda serializer, relation: serializer.url_templates[0].format(pk=relation.pk),
+        'runner': lambda serializer, relation: relation.runner_id,
+        'runner_name': lambda serializer, relation: relation.runner.username,
+        'status': lambda serializer, relation: relation.status,
+        'trainings': lambda serializer, relation: serializer.url_templates[1].format(pk=relation.pk),
+        'nickname': lambda serializer, relation: relation.nickname,
+    }
+
+    @cached_property
+    def url_templates(self) -> Tuple[str, str]:
+        request = self.context.get('request')
+        return (url_template(request, 'users-api-runner-profile', 'pk'),
+                url_template(request, 'users-api-runner-trainings', 'pk'))
+
+    @timed('serializer')
+    def to_representation(self, instance: Relation) -> dict:
+        return self.flat_representation(instance)
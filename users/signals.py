@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from users.authentication import token_cache
+from users.models import Relation, User
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance: Token, **kwargs):
+    # rest_auth logout deletes the token, rotating it deletes the old one and saves a new one
+    token_cache.invalidate([instance.key])
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    # logins only update last_login, which authentication doesn't depend on
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    token_cache.invalidate(Token.objects.filter(user=instance).values_list('key', flat=True))
+
+
+@receiver(post_save, sender=Relation)
+@receiver(post_delete, sender=Relation)
+def relation_changed(sender, instance: Relation, **kwargs):
+    # the runner instance the relation was saved with is often request.user, it mustn't keep a stale snapshot
+    if Relation.runner.field.is_cached(instance):
+        instance.runner.invalidate_relationships()
@@ -41,10 +41,10 @@ class RunnerProfileView(MultipleFormView):
     template_name = 'users/profile.html'
 
     def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.add_form('invite', RunnerInviteForm, self.invite_form_valid)
         self.add_form('change_password', MultipleSetPasswordForm, self.change_password_form_valid,
                       get_kwargs_func=self.change_password_form_get_kwargs)
-        super().__init__(**kwargs)
 
     def invite_form_valid(self, form: Form) -> HttpResponse:
         return redirect('trainings-home')
@@ -84,7 +84,7 @@ class RunnerListView(LoginRequiredMixin, UserIsCoachMixin, FormMixin, ListView):
 
     def get_queryset(self):
         return Relation.objects.filter(coach=self.request.user).exclude(
-            status=RelationStatus.INVITED_BY_RUNNER).order_by('status')
+            status=RelationStatus.INVITED_BY_RUNNER).select_related('runner').order_by('status')
 
     def post(self, request):
         """
@@ -175,6 +175,7 @@ class AcceptInviteView(LoginRequiredMixin, DoesntHaveTrainerMixin, DeleteView):
         self.object.status = RelationStatus.ESTABLISHED
         success_url = self.get_success_url()
         self.object.save()
+        request.user.invalidate_relationships()
         return HttpResponseRedirect(success_url)
 
     def get_queryset(self):